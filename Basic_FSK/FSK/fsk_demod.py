@@ -25,26 +25,28 @@ def fsk_demodulation(
     # Calculate number of samples per symbol
     samples_per_bit = int(sampling_rate / baud_rate)
     num_symbols = len(modulated_signal) // samples_per_bit
-    bits = np.empty(num_symbols, dtype=np.uint8)
     
     # Time vector for one symbol duration
     t_symbol = np.arange(samples_per_bit) / sampling_rate
-
-    for i in range(num_symbols):
-        # Extract the current symbol from the signal
-        chunk = modulated_signal[i * samples_per_bit : (i + 1) * samples_per_bit]
-        
-        # Compute the correlation using quadrature demodulation for freq0.
-        I0 = np.dot(chunk, np.cos(2 * np.pi * freq0 * t_symbol))
-        Q0 = np.dot(chunk, np.sin(2 * np.pi * freq0 * t_symbol))
-        mag0 = np.sqrt(I0**2 + Q0**2)
-        
-        # Compute the correlation for freq1.
-        I1 = np.dot(chunk, np.cos(2 * np.pi * freq1 * t_symbol))
-        Q1 = np.dot(chunk, np.sin(2 * np.pi * freq1 * t_symbol))
-        mag1 = np.sqrt(I1**2 + Q1**2)
-        
-        # Decide the bit based on which frequency has higher correlation.
-        bits[i] = 0 if mag0 > mag1 else 1
+    
+    # Reference bank with the columns cos(f0), sin(f0), cos(f1), sin(f1).
+    bank = np.stack([
+        np.cos(2 * np.pi * freq0 * t_symbol),
+        np.sin(2 * np.pi * freq0 * t_symbol),
+        np.cos(2 * np.pi * freq1 * t_symbol),
+        np.sin(2 * np.pi * freq1 * t_symbol),
+    ], axis=1)
+    
+    # View the signal as a (num_symbols, samples_per_bit) matrix, one symbol per row,
+    # and compute every quadrature correlation with a single matrix product.
+    symbols = np.asarray(modulated_signal)[: num_symbols * samples_per_bit]
+    iq = symbols.reshape(num_symbols, samples_per_bit) @ bank
+    
+    # Magnitudes for freq0 and freq1.
+    mag0 = np.sqrt(iq[:, 0]**2 + iq[:, 1]**2)
+    mag1 = np.sqrt(iq[:, 2]**2 + iq[:, 3]**2)
+    
+    # Decide each bit based on which frequency has higher correlation.
+    bits = np.where(mag0 > mag1, 0, 1).astype(np.uint8)
         
     return bits
@@ -1,21 +1,78 @@
 #region FSK_v2 Package Initialization
-from .fsk_mod import fsk_modulation_to_base64
-from .cpfsk_mod import cpfsk_modulation_to_base64
-from .fsk_demod import fsk_demodulation_from_base64
-from .wrapper import (
-    byte_array_to_fsk, 
-    fsk_to_byte_array, 
-    byte_array_to_cpfsk, 
-    cpfsk_to_byte_array
-)
+# Public names are imported from their submodules on first access (PEP 562), so importing
+# the package - e.g. to run the command-line tool - does not pay for numpy, asyncio or
+# multiprocessing until a feature that needs them is used.
+import importlib
 
-__all__ = [
-    "fsk_modulation_to_base64",
-    "cpfsk_modulation_to_base64",
-    "fsk_demodulation_from_base64",
-    "byte_array_to_fsk",
-    "fsk_to_byte_array",
-    "byte_array_to_cpfsk",
-    "cpfsk_to_byte_array",
-]
+_EXPORTS = {
+    "fsk_modulation_to_base64": "fsk_mod",
+    "cpfsk_modulation_to_base64": "cpfsk_mod",
+    "fsk_modulation_to_sink": "fsk_mod",
+    "cpfsk_modulation_to_sink": "cpfsk_mod",
+    "fsk_modulation_pcm16": "fsk_mod",
+    "cpfsk_modulation_pcm16": "cpfsk_mod",
+    "fsk_demodulation_from_base64": "fsk_demod",
+    "fsk_magnitudes": "fsk_demod",
+    "byte_array_to_fsk": "wrapper",
+    "fsk_to_byte_array": "wrapper",
+    "byte_array_to_cpfsk": "wrapper",
+    "cpfsk_to_byte_array": "wrapper",
+    "byte_array_to_fsk_sink": "wrapper",
+    "byte_array_to_cpfsk_sink": "wrapper",
+    "byte_array_to_mfsk": "wrapper",
+    "mfsk_to_byte_array": "wrapper",
+    "byte_array_to_cpmfsk": "wrapper",
+    "cpmfsk_to_byte_array": "wrapper",
+    "mfsk_modulation_to_base64": "mfsk",
+    "cpmfsk_modulation_to_base64": "mfsk",
+    "mfsk_modulation_to_sink": "mfsk",
+    "cpmfsk_modulation_to_sink": "mfsk",
+    "mfsk_demodulation_from_base64": "mfsk",
+    "StreamingDemodulator": "streaming",
+    "fsk_modulation_stream": "streaming",
+    "cpfsk_modulation_stream": "streaming",
+    "decode_wav_file": "wav_io",
+    "fsk_demodulation_parallel": "parallel",
+    "byte_arrays_to_fsk": "batch",
+    "byte_arrays_to_cpfsk": "batch",
+    "fsk_to_byte_arrays": "batch",
+    "cpfsk_to_byte_arrays": "batch",
+    "FSKServer": "server",
+    "FSKClient": "server",
+    "frame_payload": "sync",
+    "find_frames": "sync",
+    "decode_frames": "sync",
+    "decode_frames_from_base64": "sync",
+    "cache_info": "tables",
+    "clear_cache": "tables",
+    "set_cache_size": "tables",
+    "encode_packet": "packet",
+    "decode_packet": "packet",
+    "packet_from_base64": "packet",
+    "PacketError": "packet",
+    "apply_channel": "channel",
+    "simulate_ber": "channel",
+    "ber_curves": "channel",
+    "fdm_tone_plan": "fdm",
+    "byte_arrays_to_fdm": "fdm",
+    "fdm_to_byte_arrays": "fdm",
+    "PipelineMetrics": "metrics",
+    "StageRecord": "metrics",
+    "set_observer": "metrics",
+    "observe": "metrics",
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    # Cache the attribute so later lookups bypass __getattr__.
+    globals()[name] = value
+    return value
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
 #endregion
@@ -0,0 +1,6 @@
+# __main__.py
+# `python -m FSK_v2 ...` runs the fsk command-line tool (see cli.py).
+import sys
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,363 @@
+# audio_format.py
+import io
+import os
+import struct
+from typing import BinaryIO, NamedTuple, Optional
+import numpy as np
+from numpy.typing import NDArray
+
+#region Sample Encodings
+# FSK only needs the sign and energy of the waveform, so the 16-bit samples can be stored
+# more compactly. Each encoding maps to its WAV (format tag, bytes per sample):
+#   pcm16: 16-bit signed little-endian PCM (the default, lossless w.r.t. the synthesizer).
+#   pcm8:  8-bit unsigned PCM (offset 128), half the size; ~49 dB SNR at full scale,
+#          losing 20 dB per decade of signal level.
+#   mulaw: G.711 µ-law, half the size; ~38 dB SNR nearly independent of the level.
+# Both decode with the same bit error rate as pcm16 down to 0 dB channel SNR (bench_formats.py).
+WAVE_FORMAT_PCM = 1
+WAVE_FORMAT_IEEE_FLOAT = 3
+WAVE_FORMAT_MULAW = 7
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+ENCODINGS = {
+    "pcm16": (WAVE_FORMAT_PCM, 2),
+    "pcm8": (WAVE_FORMAT_PCM, 1),
+    "mulaw": (WAVE_FORMAT_MULAW, 1),
+}
+
+def _pcm16_values() -> NDArray[np.int32]:
+    # Every int16 value, indexed by its uint16 bit pattern, so encoders are one table lookup per sample.
+    return np.arange(1 << 16, dtype=np.uint32).astype(np.uint16).view(np.int16).astype(np.int32)
+
+def _build_pcm8_tables() -> tuple[NDArray[np.uint8], NDArray[np.int16]]:
+    # Round to the nearest multiple of 256, then offset to unsigned as WAV requires for 8-bit.
+    encode = (np.minimum((_pcm16_values() + 128) >> 8, 127) + 128).astype(np.uint8)
+    decode = ((np.arange(256, dtype=np.int32) - 128) << 8).astype(np.int16)
+    return encode, decode
+
+_MULAW_BIAS = 0x84
+_MULAW_CLIP = 8158  # In the 14-bit domain; larger magnitudes saturate to the top code.
+
+def _build_mulaw_tables() -> tuple[NDArray[np.uint8], NDArray[np.int16]]:
+    # G.711 µ-law as in the reference encoder: 14-bit magnitude, 3-bit segment (exponent)
+    # and 4-bit step, stored inverted.
+    value = _pcm16_values() >> 2
+    sign = np.where(value < 0, 0x80, 0)
+    magnitude = np.minimum(np.abs(value), _MULAW_CLIP) + (_MULAW_BIAS >> 2)
+    exponent = np.frexp(magnitude)[1] - 6  # floor(log2(magnitude)) - 5, in 0..7
+    mantissa = (magnitude >> (exponent + 1)) & 0x0F
+    encode = (~(sign | (exponent << 4) | mantissa) & 0xFF).astype(np.uint8)
+
+    code = ~np.arange(256, dtype=np.int32) & 0xFF
+    magnitude = (((code & 0x0F) << 3) + _MULAW_BIAS) << ((code & 0x70) >> 4)
+    decode = np.where(code & 0x80, _MULAW_BIAS - magnitude, magnitude - _MULAW_BIAS).astype(np.int16)
+    return encode, decode
+
+# Tables are built on first use, keeping them out of import time (the default pcm16 needs none).
+_CODEC_BUILDERS = {"pcm8": _build_pcm8_tables, "mulaw": _build_mulaw_tables}
+_CODEC_TABLES: dict[str, tuple[NDArray[np.uint8], NDArray[np.int16]]] = {}
+
+def _codec_tables(encoding: str) -> tuple[NDArray[np.uint8], NDArray[np.int16]]:
+    tables = _CODEC_TABLES.get(encoding)
+    if tables is None:
+        # A concurrent first use just builds identical tables twice.
+        tables = _CODEC_BUILDERS[encoding]()
+        for table in tables:
+            table.setflags(write=False)
+        _CODEC_TABLES[encoding] = tables
+    return tables
+
+def check_encoding(encoding: str) -> None:
+    """Raise ValueError unless encoding is one of ENCODINGS."""
+    if encoding not in ENCODINGS:
+        raise ValueError(f"Unknown encoding {encoding!r}; expected one of {sorted(ENCODINGS)}")
+
+def encode_samples(samples: NDArray[np.int16], encoding: str = "pcm16") -> NDArray[np.generic]:
+    """
+    Convert 16-bit samples to the on-the-wire representation of an encoding.
+
+    Parameters:
+        samples: int16 samples.
+        encoding: One of ENCODINGS.
+
+    Returns:
+        Little-endian int16 samples for "pcm16", uint8 codes otherwise; write them with
+        memoryview(result).cast('B').
+    """
+    check_encoding(encoding)
+    samples = np.asarray(samples, dtype='<i2')
+    if encoding == "pcm16":
+        return samples
+    return _codec_tables(encoding)[0][samples.view('<u2')]
+
+def decode_samples(data: bytes, encoding: str = "pcm16", count: int = -1, offset: int = 0) -> NDArray[np.int16]:
+    """
+    Convert encoded sample bytes back to 16-bit samples.
+
+    Parameters:
+        data: Buffer holding the encoded samples.
+        encoding: One of ENCODINGS.
+        count: Number of samples to decode (-1 for all remaining).
+        offset: Byte offset of the first sample.
+
+    Returns:
+        int16 samples; a zero-copy view of data for "pcm16".
+    """
+    check_encoding(encoding)
+    if encoding == "pcm16":
+        return np.frombuffer(data, dtype='<i2', count=count, offset=offset)
+    codes = np.frombuffer(data, dtype=np.uint8, count=count, offset=offset)
+    return _codec_tables(encoding)[1][codes]
+
+def wav_encoding(format_tag: int, sampwidth: int) -> str:
+    """Return the encoding name of a WAV format tag and sample width, or raise ValueError."""
+    for encoding, layout in ENCODINGS.items():
+        if layout == (format_tag, sampwidth):
+            return encoding
+    raise ValueError(f"Unsupported WAV sample format (format tag {format_tag}, {8 * sampwidth}-bit)")
+#endregion
+
+#region WAV Header
+WAV_HEADER_SIZE = 44
+
+def wav_header(
+    n_frames: int,
+    sampling_rate: float,
+    n_channels: int = 1,
+    sampwidth: int = 2,
+    format_tag: int = WAVE_FORMAT_PCM
+) -> bytes:
+    """
+    Build the RIFF/WAVE header for the given sample format.
+
+    For integer PCM this is the canonical 44-byte header, byte-for-byte what the standard
+    library's wave module writes; other formats (µ-law) get the extended fmt chunk and the
+    fact chunk the WAV specification requires. Since the frame count is given up front the
+    header can be sent to non-seekable sinks.
+
+    Parameters:
+        n_frames: Number of audio frames that will follow the header.
+        sampling_rate: Number of samples per second (Hz).
+        n_channels: Number of interleaved channels.
+        sampwidth: Bytes per sample (2 for 16-bit PCM).
+        format_tag: WAVE format code (WAVE_FORMAT_PCM or WAVE_FORMAT_MULAW).
+
+    Returns:
+        The header as bytes.
+    """
+    framerate = int(sampling_rate)
+    block_align = n_channels * sampwidth
+    data_size = n_frames * block_align
+    fmt = struct.pack('<HHIIHH', format_tag, n_channels, framerate, framerate * block_align, block_align, sampwidth * 8)
+    chunks = b''
+    if format_tag != WAVE_FORMAT_PCM:
+        fmt += struct.pack('<H', 0)
+        chunks = struct.pack('<4sII', b'fact', 4, n_frames)
+    chunks = struct.pack('<4sI', b'fmt ', len(fmt)) + fmt + chunks
+    return struct.pack('<4sI4s', b'RIFF', 4 + len(chunks) + 8 + data_size, b'WAVE') + chunks + struct.pack('<4sI', b'data', data_size)
+
+class WavInfo(NamedTuple):
+    """
+    Layout of a WAV file as parsed from its header.
+
+    Attributes:
+        format_tag: WAVE format code (1 for integer PCM, 3 for IEEE float); for
+                    WAVE_FORMAT_EXTENSIBLE files, the code of the SubFormat.
+        n_channels: Number of interleaved channels.
+        sampwidth: Bytes per sample.
+        framerate: Frames per second (Hz).
+        n_frames: Number of complete frames in the data chunk.
+        data_offset: Byte offset of the first sample in the file.
+    """
+    format_tag: int
+    n_channels: int
+    sampwidth: int
+    framerate: int
+    n_frames: int
+    data_offset: int
+
+def read_wav_info(stream: BinaryIO) -> WavInfo:
+    """
+    Parse the RIFF chunks of a WAV file up to the start of its sample data.
+
+    Parameters:
+        stream: Readable binary stream positioned at the start of the file (need not be seekable).
+
+    Returns:
+        A WavInfo describing the sample layout; the stream is left at the first sample.
+    """
+    header = stream.read(12)
+    if len(header) < 12:
+        raise ValueError("Not a RIFF/WAVE file")
+    riff, _, wave_id = struct.unpack('<4sI4s', header)
+    if riff != b'RIFF' or wave_id != b'WAVE':
+        raise ValueError("Not a RIFF/WAVE file")
+
+    fmt = None
+    offset = 12
+    while True:
+        chunk_header = stream.read(8)
+        if len(chunk_header) < 8:
+            raise ValueError("WAV file has no data chunk")
+        chunk_id, chunk_size = struct.unpack('<4sI', chunk_header)
+        offset += 8
+        if chunk_id == b'fmt ':
+            fmt_bytes = stream.read(chunk_size + (chunk_size & 1))
+            if len(fmt_bytes) < 16:
+                raise ValueError("WAV fmt chunk is truncated")
+            fmt = struct.unpack('<HHIIHH', fmt_bytes[:16])
+            if fmt[0] == WAVE_FORMAT_EXTENSIBLE and len(fmt_bytes) >= 26:
+                # cbSize, valid bits and the channel mask are followed by the SubFormat GUID,
+                # whose first two bytes are the actual format tag.
+                fmt = (struct.unpack_from('<H', fmt_bytes, 24)[0],) + fmt[1:]
+        elif chunk_id == b'data':
+            if fmt is None:
+                raise ValueError("WAV data chunk precedes its fmt chunk")
+            format_tag, n_channels, framerate, _, block_align, _ = fmt
+            if n_channels < 1 or block_align < n_channels:
+                raise ValueError(f"Invalid WAV layout ({n_channels} channels, {block_align}-byte frames)")
+            # The container width (e.g. 4 bytes for 24 valid bits) comes from the frame size.
+            sampwidth = block_align // n_channels
+            return WavInfo(format_tag, n_channels, sampwidth, framerate, chunk_size // block_align, offset)
+        else:
+            # Skip chunks we do not use (LIST, fact, ...); chunks are word aligned.
+            # Pipes cannot seek, so there the chunk is read and discarded.
+            if stream.seekable():
+                stream.seek(chunk_size + (chunk_size & 1), os.SEEK_CUR)
+            else:
+                stream.read(chunk_size + (chunk_size & 1))
+        offset += chunk_size + (chunk_size & 1)
+#endregion
+
+#region In-Memory Audio Decoding
+CONTAINERS = ("wav", "raw")
+
+def audio_info(data: bytes, container: str = "wav", encoding: str = "pcm16") -> WavInfo:
+    """
+    Return the sample layout of in-memory audio, limited to the frames actually present.
+
+    Parameters:
+        data: A complete WAV file, or headerless samples.
+        container: "wav" (the layout is read from the header) or "raw".
+        encoding: Sample encoding of raw data, one of ENCODINGS; ignored for WAV.
+
+    Returns:
+        A WavInfo; raw data is described as mono with framerate 0 (unknown).
+    """
+    if container not in CONTAINERS:
+        raise ValueError(f"Unknown container {container!r}; expected one of {CONTAINERS}")
+    if container == "raw":
+        check_encoding(encoding)
+        format_tag, sampwidth = ENCODINGS[encoding]
+        return WavInfo(format_tag, 1, sampwidth, 0, len(data) // sampwidth, 0)
+
+    with io.BytesIO(data) as buffer:
+        info = read_wav_info(buffer)
+    n_frames = min(info.n_frames, (len(data) - info.data_offset) // (info.n_channels * info.sampwidth))
+    return info._replace(n_frames=max(n_frames, 0))
+
+def pcm16_from_audio_bytes(data: bytes, container: str = "wav", encoding: str = "pcm16") -> NDArray[np.int16]:
+    """
+    Return the 16-bit samples of in-memory audio in any supported container and encoding.
+
+    Parameters:
+        data: A complete WAV file, or headerless samples.
+        container: "wav" (the encoding is read from the header) or "raw".
+        encoding: Sample encoding of raw data, one of ENCODINGS; ignored for WAV.
+
+    Returns:
+        NDArray of int16 samples (all channels interleaved), truncated to the bytes present;
+        a zero-copy view of data for 16-bit PCM.
+    """
+    info = audio_info(data, container, encoding)
+    encoding = wav_encoding(info.format_tag, info.sampwidth)
+    n_samples = min(info.n_frames * info.n_channels, (len(data) - info.data_offset) // info.sampwidth)
+    return decode_samples(data, encoding, count=n_samples, offset=info.data_offset)
+
+def pcm16_from_wav_bytes(wav_bytes: bytes) -> NDArray[np.int16]:
+    """
+    Return the samples of an in-memory WAV file as int16 (a zero-copy view for 16-bit PCM).
+
+    Parameters:
+        wav_bytes: Complete WAV file contents (16-bit PCM, 8-bit PCM or µ-law).
+
+    Returns:
+        NDArray of int16 samples (all channels interleaved), truncated to the bytes present.
+    """
+    return pcm16_from_audio_bytes(wav_bytes, "wav")
+#endregion
+
+#region Float Decoding
+# Every sample layout the float decoder reads, by (format tag, bytes per sample): the stored
+# little-endian dtype and the divisor that brings integer full scale to 1.0. 8/16-bit samples
+# are divided by 32767 exactly like fsk_demod.pcm16_to_float, wider integers by 2**(bits - 1).
+# 8-bit PCM and µ-law go through their 16-bit decode tables first; 24-bit samples have no
+# numpy dtype and are assembled from their three bytes.
+_FLOAT_LAYOUTS = {
+    (WAVE_FORMAT_PCM, 1): (np.dtype('u1'), 32767.0),
+    (WAVE_FORMAT_MULAW, 1): (np.dtype('u1'), 32767.0),
+    (WAVE_FORMAT_PCM, 2): (np.dtype('<i2'), 32767.0),
+    (WAVE_FORMAT_PCM, 3): (None, float(1 << 23)),
+    (WAVE_FORMAT_PCM, 4): (np.dtype('<i4'), float(1 << 31)),
+    (WAVE_FORMAT_IEEE_FLOAT, 4): (np.dtype('<f4'), 1.0),
+    (WAVE_FORMAT_IEEE_FLOAT, 8): (np.dtype('<f8'), 1.0),
+}
+
+def _channel_values(data: bytes, info: WavInfo, channel: int) -> NDArray[np.generic]:
+    """One channel of the stored samples, widened to a numpy numeric type."""
+    layout = (info.format_tag, info.sampwidth)
+    dtype = _FLOAT_LAYOUTS[layout][0]
+    count = info.n_frames * info.n_channels
+    if dtype is None:
+        # Sign-extend the 24-bit little-endian samples of this channel into int32.
+        raw = np.frombuffer(data, dtype=np.uint8, count=3 * count, offset=info.data_offset)
+        raw = raw.reshape(info.n_frames, info.n_channels, 3)[:, channel]
+        values = raw[:, 0].astype(np.int32)
+        values |= raw[:, 1].astype(np.int32) << 8
+        values |= raw[:, 2].view(np.int8).astype(np.int32) << 16
+        return values
+    values = np.frombuffer(data, dtype=dtype, count=count, offset=info.data_offset)[channel :: info.n_channels]
+    if info.sampwidth == 1:
+        values = _codec_tables(wav_encoding(*layout))[1][values]
+    return values
+
+def check_layout(info: WavInfo, channel: Optional[int] = None) -> None:
+    """Raise ValueError unless float_samples() can decode this layout and channel."""
+    if (info.format_tag, info.sampwidth) not in _FLOAT_LAYOUTS:
+        raise ValueError(f"Unsupported WAV sample format (format tag {info.format_tag}, {8 * info.sampwidth}-bit)")
+    if channel is not None and not -info.n_channels <= channel < info.n_channels:
+        raise ValueError(f"Channel {channel} out of range for {info.n_channels}-channel audio")
+
+def float_samples(data: bytes, info: WavInfo, channel: Optional[int] = None) -> NDArray[np.float32]:
+    """
+    Decode the samples described by info into one float channel, full scale ~[-1, 1].
+
+    Reads 8/16/24/32-bit integer PCM, 32/64-bit IEEE float and µ-law with any number of
+    channels. Only the selected channel is converted; a downmix converts one channel at a
+    time into the running sum, so memory stays at about one float channel.
+
+    Parameters:
+        data: Buffer holding the samples at info.data_offset (e.g. a whole WAV file).
+        info: Sample layout, from audio_info() or read_wav_info().
+        channel: Index of the channel to decode (negative counts from the last), or None to
+                 average all channels.
+
+    Returns:
+        NDArray of float32, one sample per frame.
+    """
+    check_layout(info, channel)
+    scale = _FLOAT_LAYOUTS[(info.format_tag, info.sampwidth)][1]
+    channels = range(info.n_channels) if channel is None else [channel % info.n_channels]
+
+    signal = None
+    for c in channels:
+        values = _channel_values(data, info, c)
+        if signal is None:
+            signal = values.astype(np.float32)
+        else:
+            signal += values
+    if scale != 1.0:
+        signal /= scale
+    if len(channels) > 1:
+        signal /= len(channels)
+    return signal
+#endregion
@@ -0,0 +1,272 @@
+# batch.py
+import base64
+import binascii
+from typing import Optional, Sequence
+import numpy as np
+from numpy.typing import NDArray
+from .tables import get_tables, ModemTables, complete_symbols, repeat_symbols, symbol_start
+from .fsk_demod import _DECIMATE_METHODS, _decide_bits, _demodulate_block, _demodulation_signal, symbol_matrix, tone_magnitudes
+from .audio_format import WavInfo, audio_info, check_layout, float_samples
+from .wav_io import wav_header
+from .synthesis import SYNTH_ENGINES
+from .wavetable import Wavetable, get_wavetable, wavetable_pcm16
+
+# Payloads are processed in groups of equal length, so every group is one dense matrix with no
+# padding, and the 2-D working arrays stay cache-sized no matter how many messages are in the batch.
+_MAX_GROUP_SAMPLES = 1 << 18
+
+#region Batch Modulation
+def _modulate_group(
+    payloads: list[bytes],
+    tables: ModemTables,
+    sampling_rate: float,
+    continuous: bool
+) -> NDArray[np.int16]:
+    """Modulate equally long payloads as rows of one 2-D array of 16-bit PCM."""
+    bits = np.unpackbits(np.frombuffer(b"".join(payloads), dtype=np.uint8).reshape(len(payloads), len(payloads[0])), axis=1)
+
+    if not continuous:
+        # Without phase continuity sample n depends only on its tone and n, so each tone's
+        # full-length signal is synthesized once and every row selects between the two.
+        n_samples = symbol_start(tables, bits.shape[1])
+        t = np.arange(n_samples) / sampling_rate
+        tones = np.empty((len(tables.freqs), n_samples))
+        tones[:] = tables.freqs[:, None]
+        tones *= 2.0 * np.pi
+        tones *= t
+        # Same operation order as the single-message path, so every sample is identical.
+        np.sin(tones, out=tones)
+        tones *= 32767
+        tones = tones.astype(np.int16)
+        return np.where(repeat_symbols(tables, bits.astype(bool)), tones[1], tones[0])
+
+    # Integrate the phase along each row independently, as cpfsk_modulation does per message.
+    signal = repeat_symbols(tables, tables.phase_increments[bits.astype(np.intp)])
+    np.cumsum(signal, axis=1, out=signal)
+    # Work in place from here on; the operation order matches the single-message path exactly.
+    np.sin(signal, out=signal)
+    signal *= 32767
+    return signal.astype(np.int16)
+
+def _wavetable_group(
+    payloads: list[bytes],
+    tables: ModemTables,
+    wavetable: Wavetable,
+    continuous: bool
+) -> NDArray[np.int16]:
+    """Synthesize equally long payloads laid end to end with one template gather, one per row."""
+    tone_index = np.unpackbits(np.frombuffer(b"".join(payloads), dtype=np.uint8)).astype(np.intp)
+    n_symbols = 8 * len(payloads[0])
+    # Symbols are numbered from each message's start, so fractional layouts restart per message.
+    local_symbol = np.tile(np.arange(n_symbols, dtype=np.int64), len(payloads))
+    pcm = wavetable_pcm16(tone_index, tables, wavetable, continuous, local_symbol)
+    return pcm.reshape(len(payloads), symbol_start(tables, n_symbols))
+
+def _batch_to_base64(
+    payloads: Sequence[bytes],
+    freq0: float,
+    freq1: float,
+    sampling_rate: float,
+    baud_rate: float,
+    continuous: bool,
+    engine: str
+) -> list[str]:
+    if engine not in SYNTH_ENGINES:
+        raise ValueError(f"Unknown synthesis engine {engine!r}; expected one of {SYNTH_ENGINES}")
+    tables = get_tables((freq0, freq1), sampling_rate, baud_rate)
+    wavetable = get_wavetable(tables, sampling_rate, continuous) if engine == "wavetable" else None
+    outputs: list[str] = [""] * len(payloads)
+
+    # Payloads of one length share their header and sample count, so each cache-sized group
+    # of them becomes one matrix of complete WAV files with no padding.
+    lengths: dict[int, list[int]] = {}
+    for index, payload in enumerate(payloads):
+        lengths.setdefault(len(payload), []).append(index)
+
+    for length, indices in lengths.items():
+        n_samples = symbol_start(tables, 8 * length)
+        header = np.frombuffer(wav_header(n_samples, sampling_rate), dtype=np.uint8)
+        step = max(1, _MAX_GROUP_SAMPLES // max(n_samples, 1))
+        for first in range(0, len(indices), step):
+            group = indices[first : first + step]
+            group_payloads = [bytes(payloads[i]) for i in group]
+            if wavetable is not None:
+                pcm = _wavetable_group(group_payloads, tables, wavetable, continuous)
+            else:
+                pcm = _modulate_group(group_payloads, tables, sampling_rate, continuous)
+            files = np.empty((len(group), header.size + 2 * n_samples), dtype=np.uint8)
+            files[:, : header.size] = header
+            files[:, header.size :] = pcm.astype('<i2', copy=False).view(np.uint8)
+            for index, wav_file in zip(group, files):
+                outputs[index] = binascii.b2a_base64(wav_file, newline=False).decode('ascii')
+    return outputs
+
+def byte_arrays_to_fsk(
+    payloads: Sequence[bytes],
+    freq0: float,
+    freq1: float,
+    sampling_rate: float,
+    baud_rate: float,
+    engine: str = "sin"
+) -> list[str]:
+    """
+    Convert many byte arrays into Base64-encoded FSK modulated WAV audio in one call.
+
+    Parameters:
+        payloads: Sequence of input byte arrays.
+        freq0: Carrier frequency for binary 0.
+        freq1: Carrier frequency for binary 1.
+        sampling_rate: Sampling rate in Hz.
+        baud_rate: Symbol rate (symbols per second).
+        engine: "sin" for output identical to calling byte_array_to_fsk on each payload, or
+                "wavetable" to gather precomputed symbol templates (see wavetable.py).
+
+    Returns:
+        A list of Base64 encoded WAV audio strings.
+    """
+    return _batch_to_base64(payloads, freq0, freq1, sampling_rate, baud_rate, continuous=False, engine=engine)
+
+def byte_arrays_to_cpfsk(
+    payloads: Sequence[bytes],
+    freq0: float,
+    freq1: float,
+    sampling_rate: float,
+    baud_rate: float,
+    engine: str = "sin"
+) -> list[str]:
+    """
+    Convert many byte arrays into Base64-encoded CPFSK modulated WAV audio in one call.
+
+    Parameters:
+        payloads: Sequence of input byte arrays.
+        freq0: Carrier frequency for binary 0.
+        freq1: Carrier frequency for binary 1.
+        sampling_rate: Sampling rate in Hz.
+        baud_rate: Symbol rate (symbols per second).
+        engine: "sin" for output identical to calling byte_array_to_cpfsk on each payload, or
+                "wavetable" to gather precomputed symbol templates (see wavetable.py).
+
+    Returns:
+        A list of Base64 encoded WAV audio strings.
+    """
+    return _batch_to_base64(payloads, freq0, freq1, sampling_rate, baud_rate, continuous=True, engine=engine)
+#endregion
+
+#region Batch Demodulation
+def _demodulate_rows(signals: NDArray[np.float32], tables: ModemTables) -> NDArray[np.uint8]:
+    """Decide the bits of equally long whole-symbol messages, one per row: (messages, symbols)."""
+    n_symbols = complete_symbols(tables, 0, signals.shape[1])
+    if tables.symbol_ratio.denominator == 1:
+        # Rows are whole symbols, so the matrix is one long signal demodulated in one call.
+        bits = _demodulate_block(signals.ravel(), tables)
+    else:
+        # Fractional symbol boundaries restart with every message, so gather each message's
+        # symbol rows separately and stack them into one matrix.
+        symbols = np.concatenate([symbol_matrix(signal, tables) for signal in signals])
+        bits = _decide_bits(tone_magnitudes(symbols, tables.bank))
+    return bits.reshape(signals.shape[0], n_symbols)
+
+def fsk_to_byte_arrays(
+    audios_base64: Sequence[str],
+    freq0: float,
+    freq1: float,
+    sampling_rate: float,
+    baud_rate: float,
+    channel: Optional[int] = None,
+    decimate: Optional[bool] = None
+) -> list[bytes]:
+    """
+    Convert many Base64-encoded FSK (or CPFSK) WAV audios back to their byte arrays in one call.
+
+    Messages with the same WAV layout and length (all the messages of one encoder and payload
+    size) share one header parse, one int16 to float conversion and one demodulation matrix
+    product. Base64 decoding stays per message and bounds the gain over a loop (bench_batch.py).
+
+    Parameters:
+        audios_base64: Sequence of Base64 encoded WAV audio strings (any layout
+                       audio_format.float_samples reads).
+        freq0: Carrier frequency for binary 0.
+        freq1: Carrier frequency for binary 1.
+        sampling_rate: Sampling rate in Hz, used only if a header gives none.
+        baud_rate: Symbol rate (symbols per second).
+        channel: Channel to demodulate, or None for the average of all channels.
+        decimate: Resample to the lowest rate that keeps the tones first (see
+                  fsk_demod.fsk_demodulation_from_base64).
+
+    Returns:
+        A list of recovered byte arrays, identical to calling fsk_to_byte_array on each audio.
+    """
+    freqs = (freq0, freq1)
+    get_tables(freqs, sampling_rate, baud_rate)
+    if decimate is None:
+        decimate = "correlate" in _DECIMATE_METHODS
+
+    # Parse every header first so a bad message fails before any demodulation work. A
+    # message starting with the previous message's header bytes, at the same size, has the
+    # same layout, so the header is only compared, not parsed again.
+    messages = [base64.b64decode(audio) for audio in audios_base64]
+    layouts: dict[WavInfo, list[int]] = {}
+    info, header, size = None, b'', -1
+    for index, wav_data in enumerate(messages):
+        if len(wav_data) != size or not wav_data.startswith(header):
+            info = audio_info(wav_data)
+            check_layout(info, channel)
+            header, size = wav_data[: info.data_offset], len(wav_data)
+        layouts.setdefault(info, []).append(index)
+
+    results: list[bytes] = [b''] * len(messages)
+    for info, indices in layouts.items():
+        frame_size = info.n_channels * info.sampwidth
+        # Cache-sized groups of messages, each converted and demodulated as one matrix.
+        step = max(1, _MAX_GROUP_SAMPLES // max(info.n_frames, 1))
+        for first in range(0, len(indices), step):
+            group = indices[first : first + step]
+            if decimate:
+                # Resampling works on whole messages and costs far more than the conversion.
+                resampled = [
+                    _demodulation_signal(float_samples(messages[i], info, channel), info.framerate or None,
+                                         sampling_rate, baud_rate, freqs, "correlate", True)
+                    for i in group
+                ]
+                tables = get_tables(freqs, resampled[0][1], baud_rate)
+                used = symbol_start(tables, complete_symbols(tables, 0, resampled[0][0].size))
+                signals = np.stack([signal[:used] for signal, _ in resampled])
+            else:
+                tables = get_tables(freqs, info.framerate or sampling_rate, baud_rate)
+                used = symbol_start(tables, complete_symbols(tables, 0, info.n_frames))
+                # Join the whole-symbol part of every message's samples and convert them in one pass.
+                data = b''.join(memoryview(messages[i])[info.data_offset : info.data_offset + used * frame_size]
+                                for i in group)
+                signals = float_samples(data, info._replace(n_frames=len(group) * used, data_offset=0), channel)
+                signals = signals.reshape(len(group), used)
+            for i, message_bytes in zip(group, np.packbits(_demodulate_rows(signals, tables), axis=1)):
+                results[i] = message_bytes.tobytes()
+    return results
+
+def cpfsk_to_byte_arrays(
+    audios_base64: Sequence[str],
+    freq0: float,
+    freq1: float,
+    sampling_rate: float,
+    baud_rate: float,
+    channel: Optional[int] = None,
+    decimate: Optional[bool] = None
+) -> list[bytes]:
+    """
+    Convert many Base64-encoded CPFSK WAV audios back to their byte arrays in one call.
+
+    Parameters:
+        audios_base64: Sequence of Base64 encoded WAV audio strings.
+        freq0: Carrier frequency for binary 0.
+        freq1: Carrier frequency for binary 1.
+        sampling_rate: Sampling rate in Hz, used only if a header gives none.
+        baud_rate: Symbol rate (symbols per second).
+        channel: Channel to demodulate, or None for the average of all channels.
+        decimate: See fsk_to_byte_arrays.
+
+    Returns:
+        A list of recovered byte arrays, identical to calling cpfsk_to_byte_array on each audio.
+    """
+    # The receiver treats both modulations the same way, as in wrapper.cpfsk_to_byte_array.
+    return fsk_to_byte_arrays(audios_base64, freq0, freq1, sampling_rate, baud_rate, channel, decimate)
+#endregion
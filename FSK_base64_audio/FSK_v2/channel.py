@@ -0,0 +1,261 @@
+# channel.py
+import math
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import NamedTuple, Optional, Sequence
+import numpy as np
+from numpy.typing import NDArray
+from .tables import get_tables
+from .fsk_mod import fsk_modulation
+from .cpfsk_mod import cpfsk_modulation
+from .fsk_demod import DEMOD_METHODS, _demodulate_block
+
+#region Channel Impairments
+# Every impairment works along the last axis, so a (trials, samples) batch is processed at once.
+def awgn(
+    signal: NDArray[np.float_],
+    ebn0_db: float,
+    samples_per_bit: float,
+    rng: np.random.Generator
+) -> NDArray[np.float_]:
+    """
+    Add white Gaussian noise at a given Eb/N0.
+
+    The bit energy is measured from the signal (mean power times samples per bit) and the
+    noise variance per real sample is N0 / 2, so results compare directly with textbook curves.
+
+    Parameters:
+        signal: Clean signal(s), time along the last axis.
+        ebn0_db: Energy per bit over noise spectral density, in dB.
+        samples_per_bit: Samples per bit (sampling_rate / baud_rate for binary FSK).
+        rng: Random generator supplying the noise.
+
+    Returns:
+        The noisy signal (a new array).
+    """
+    power = np.mean(np.square(signal), axis=-1, keepdims=True)
+    sigma = np.sqrt(power * samples_per_bit / (2 * 10 ** (ebn0_db / 10)))
+    return signal + sigma * rng.standard_normal(signal.shape)
+
+def frequency_shift(signal: NDArray[np.float_], offset: float, sampling_rate: float) -> NDArray[np.float_]:
+    """
+    Shift every frequency component of a real signal by offset Hz (a transmitter/receiver
+    oscillator mismatch), via the analytic signal computed with one FFT along the last axis.
+    """
+    n = signal.shape[-1]
+    spectrum = np.fft.fft(signal, axis=-1)
+    spectrum[..., (n + 1) // 2 :] = 0.0
+    spectrum[..., 1 : (n + 1) // 2] *= 2.0
+    analytic = np.fft.ifft(spectrum, axis=-1)
+    return (analytic * np.exp(2j * np.pi * offset / sampling_rate * np.arange(n))).real
+
+def timing_jitter(signal: NDArray[np.float_], jitter: float, rng: np.random.Generator) -> NDArray[np.float_]:
+    """
+    Resample a signal at instants n + e[n], e ~ N(0, jitter²) in samples (sampling clock jitter),
+    with linear interpolation between neighbouring samples.
+    """
+    n = signal.shape[-1]
+    instants = np.clip(np.arange(n) + jitter * rng.standard_normal(signal.shape), 0, n - 1)
+    left = np.minimum(instants.astype(np.intp), n - 2) if n > 1 else np.zeros(signal.shape, dtype=np.intp)
+    frac = instants - left
+    right = np.minimum(left + 1, n - 1)
+    return (1 - frac) * np.take_along_axis(signal, left, -1) + frac * np.take_along_axis(signal, right, -1)
+
+def apply_channel(
+    signal: NDArray[np.float_],
+    sampling_rate: float,
+    baud_rate: float,
+    ebn0_db: float,
+    rng: np.random.Generator,
+    freq_offset: float = 0.0,
+    jitter: float = 0.0
+) -> NDArray[np.float_]:
+    """
+    Pass clean signal(s) through the simulated channel: frequency offset, timing jitter, then AWGN.
+
+    Parameters:
+        signal: Clean signal(s), time along the last axis.
+        sampling_rate: Number of samples per second (Hz).
+        baud_rate: Symbol rate (binary symbols per second).
+        ebn0_db: Eb/N0 in dB (np.inf for no noise).
+        rng: Random generator for noise and jitter.
+        freq_offset: Carrier frequency offset in Hz.
+        jitter: RMS sampling-instant jitter in samples.
+
+    Returns:
+        The received signal(s).
+    """
+    if freq_offset:
+        signal = frequency_shift(signal, freq_offset, sampling_rate)
+    if jitter:
+        signal = timing_jitter(signal, jitter, rng)
+    if np.isfinite(ebn0_db):
+        signal = awgn(signal, ebn0_db, sampling_rate / baud_rate, rng)
+    return signal
+#endregion
+
+#region Monte-Carlo BER Simulation
+MODULATIONS = {"fsk": fsk_modulation, "cpfsk": cpfsk_modulation}
+
+class BERCurve(NamedTuple):
+    """
+    Bit and frame error rates of one modem configuration over a range of Eb/N0.
+
+    Attributes:
+        ebn0_db: Eb/N0 points (dB).
+        ber: Bit error rate at each point.
+        fer: Frame error rate at each point (a frame is in error if any of its bits is).
+        bit_errors: Bit errors counted at each point.
+        frame_errors: Frame errors counted at each point.
+        bits: Bits simulated per point.
+        frames: Frames simulated per point.
+    """
+    ebn0_db: NDArray[np.float_]
+    ber: NDArray[np.float_]
+    fer: NDArray[np.float_]
+    bit_errors: NDArray[np.int64]
+    frame_errors: NDArray[np.int64]
+    bits: int
+    frames: int
+
+def noncoherent_bfsk_ber(ebn0_db: NDArray[np.float_]) -> NDArray[np.float_]:
+    """Theoretical BER of orthogonal binary FSK with noncoherent detection: exp(-Eb/N0 / 2) / 2."""
+    return 0.5 * np.exp(-0.5 * 10 ** (np.asarray(ebn0_db, dtype=np.float64) / 10))
+
+def _simulate_point(
+    seed: np.random.SeedSequence,
+    ebn0_db: float,
+    sampling_rate: float,
+    baud_rate: float,
+    freq0: float,
+    freq1: float,
+    modulation: str,
+    method: str,
+    frame_bits: int,
+    frames: int,
+    freq_offset: float,
+    jitter: float,
+    batch_frames: int
+) -> tuple[int, int]:
+    """Count (bit errors, frame errors) at one Eb/N0 point; runs in a worker process when parallel."""
+    rng = np.random.default_rng(seed)
+    tables = get_tables((freq0, freq1), sampling_rate, baud_rate)
+    bit_errors = frame_errors = 0
+    for start in range(0, frames, batch_frames):
+        count = min(batch_frames, frames - start)
+        # The batch of frames is one (count, frame_bits) matrix, modulated and demodulated as a single stream.
+        bits = rng.integers(0, 2, (count, frame_bits), dtype=np.uint8)
+        signal, _ = MODULATIONS[modulation](bits.ravel(), freq0, freq1, sampling_rate, baud_rate)
+        received = apply_channel(signal, sampling_rate, baud_rate, ebn0_db, rng, freq_offset, jitter)
+        errors = (_demodulate_block(received, tables, method) != bits.ravel()).reshape(count, frame_bits)
+        bit_errors += int(errors.sum())
+        frame_errors += int(errors.any(axis=1).sum())
+    return bit_errors, frame_errors
+
+def simulate_ber(
+    ebn0_db: Sequence[float],
+    sampling_rate: float,
+    baud_rate: float,
+    freq0: float,
+    freq1: float,
+    modulation: str = "fsk",
+    method: str = "correlate",
+    frame_bits: int = 256,
+    frames: int = 1000,
+    freq_offset: float = 0.0,
+    jitter: float = 0.0,
+    seed: int = 0,
+    workers: int = 1,
+    executor: Optional[Executor] = None,
+    max_batch_samples: int = 1 << 22
+) -> BERCurve:
+    """
+    Estimate BER and FER curves by Monte-Carlo simulation.
+
+    At each Eb/N0 point, frames of random bits are modulated, passed through apply_channel()
+    and demodulated in batches of up to max_batch_samples samples. Each point draws from its
+    own child of SeedSequence(seed), so results are reproducible and independent of the number
+    of workers; the same seed gives every configuration the same bits and noise draws.
+
+    Parameters:
+        ebn0_db: Eb/N0 points (dB).
+        sampling_rate: Number of samples per second (Hz).
+        baud_rate: Symbol rate (symbols per second).
+        freq0: Carrier frequency representing bit 0.
+        freq1: Carrier frequency representing bit 1.
+        modulation: "fsk" or "cpfsk".
+        method: Demodulation backend, one of fsk_demod.DEMOD_METHODS.
+        frame_bits: Bits per frame (for the frame error rate).
+        frames: Frames simulated per point.
+        freq_offset: Carrier frequency offset in Hz.
+        jitter: RMS sampling-instant jitter in samples.
+        seed: Seed for bits, noise and jitter.
+        workers: Number of worker processes across Eb/N0 points (1 runs in this process).
+        executor: Optional existing process pool to reuse across calls.
+        max_batch_samples: Upper bound on the samples simulated at once per point.
+
+    Returns:
+        A BERCurve.
+    """
+    if modulation not in MODULATIONS:
+        raise ValueError(f"Unknown modulation {modulation!r}; expected one of {sorted(MODULATIONS)}")
+    if method not in DEMOD_METHODS:
+        raise ValueError(f"Unknown demodulation method {method!r}; expected one of {sorted(DEMOD_METHODS)}")
+    points = np.asarray(ebn0_db, dtype=np.float64)
+    frame_samples = math.ceil(frame_bits * sampling_rate / baud_rate)
+    batch_frames = max(1, min(frames, max_batch_samples // max(frame_samples, 1)))
+    seeds = np.random.SeedSequence(seed).spawn(points.size)
+    args = [
+        (child, float(point), sampling_rate, baud_rate, freq0, freq1, modulation, method,
+         frame_bits, frames, freq_offset, jitter, batch_frames)
+        for child, point in zip(seeds, points)
+    ]
+
+    if executor is None and workers <= 1:
+        counts = [_simulate_point(*point_args) for point_args in args]
+    else:
+        own_executor = executor is None
+        if own_executor:
+            executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            counts = list(executor.map(_simulate_point, *zip(*args)))
+        finally:
+            if own_executor:
+                executor.shutdown()
+
+    bit_errors = np.array([c[0] for c in counts], dtype=np.int64)
+    frame_errors = np.array([c[1] for c in counts], dtype=np.int64)
+    bits = frames * frame_bits
+    return BERCurve(points, bit_errors / bits, frame_errors / frames, bit_errors, frame_errors, bits, frames)
+
+def ber_curves(
+    ebn0_db: Sequence[float],
+    sampling_rate: float,
+    baud_rate: float,
+    freq0: float,
+    freq1: float,
+    modulations: Sequence[str] = tuple(MODULATIONS),
+    methods: Sequence[str] = tuple(DEMOD_METHODS),
+    **kwargs
+) -> dict[tuple[str, str], BERCurve]:
+    """
+    Simulate every (modulation, demodulation method) pair with the same seed.
+
+    Parameters:
+        ebn0_db: Eb/N0 points (dB).
+        sampling_rate: Number of samples per second (Hz).
+        baud_rate: Symbol rate (symbols per second).
+        freq0: Carrier frequency representing bit 0.
+        freq1: Carrier frequency representing bit 1.
+        modulations: Modulations to compare ("fsk", "cpfsk").
+        methods: Demodulation backends to compare.
+        **kwargs: Passed on to simulate_ber (frames, freq_offset, jitter, seed, workers, ...).
+
+    Returns:
+        {(modulation, method): BERCurve}.
+    """
+    return {
+        (modulation, method): simulate_ber(ebn0_db, sampling_rate, baud_rate, freq0, freq1, modulation, method, **kwargs)
+        for modulation in modulations
+        for method in methods
+    }
+#endregion
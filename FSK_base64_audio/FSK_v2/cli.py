@@ -0,0 +1,225 @@
+# cli.py
+import argparse
+import sys
+from typing import BinaryIO, Iterator, Optional, Sequence
+
+# Only argparse is imported up front, so `fsk --help` and argument errors are instant; each
+# command imports just the modules it needs (numpy comes with the first modem module).
+
+#region Streams
+_CHUNK_SIZE = 1 << 16
+
+def _read_chunks(stream: BinaryIO) -> Iterator[bytes]:
+    """Yield whatever input is available, up to _CHUNK_SIZE bytes at a time, until EOF."""
+    read = getattr(stream, "read1", stream.read)
+    while True:
+        chunk = read(_CHUNK_SIZE)
+        if not chunk:
+            return
+        yield chunk
+
+def _sample_chunks(stream: BinaryIO, sampwidth: int, limit: Optional[int] = None) -> Iterator[bytes]:
+    """Like _read_chunks, but yield whole samples only and stop after limit bytes."""
+    pending = b""
+    for chunk in _read_chunks(stream):
+        if limit is not None:
+            chunk = chunk[:limit]
+            limit -= len(chunk)
+        chunk = pending + chunk
+        cut = len(chunk) - len(chunk) % sampwidth
+        pending = chunk[cut:]
+        if cut:
+            yield chunk[:cut]
+        if limit == 0:
+            return
+
+class _Base64Writer:
+    """Binary sink that Base64-encodes everything written to it, 3-byte groups at a time."""
+    def __init__(self, sink: BinaryIO):
+        self._sink = sink
+        self._pending = b""
+
+    def write(self, data: bytes) -> int:
+        buffer = self._pending + bytes(data)
+        cut = len(buffer) - len(buffer) % 3
+        self._sink.write(self._encode(buffer[:cut]))
+        self._pending = buffer[cut:]
+        return len(data)
+
+    def close(self) -> None:
+        """Write the final (padded) group and a newline."""
+        self._sink.write(self._encode(self._pending) + b"\n")
+        self._pending = b""
+
+    @staticmethod
+    def _encode(data: bytes) -> bytes:
+        import base64
+        return base64.b64encode(data)
+#endregion
+
+#region Commands
+def _encode(args: argparse.Namespace, source: BinaryIO, sink: BinaryIO) -> None:
+    """Modulate the input bytes into audio."""
+    writer = _Base64Writer(sink) if args.base64 else sink
+    if args.container == "raw" and args.fec is None:
+        # Raw audio needs no frame count up front, so input is modulated as it arrives.
+        from .audio_format import check_encoding, encode_samples
+        from .streaming import cpfsk_modulation_stream, fsk_modulation_stream
+        check_encoding(args.encoding)
+        stream = cpfsk_modulation_stream if args.modulation == "cpfsk" else fsk_modulation_stream
+        blocks = stream(_read_chunks(source), args.freq0, args.freq1, args.sampling_rate, args.baud_rate, pcm16=True)
+        for block in blocks:
+            writer.write(memoryview(encode_samples(block, args.encoding)).cast('B'))
+    else:
+        # The WAV header and the packet length both need the whole payload first.
+        from .wrapper import byte_array_to_cpfsk_sink, byte_array_to_fsk_sink
+        to_sink = byte_array_to_cpfsk_sink if args.modulation == "cpfsk" else byte_array_to_fsk_sink
+        to_sink(source.read(), writer, args.freq0, args.freq1, args.sampling_rate, args.baud_rate,
+                container=args.container, encoding=args.encoding, fec=args.fec)
+    if args.base64:
+        writer.close()
+
+def _decode(args: argparse.Namespace, source: BinaryIO, sink: BinaryIO) -> None:
+    """Demodulate the input audio back into bytes."""
+    import base64
+    from .audio_format import ENCODINGS, CONTAINERS, check_encoding, decode_samples, read_wav_info, wav_encoding, wav_header
+    if args.base64 or args.fec is not None:
+        # Base64 text and packets are decoded in one go.
+        audio = source.read()
+        _decode_all(args, audio.decode('ascii') if args.base64 else base64.b64encode(audio).decode('ascii'), sink)
+        return
+
+    # Binary audio is demodulated as it arrives; bytes are written as soon as they are decided.
+    from .streaming import StreamingDemodulator
+    if args.container not in CONTAINERS:
+        raise ValueError(f"Unknown container {args.container!r}; expected one of {CONTAINERS}")
+    encoding, limit, rate = args.encoding, None, args.sampling_rate
+    if args.container == "wav":
+        info = read_wav_info(source)
+        layout = (info.format_tag, info.sampwidth)
+        if info.n_channels != 1 or layout not in ENCODINGS.values() or args.channel is not None:
+            # Multichannel, 24/32-bit and float audio go through the one-shot float decoder,
+            # behind a header rebuilt from the one already read.
+            frame_size = info.n_channels * info.sampwidth
+            data = source.read(info.n_frames * frame_size)
+            header = wav_header(len(data) // frame_size, info.framerate, info.n_channels, info.sampwidth, info.format_tag)
+            _decode_all(args, base64.b64encode(header + data).decode('ascii'), sink)
+            return
+        encoding = wav_encoding(*layout)
+        limit, rate = info.n_frames * info.sampwidth, info.framerate
+    check_encoding(encoding)
+    demod = StreamingDemodulator(rate, args.baud_rate, args.freq0, args.freq1, args.method, args.decimate)
+    for chunk in _sample_chunks(source, ENCODINGS[encoding][1], limit):
+        data = demod.feed(decode_samples(chunk, encoding))
+        if data:
+            sink.write(data)
+            sink.flush()
+    sink.write(demod.flush())
+
+def _decode_all(args: argparse.Namespace, audio_base64: str, sink: BinaryIO) -> None:
+    """Demodulate Base64 audio held in memory with the one-shot decoder of the Python API."""
+    from .wrapper import fsk_to_byte_array
+    sink.write(fsk_to_byte_array(
+        audio_base64, args.freq0, args.freq1, args.sampling_rate, args.baud_rate, args.container, args.encoding,
+        args.fec, args.method, args.channel, args.decimate
+    ))
+
+def _plot(args: argparse.Namespace, source: BinaryIO, sink: BinaryIO) -> None:
+    """Plot WAV audio, on screen or to an image file."""
+    import base64
+    audio = source.read()
+    audio_base64 = b"".join(audio.split()).decode('ascii') if args.base64 else base64.b64encode(audio).decode('ascii')
+    if args.image is not None:
+        import matplotlib
+        matplotlib.use("Agg")
+    from .plot_signal import plot_modulated_signal, plot_spectrogram
+    if args.spectrogram:
+        plot_spectrogram(audio_base64, args.title, args.image is None, args.start, args.end, tones=args.tones)
+    else:
+        plot_modulated_signal(audio_base64, args.title, args.image is None, args.start, args.end)
+    if args.image is not None:
+        import matplotlib.pyplot as plt
+        plt.savefig(args.image)
+#endregion
+
+#region Argument Parsing
+def build_parser() -> argparse.ArgumentParser:
+    """Return the argument parser of the fsk command-line tool."""
+    parser = argparse.ArgumentParser(
+        prog="fsk",
+        description="FSK/CPFSK modem: bytes on stdin become audio on stdout, and back.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    input_options = argparse.ArgumentParser(add_help=False)
+    input_options.add_argument("-i", "--input", default="-", help="input file (default: stdin)")
+    input_options.add_argument("--base64", action="store_true", help="audio is Base64 text instead of binary")
+    output_options = argparse.ArgumentParser(add_help=False)
+    output_options.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+
+    modem_options = argparse.ArgumentParser(add_help=False)
+    modem_options.add_argument("--freq0", type=float, default=1200.0, help="tone for bit 0 in Hz (default: 1200)")
+    modem_options.add_argument("--freq1", type=float, default=2200.0, help="tone for bit 1 in Hz (default: 2200)")
+    modem_options.add_argument("--sampling-rate", type=float, default=44100.0, help="samples per second; read from the header for wav input (default: 44100)")
+    modem_options.add_argument("--baud-rate", type=float, default=300.0, help="symbols per second (default: 300)")
+    modem_options.add_argument("--container", default="wav", help="wav or raw headerless samples (default: wav)")
+    modem_options.add_argument("--encoding", default="pcm16", help="pcm16, pcm8 or mulaw; read from the header for wav input (default: pcm16)")
+    modem_options.add_argument("--fec", default=None, help="send a CRC-checked packet with FEC none, hamming74 or conv")
+
+    encode = commands.add_parser("encode", parents=[input_options, output_options, modem_options], help="modulate bytes into audio")
+    encode.add_argument("--modulation", choices=("fsk", "cpfsk"), default="fsk", help="(default: fsk)")
+    encode.set_defaults(handler=_encode)
+
+    decode = commands.add_parser("decode", parents=[input_options, output_options, modem_options], help="demodulate audio into bytes (FSK or CPFSK)")
+    decode.add_argument("--method", default="correlate", help="correlate, goertzel or fft (default: correlate)")
+    decode.add_argument("--channel", type=int, default=None, help="channel of multichannel wav input to decode (default: average of all)")
+    decode.add_argument("--decimate", action=argparse.BooleanOptionalAction, default=None,
+                        help="resample to the lowest rate that keeps the tones before demodulating (default: for goertzel only)")
+    decode.set_defaults(handler=_decode)
+
+    plot = commands.add_parser("plot", parents=[input_options], help="plot WAV audio (needs matplotlib)")
+    plot.add_argument("--title", default="Modulated Signal", help="plot title")
+    plot.add_argument("--start", type=float, default=0.0, help="start of the plotted window in seconds")
+    plot.add_argument("--end", type=float, default=None, help="end of the plotted window in seconds")
+    plot.add_argument("--spectrogram", action="store_true", help="plot the spectrogram instead of the waveform")
+    plot.add_argument("--tones", type=float, nargs="*", default=None, help="tone frequencies to mark on the spectrogram")
+    plot.add_argument("--image", default=None, help="save the plot to this image file instead of showing it")
+    plot.set_defaults(handler=_plot)
+    return parser
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Run the fsk command-line tool.
+
+    Usage Example:
+        printf 'Hello' | python -m FSK_v2 encode --modulation cpfsk | python -m FSK_v2 decode
+
+    Parameters:
+        argv: Arguments without the program name (default: sys.argv[1:]).
+
+    Returns:
+        The process exit status.
+    """
+    args = build_parser().parse_args(argv)
+    try:
+        source = sys.stdin.buffer if args.input == "-" else open(args.input, 'rb')
+        try:
+            output = getattr(args, "output", "-")
+            sink = sys.stdout.buffer if output == "-" else open(output, 'wb')
+            try:
+                args.handler(args, source, sink)
+                sink.flush()
+            finally:
+                if sink is not sys.stdout.buffer:
+                    sink.close()
+        finally:
+            if source is not sys.stdin.buffer:
+                source.close()
+    except BrokenPipeError:
+        # The reader went away (e.g. `| head`); stop quietly like other filters.
+        return 1
+    except (OSError, ValueError) as error:
+        print(f"fsk: error: {error}", file=sys.stderr)
+        return 1
+    return 0
+#endregion
@@ -0,0 +1,187 @@
+# fdm.py
+import base64
+import io
+import math
+from typing import Optional, Sequence
+import numpy as np
+from numpy.typing import NDArray
+from .tables import get_tables, symbol_start
+from .fsk_mod import fsk_modulation
+from .cpfsk_mod import cpfsk_modulation
+from .fsk_demod import symbol_matrix, symbol_spectra, _signal_from_base64
+from .packet import PacketError, decode_packet, encode_packet
+from .resample import resample
+from .wav_io import write_pcm16
+
+#region Tone Plan
+# Every tone sits exactly on a bin of the rfft of one symbol window (samples_per_bit samples),
+# so within a symbol each tone falls in its own bin with no leakage into the others and
+# adjacent bins are orthogonal: one rfft per symbol separates every channel at once.
+def fdm_tone_plan(
+    n_channels: int,
+    sampling_rate: float,
+    baud_rate: float,
+    low: float = 1200.0,
+    bin_step: int = 1
+) -> list[tuple[float, float]]:
+    """
+    Place n_channels tone pairs on consecutive rfft bins of the symbol window.
+
+    Parameters:
+        n_channels: Number of channels.
+        sampling_rate: Number of samples per second (Hz).
+        baud_rate: Symbol rate (symbols per second).
+        low: Lowest usable frequency (Hz); the first tone is the first bin at or above it.
+        bin_step: Bins between neighbouring tones (1 = tightest orthogonal spacing).
+
+    Returns:
+        [(freq0, freq1), ...] per channel, all below the Nyquist frequency.
+    """
+    tables = get_tables((), sampling_rate, baud_rate)
+    spacing = sampling_rate / tables.samples_per_bit
+    if n_channels < 1 or bin_step < 1:
+        raise ValueError("n_channels and bin_step must be positive")
+    first = max(1, math.ceil(low / spacing - 1e-9))
+    top = (tables.samples_per_bit - 1) // 2  # Highest bin below Nyquist.
+    bins = first + bin_step * np.arange(2 * n_channels)
+    if bins[-1] > top:
+        available = max((top - first) // bin_step + 1, 0) // 2
+        raise ValueError(f"Room for at most {available} channels above {low} Hz at this baud rate")
+    return [(float(bins[2 * c] * spacing), float(bins[2 * c + 1] * spacing)) for c in range(n_channels)]
+
+def _tone_bins(tones: Sequence[tuple[float, float]], sampling_rate: float, samples_per_bit: int) -> NDArray[np.intp]:
+    """rfft bin of every tone, shape (n_channels, 2); tones must lie on the bin grid."""
+    freqs = np.asarray(tones, dtype=np.float64).reshape(-1, 2)
+    exact = freqs * samples_per_bit / sampling_rate
+    bins = np.rint(exact).astype(np.intp)
+    if np.any(np.abs(exact - bins) > 1e-6) or np.any(bins < 1) or np.any(2 * bins >= samples_per_bit):
+        raise ValueError("FDM tones must be multiples of sampling_rate / samples_per_bit below Nyquist (see fdm_tone_plan)")
+    if np.unique(bins).size != bins.size:
+        raise ValueError("FDM tones must not share a bin")
+    return bins
+#endregion
+
+#region FDM Encoding
+def byte_arrays_to_fdm(
+    payloads: Sequence[bytes],
+    sampling_rate: float,
+    baud_rate: float,
+    tones: Optional[Sequence[tuple[float, float]]] = None,
+    modulation: str = "cpfsk",
+    fec: str = "none",
+    headroom: float = 0.99,
+    container: str = "wav",
+    encoding: str = "pcm16"
+) -> str:
+    """
+    Modulate N payloads on N tone pairs and sum them into one Base64-encoded WAV audio.
+
+    Each payload becomes a packet (length header + CRC-32, see packet.encode_packet), so
+    channels may differ in length; shorter channels are padded with zero bits. The sum is
+    scaled so its peak is headroom of full scale, which avoids int16 clipping.
+
+    Parameters:
+        payloads: One byte array per channel.
+        sampling_rate: Sampling rate in Hz.
+        baud_rate: Symbol rate (symbols per second), shared by every channel.
+        tones: (freq0, freq1) per channel on the rfft bin grid; defaults to fdm_tone_plan(len(payloads), ...).
+        modulation: "cpfsk" or "fsk".
+        fec: FEC code applied to every channel's packet ("none", "hamming74" or "conv").
+        headroom: Peak amplitude of the summed signal, as a fraction of full scale.
+        container: "wav" for a WAV file, or "raw" for headerless samples.
+        encoding: Sample encoding, "pcm16", "pcm8" or "mulaw" (see audio_format.ENCODINGS).
+
+    Returns:
+        A Base64 encoded audio string carrying every channel.
+    """
+    if modulation not in ("cpfsk", "fsk"):
+        raise ValueError(f"Unknown modulation {modulation!r}; expected 'cpfsk' or 'fsk'")
+    if tones is None:
+        tones = fdm_tone_plan(len(payloads), sampling_rate, baud_rate)
+    if len(tones) != len(payloads):
+        raise ValueError("Need one tone pair per payload")
+    tables = get_tables((), sampling_rate, baud_rate)
+    _tone_bins(tones, sampling_rate, tables.samples_per_bit)
+
+    packets = [np.unpackbits(np.frombuffer(encode_packet(data, fec), dtype=np.uint8)) for data in payloads]
+    n_bits = max((bits.size for bits in packets), default=0)
+    modulate = cpfsk_modulation if modulation == "cpfsk" else fsk_modulation
+    signal = np.zeros(symbol_start(tables, n_bits))
+    for bits, (freq0, freq1) in zip(packets, tones):
+        channel, _ = modulate(np.pad(bits, (0, n_bits - bits.size)), freq0, freq1, sampling_rate, baud_rate)
+        signal += channel
+
+    peak = np.abs(signal).max() if signal.size else 0.0
+    if peak > 0:
+        signal *= headroom / peak
+    pcm = (signal * 32767).astype(np.int16)
+    with io.BytesIO() as buffer:
+        write_pcm16(buffer, [pcm], pcm.size, sampling_rate, container, encoding)
+        return base64.b64encode(buffer.getbuffer()).decode('ascii')
+#endregion
+
+#region FDM Decoding
+def fdm_soft_demodulation(
+    modulated_signal: NDArray[np.float_],
+    sampling_rate: float,
+    baud_rate: float,
+    tones: Sequence[tuple[float, float]]
+) -> NDArray[np.float_]:
+    """
+    Demodulate every FDM channel at once from one rfft per symbol.
+
+    Parameters:
+        modulated_signal: NDArray of floats carrying the summed channels.
+        sampling_rate: Number of samples per second (Hz).
+        baud_rate: Symbol rate (symbols per second).
+        tones: (freq0, freq1) per channel, as used by the transmitter.
+
+    Returns:
+        soft: NDArray of shape (n_channels, num_symbols) with (m1 - m0) / (m1 + m0) per symbol.
+    """
+    tables = get_tables((), sampling_rate, baud_rate)
+    bins = _tone_bins(tones, sampling_rate, tables.samples_per_bit)
+    symbols = symbol_matrix(modulated_signal, tables)
+    spectra = symbol_spectra(symbols, tables.samples_per_bit)
+    mags = spectra[:, bins]  # (num_symbols, n_channels, 2)
+    total = np.maximum(mags[..., 0] + mags[..., 1], np.finfo(np.float64).tiny)
+    return ((mags[..., 1] - mags[..., 0]) / total).T
+
+def fdm_to_byte_arrays(
+    audio_base64: str,
+    sampling_rate: float,
+    baud_rate: float,
+    tones: Sequence[tuple[float, float]],
+    fec: str = "none",
+    container: str = "wav",
+    encoding: str = "pcm16",
+    channel: Optional[int] = None
+) -> list[Optional[bytes]]:
+    """
+    Recover every channel of a Base64-encoded FDM audio.
+
+    Parameters:
+        audio_base64: Base64 encoded audio from byte_arrays_to_fdm.
+        sampling_rate: Sampling rate in Hz used by the transmitter; WAV audio recorded at
+                       another rate is resampled to it, since the tones sit on its bin grid.
+        baud_rate: Symbol rate (symbols per second).
+        tones: (freq0, freq1) per channel, as used by the transmitter.
+        fec: FEC code used by the transmitter.
+        container: "wav" (any encoding, read from the header) or "raw" for headerless samples.
+        encoding: Sample encoding of raw audio, "pcm16", "pcm8" or "mulaw"; ignored for WAV.
+        channel: Audio channel to demodulate, or None for the average of all channels.
+
+    Returns:
+        One payload per channel, or None for a channel whose packet failed its CRC check.
+    """
+    modulated_signal, framerate = _signal_from_base64(audio_base64, container, encoding, channel)
+    if framerate is not None:
+        modulated_signal = resample(modulated_signal, framerate, sampling_rate)
+    payloads: list[Optional[bytes]] = []
+    for soft in fdm_soft_demodulation(modulated_signal, sampling_rate, baud_rate, tones):
+        try:
+            payloads.append(decode_packet(soft, fec))
+        except PacketError:
+            payloads.append(None)
+    return payloads
+#endregion
@@ -1,9 +1,13 @@
 # fsk_mod.py
 import numpy as np
-from numpy.typing import NDArray
+from numpy.typing import DTypeLike, NDArray
 import io
-import wave
 import base64
+from typing import BinaryIO, Optional
+from . import metrics
+from .tables import get_tables, repeat_symbols, symbol_start
+from .synthesis import _pcm16_blocks, synthesize_pcm16
+from .wav_io import write_pcm16
 
 #region Basic FSK Modulation Function
 def fsk_modulation(
@@ -27,15 +31,16 @@ def fsk_modulation(
         signal: The FSK modulated signal as an NDArray of floats.
         t: A corresponding time axis for the signal.
     """
-    # Calculate the number of samples per transmitted bit
-    samples_per_bit: int = int(sampling_rate / baud_rate)
+    # Look up the cached samples-per-bit layout and frequency map for these parameters
+    tables = get_tables((freq0, freq1), sampling_rate, baud_rate)
     
     # Map each bit to its corresponding frequency:
     # Bits with value 0 become freq0, and bits with value 1 become freq1.
-    mapped_freqs: NDArray[np.float_] = np.where(bit_sequence == 0, freq0, freq1)
+    mapped_freqs: NDArray[np.float_] = tables.freqs[(np.asarray(bit_sequence) != 0).astype(np.intp)]
     
     # Create a frequency sequence where each bit’s frequency is repeated for its duration
-    symbol_freqs: NDArray[np.float_] = np.repeat(mapped_freqs, samples_per_bit)
+    # (a whole or, at fractional samples-per-bit, an exactly accumulated number of samples)
+    symbol_freqs: NDArray[np.float_] = repeat_symbols(tables, mapped_freqs)
     
     # Generate time array corresponding to the length of the modulated signal
     total_samples: int = symbol_freqs.size
@@ -48,13 +53,94 @@ def fsk_modulation(
     return signal, t
 #endregion
 
+#region Lean FSK Modulation to 16-bit PCM
+def fsk_modulation_pcm16(
+    bit_sequence: NDArray[np.int_],
+    freq0: float,
+    freq1: float,
+    sampling_rate: float,
+    baud_rate: float,
+    out: Optional[NDArray[np.int16]] = None,
+    dtype: DTypeLike = np.float64,
+    engine: str = "sin"
+) -> NDArray[np.int16]:
+    """
+    Perform FSK modulation straight to 16-bit PCM, without a time axis or full-length float arrays.
+    
+    The signal is synthesized block by block into the int16 result, so peak memory is the
+    output itself plus a fixed-size scratch area.
+    
+    Parameters:
+        bit_sequence: NDArray of bits (0s and 1s) representing the digital data.
+        freq0: Carrier frequency for bit 0.
+        freq1: Carrier frequency for bit 1.
+        sampling_rate: Number of samples per second (Hz).
+        baud_rate: Symbol rate (symbols per second).
+        out: Optional caller-supplied int16 buffer of exactly the signal length.
+        dtype: np.float64 for output identical to (fsk_modulation(...)[0] * 32767).astype(np.int16),
+               or np.float32 for faster synthesis within 1 LSB of it.
+        engine: "sin", or "wavetable" to gather precomputed symbol templates instead of
+                evaluating np.sin (much faster; see wavetable.py for its accuracy).
+        
+    Returns:
+        The int16 signal (out, if it was given).
+    """
+    tables = get_tables((freq0, freq1), sampling_rate, baud_rate)
+    tone_index = (np.asarray(bit_sequence) != 0).astype(np.intp)
+    return synthesize_pcm16(tone_index, tables, sampling_rate, continuous=False, out=out, dtype=dtype, engine=engine)
+#endregion
+
+#region FSK Modulation to Sink
+def fsk_modulation_to_sink(
+    bit_sequence: NDArray[np.int_],
+    sink: BinaryIO,
+    freq0: float,
+    freq1: float,
+    sampling_rate: float,
+    baud_rate: float,
+    container: str = "wav",
+    block_size: int = 65536,
+    dtype: DTypeLike = np.float64,
+    encoding: str = "pcm16"
+) -> int:
+    """
+    Perform FSK modulation on the input bit sequence and write the resulting 16-bit PCM audio
+    directly to a writable binary sink, one block at a time.
+    
+    Parameters:
+        bit_sequence: NDArray of bits (0s and 1s) representing the digital data.
+        sink: Writable binary object (open file, socket file, BytesIO, ...).
+        freq0: Carrier frequency for bit 0.
+        freq1: Carrier frequency for bit 1.
+        sampling_rate: Number of audio samples per second.
+        baud_rate: Symbol rate (symbols per second).
+        container: "wav" to write a WAV file, or "raw" for headerless PCM.
+        block_size: Number of samples synthesized and written per block.
+        dtype: Synthesis precision, np.float64 (exact) or np.float32 (see synthesis.SYNTH_DTYPES).
+        encoding: Sample encoding, "pcm16", "pcm8" or "mulaw" (see audio_format.ENCODINGS).
+        
+    Returns:
+        The number of bytes written to the sink.
+    """
+    tables = get_tables((freq0, freq1), sampling_rate, baud_rate)
+    n_frames = symbol_start(tables, np.size(bit_sequence))
+    
+    # Synthesize and quantize the signal block by block, writing each block as soon as it is ready
+    tone_index = (np.asarray(bit_sequence) != 0).astype(np.intp)
+    blocks = _pcm16_blocks(tone_index, tables, sampling_rate, continuous=False, dtype=dtype, block_samples=block_size)
+    blocks = metrics.timed_blocks("synthesize", blocks)
+    return write_pcm16(sink, blocks, n_frames, sampling_rate, container, encoding)
+#endregion
+
 #region FSK Modulation to Base64 Audio Wrapper
 def fsk_modulation_to_base64(
     bit_sequence: NDArray[np.int_],
     freq0: float,
     freq1: float,
     sampling_rate: float,
-    baud_rate: float
+    baud_rate: float,
+    container: str = "wav",
+    encoding: str = "pcm16"
 ) -> str:
     """
     Perform FSK modulation on the input bit sequence and convert the resulting audio signal
@@ -66,28 +152,18 @@ def fsk_modulation_to_base64(
         freq1: Carrier frequency for bit 1.
         sampling_rate: The number of audio samples per second.
         baud_rate: The symbol rate (symbols per second).
+        container: "wav" for a WAV file, or "raw" for headerless samples.
+        encoding: Sample encoding, "pcm16", "pcm8" or "mulaw" (see audio_format.ENCODINGS).
         
     Returns:
-        A Base64-encoded string representing the generated WAV audio file.
+        A Base64-encoded string representing the generated WAV audio file (or raw samples).
     """
-    # Generate the FSK-modulated signal and corresponding time axis using the basic FSK modulation function
-    signal, _ = fsk_modulation(bit_sequence, freq0, freq1, sampling_rate, baud_rate)
-    
-    # Convert the floating-point signal (assumed in range [-1, 1]) to 16-bit PCM values
-    pcm_signal = (signal * 32767).astype(np.int16)
-    
-    # Write the PCM data to an in-memory WAV file
+    # Write the WAV file into an in-memory buffer through the sink path
     with io.BytesIO() as buffer:
-        with wave.open(buffer, 'wb') as wav_file:
-            channels = 1           # Mono audio
-            sampwidth = 2          # 16-bit PCM (2 bytes per sample)
-            wav_file.setnchannels(channels)
-            wav_file.setsampwidth(sampwidth)
-            wav_file.setframerate(int(sampling_rate))
-            wav_file.writeframes(pcm_signal.tobytes())
-        wav_bytes = buffer.getvalue()
-    
-    # Encode the WAV file bytes as a Base64 string
-    audio_base64 = base64.b64encode(wav_bytes).decode('ascii')
+        fsk_modulation_to_sink(bit_sequence, buffer, freq0, freq1, sampling_rate, baud_rate, container, encoding=encoding)
+        # Encode the WAV bytes straight from the buffer, without an intermediate copy
+        with metrics.stage("b64encode") as timer:
+            audio_base64 = base64.b64encode(buffer.getbuffer()).decode('ascii')
+            timer.count(nbytes=len(audio_base64))
     return audio_base64
 #endregion
@@ -0,0 +1,189 @@
+# metrics.py
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional
+import numpy as np
+from numpy.typing import NDArray
+
+#region Stage Records
+class StageRecord(NamedTuple):
+    """
+    One measured pipeline stage.
+
+    Attributes:
+        stage: Stage name, e.g. "b64decode", "wav_parse", "pcm_to_float", "resample", "demodulate", "packbits"
+               on the decode path and "unpackbits", "synthesize", "write", "b64encode" on the encode path.
+        seconds: Wall time spent in the stage.
+        samples: Audio samples processed (0 where the stage does not handle samples).
+        nbytes: Bytes consumed or produced (0 where the stage does not handle bytes).
+    """
+    stage: str
+    seconds: float
+    samples: int
+    nbytes: int
+
+class PipelineMetrics:
+    """
+    Thread-safe cumulative counters per stage; install it with set_observer() or observe().
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages: dict[str, list] = {}
+
+    def __call__(self, record: StageRecord) -> None:
+        with self._lock:
+            counters = self._stages.setdefault(record.stage, [0, 0.0, 0, 0])
+            counters[0] += 1
+            counters[1] += record.seconds
+            counters[2] += record.samples
+            counters[3] += record.nbytes
+
+    def snapshot(self) -> dict[str, dict]:
+        """Return {stage: {"calls", "seconds", "samples", "bytes"}} with the totals so far."""
+        with self._lock:
+            return {
+                stage: {"calls": calls, "seconds": seconds, "samples": samples, "bytes": nbytes}
+                for stage, (calls, seconds, samples, nbytes) in self._stages.items()
+            }
+
+    def reset(self) -> None:
+        """Zero every counter."""
+        with self._lock:
+            self._stages.clear()
+
+    def to_prometheus(self, prefix: str = "fsk") -> str:
+        """
+        Export the counters in the Prometheus text exposition format, one labelled series per stage.
+        """
+        series = (
+            ("calls", "calls_total", "Number of times the stage ran."),
+            ("seconds", "seconds_total", "Wall time spent in the stage."),
+            ("samples", "samples_total", "Audio samples processed by the stage."),
+            ("bytes", "bytes_total", "Bytes processed by the stage."),
+        )
+        snapshot = self.snapshot()
+        lines = []
+        for key, suffix, help_text in series:
+            name = f"{prefix}_stage_{suffix}"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for stage, counters in sorted(snapshot.items()):
+                lines.append(f'{name}{{stage="{stage}"}} {counters[key]}')
+        return "\n".join(lines) + "\n"
+#endregion
+
+#region Observer
+# Instrumentation is off unless an observer is installed; every hook checks this first,
+# so the disabled cost is one global lookup per stage, not per sample or block.
+_observer: Optional[Callable[[StageRecord], None]] = None
+
+def set_observer(observer: Optional[Callable[[StageRecord], None]]) -> Optional[Callable[[StageRecord], None]]:
+    """
+    Install a process-wide stage observer (a PipelineMetrics or any callable taking a StageRecord).
+
+    Parameters:
+        observer: The observer, or None to disable instrumentation.
+
+    Returns:
+        The previously installed observer.
+    """
+    global _observer
+    previous, _observer = _observer, observer
+    return previous
+
+def enabled() -> bool:
+    """True when an observer is installed."""
+    return _observer is not None
+
+@contextmanager
+def observe(observer: Callable[[StageRecord], None]) -> Iterator[Callable[[StageRecord], None]]:
+    """
+    Install an observer for the duration of a with-block and restore the previous one afterwards.
+
+    Example:
+        with observe(PipelineMetrics()) as metrics:
+            fsk_to_byte_array(audio, 1200, 2200, 44100, 300)
+        print(metrics.snapshot())
+    """
+    previous = set_observer(observer)
+    try:
+        yield observer
+    finally:
+        set_observer(previous)
+
+def record(stage: str, seconds: float, samples: int = 0, nbytes: int = 0) -> None:
+    """Report a stage measured by the caller; does nothing when instrumentation is off."""
+    if _observer is not None:
+        _observer(StageRecord(stage, seconds, int(samples), int(nbytes)))
+
+class _NullStage:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def count(self, samples: int = 0, nbytes: int = 0) -> None:
+        pass
+
+_NULL_STAGE = _NullStage()
+
+class _Stage:
+    def __init__(self, name: str, observer: Callable[[StageRecord], None]):
+        self._name = name
+        self._observer = observer
+        self._samples = 0
+        self._nbytes = 0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, *exc_info):
+        # Failed stages are not reported.
+        if exc_type is None:
+            self._observer(StageRecord(self._name, time.perf_counter() - self._start, self._samples, self._nbytes))
+        return False
+
+    def count(self, samples: int = 0, nbytes: int = 0) -> None:
+        """Add to the samples and bytes reported for this stage."""
+        self._samples += int(samples)
+        self._nbytes += int(nbytes)
+
+def stage(name: str):
+    """
+    Time a with-block as one pipeline stage; use .count(samples=..., nbytes=...) on the result
+    to attach sizes. Returns a shared no-op object when instrumentation is off.
+    """
+    observer = _observer
+    if observer is None:
+        return _NULL_STAGE
+    return _Stage(name, observer)
+
+def timed_blocks(name: str, blocks: Iterable[NDArray[np.generic]]) -> Iterable[NDArray[np.generic]]:
+    """
+    Time the production of a lazy block iterator (e.g. synthesis) as one stage, excluding the
+    time the consumer spends on each block. Returns blocks unchanged when instrumentation is off.
+    """
+    observer = _observer
+    if observer is None:
+        return blocks
+    return _timed_blocks(name, iter(blocks), observer)
+
+def _timed_blocks(
+    name: str,
+    blocks: Iterator[NDArray[np.generic]],
+    observer: Callable[[StageRecord], None]
+) -> Iterator[NDArray[np.generic]]:
+    seconds, samples = 0.0, 0
+    while True:
+        start = time.perf_counter()
+        block = next(blocks, None)
+        seconds += time.perf_counter() - start
+        if block is None:
+            break
+        samples += block.size
+        yield block
+    observer(StageRecord(name, seconds, samples, 0))
+#endregion
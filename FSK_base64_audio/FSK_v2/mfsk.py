@@ -0,0 +1,325 @@
+# mfsk.py
+import io
+import base64
+from typing import BinaryIO, Optional, Sequence
+import numpy as np
+from numpy.typing import NDArray
+from . import metrics
+from .tables import get_tables, repeat_symbols, symbol_start
+from .synthesis import _pcm16_blocks
+from .fsk_demod import symbol_magnitudes, _demodulation_signal, _signal_from_base64
+from .wav_io import write_pcm16
+
+#region Symbol Mapping
+# Groups of log2(M) bits are read MSB first and Gray-coded onto the tone list: tone t
+# carries the bits of t ^ (t >> 1), so the likeliest demodulation error (a neighbouring
+# tone) corrupts only one bit.
+def bits_per_symbol(freqs: Sequence[float]) -> int:
+    """
+    Return log2(M) for a list of M tone frequencies.
+
+    Parameters:
+        freqs: Tone frequencies (Hz); M = len(freqs) must be a power of two, at least 2.
+
+    Returns:
+        The number of bits carried by one symbol.
+    """
+    m = len(freqs)
+    if m < 2 or m & (m - 1):
+        raise ValueError(f"M-ary FSK needs a power-of-two number of tones (2, 4, 8, 16, ...), got {m}")
+    return m.bit_length() - 1
+
+def bits_to_tones(bit_sequence: NDArray[np.int_], k: int) -> NDArray[np.intp]:
+    """
+    Map a bit sequence to tone indices, k bits per symbol.
+
+    Parameters:
+        bit_sequence: NDArray of bits (0s and 1s).
+        k: Bits per symbol.
+
+    Returns:
+        NDArray of tone indices in [0, 2**k); the last group is zero-padded to k bits.
+    """
+    bits = (np.asarray(bit_sequence) != 0).astype(np.intp)
+    pad = -bits.size % k
+    if pad:
+        bits = np.concatenate([bits, np.zeros(pad, dtype=np.intp)])
+    tones = bits.reshape(-1, k) @ (1 << np.arange(k - 1, -1, -1, dtype=np.intp))
+    # Inverse Gray code: prefix XOR of the value's bits.
+    shift = 1
+    while shift < k:
+        tones ^= tones >> shift
+        shift <<= 1
+    return tones
+
+def tones_to_bits(tone_index: NDArray[np.intp], k: int) -> NDArray[np.uint8]:
+    """
+    Map tone indices back to the bit sequence, k bits per symbol (inverse of bits_to_tones).
+    """
+    tone_index = np.asarray(tone_index)
+    values = tone_index ^ (tone_index >> 1)
+    shifts = np.arange(k - 1, -1, -1)
+    return ((values[:, None] >> shifts) & 1).astype(np.uint8).ravel()
+#endregion
+
+#region M-ary FSK Modulation Functions
+def mfsk_modulation(
+    bit_sequence: NDArray[np.int_],
+    freqs: Sequence[float],
+    sampling_rate: float,
+    baud_rate: float
+) -> tuple[NDArray[np.float_], NDArray[np.float_]]:
+    """
+    Perform M-ary FSK modulation: every log2(M) bits select one of M tones for one symbol.
+
+    With two tones this is exactly fsk_modulation(bit_sequence, freqs[0], freqs[1], ...).
+
+    Parameters:
+        bit_sequence: NDArray of bits (0s and 1s) representing the digital data.
+        freqs: M tone frequencies (Hz), M a power of two.
+        sampling_rate: Number of samples per second (Hz).
+        baud_rate: Symbol rate (symbols per second).
+
+    Returns:
+        signal: The modulated signal as an NDArray of floats.
+        t: A corresponding time axis for the signal.
+    """
+    tables = get_tables(tuple(freqs), sampling_rate, baud_rate)
+    tone_index = bits_to_tones(bit_sequence, bits_per_symbol(freqs))
+
+    # Hold each symbol's tone frequency for its duration and evaluate on the global time axis
+    symbol_freqs: NDArray[np.float_] = repeat_symbols(tables, tables.freqs[tone_index])
+    t: NDArray[np.float_] = np.arange(symbol_freqs.size) / sampling_rate
+    signal: NDArray[np.float_] = np.sin(2.0 * np.pi * symbol_freqs * t)
+    return signal, t
+
+def cpmfsk_modulation(
+    bit_sequence: NDArray[np.int_],
+    freqs: Sequence[float],
+    sampling_rate: float,
+    baud_rate: float
+) -> tuple[NDArray[np.float_], NDArray[np.float_]]:
+    """
+    Perform continuous-phase M-ary FSK (CP-MFSK) modulation.
+
+    With two tones this is exactly cpfsk_modulation(bit_sequence, freqs[0], freqs[1], ...).
+
+    Parameters:
+        bit_sequence: NDArray of bits (0s and 1s) representing the digital data.
+        freqs: M tone frequencies (Hz), M a power of two.
+        sampling_rate: Number of samples per second (Hz).
+        baud_rate: Symbol rate (symbols per second).
+
+    Returns:
+        signal: The modulated signal as an NDArray of floats.
+        t: A corresponding time axis for the signal.
+    """
+    tables = get_tables(tuple(freqs), sampling_rate, baud_rate)
+    tone_index = bits_to_tones(bit_sequence, bits_per_symbol(freqs))
+
+    # Hold each symbol's phase increment for its duration and integrate for continuous phase
+    delta_phi: NDArray[np.float_] = repeat_symbols(tables, tables.phase_increments[tone_index])
+    t: NDArray[np.float_] = np.arange(delta_phi.size) / sampling_rate
+    signal: NDArray[np.float_] = np.sin(np.cumsum(delta_phi))
+    return signal, t
+
+def _mfsk_to_sink(
+    bit_sequence: NDArray[np.int_],
+    sink: BinaryIO,
+    freqs: Sequence[float],
+    sampling_rate: float,
+    baud_rate: float,
+    container: str,
+    block_size: int,
+    continuous: bool,
+    encoding: str
+) -> int:
+    k = bits_per_symbol(freqs)
+    tables = get_tables(tuple(freqs), sampling_rate, baud_rate)
+    tone_index = bits_to_tones(bit_sequence, k)
+    n_frames = symbol_start(tables, tone_index.size)
+    blocks = metrics.timed_blocks("synthesize", _pcm16_blocks(tone_index, tables, sampling_rate, continuous, block_samples=block_size))
+    return write_pcm16(sink, blocks, n_frames, sampling_rate, container, encoding)
+
+def mfsk_modulation_to_sink(
+    bit_sequence: NDArray[np.int_],
+    sink: BinaryIO,
+    freqs: Sequence[float],
+    sampling_rate: float,
+    baud_rate: float,
+    container: str = "wav",
+    block_size: int = 65536,
+    encoding: str = "pcm16"
+) -> int:
+    """
+    Perform M-ary FSK modulation and write the 16-bit PCM audio to a writable binary sink, block by block.
+
+    Parameters:
+        bit_sequence: NDArray of bits (0s and 1s) representing the digital data.
+        sink: Writable binary object (open file, socket file, BytesIO, ...).
+        freqs: M tone frequencies (Hz), M a power of two.
+        sampling_rate: Number of audio samples per second.
+        baud_rate: Symbol rate (symbols per second).
+        container: "wav" to write a WAV file, or "raw" for headerless PCM.
+        block_size: Number of samples synthesized and written per block.
+        encoding: Sample encoding, "pcm16", "pcm8" or "mulaw" (see audio_format.ENCODINGS).
+
+    Returns:
+        The number of bytes written to the sink.
+    """
+    return _mfsk_to_sink(bit_sequence, sink, freqs, sampling_rate, baud_rate, container, block_size, continuous=False, encoding=encoding)
+
+def cpmfsk_modulation_to_sink(
+    bit_sequence: NDArray[np.int_],
+    sink: BinaryIO,
+    freqs: Sequence[float],
+    sampling_rate: float,
+    baud_rate: float,
+    container: str = "wav",
+    block_size: int = 65536,
+    encoding: str = "pcm16"
+) -> int:
+    """
+    Perform CP-MFSK modulation and write the 16-bit PCM audio to a writable binary sink, block by block.
+
+    Parameters:
+        bit_sequence: NDArray of bits (0s and 1s) representing the digital data.
+        sink: Writable binary object (open file, socket file, BytesIO, ...).
+        freqs: M tone frequencies (Hz), M a power of two.
+        sampling_rate: Number of audio samples per second.
+        baud_rate: Symbol rate (symbols per second).
+        container: "wav" to write a WAV file, or "raw" for headerless PCM.
+        block_size: Number of samples synthesized and written per block.
+        encoding: Sample encoding, "pcm16", "pcm8" or "mulaw" (see audio_format.ENCODINGS).
+
+    Returns:
+        The number of bytes written to the sink.
+    """
+    return _mfsk_to_sink(bit_sequence, sink, freqs, sampling_rate, baud_rate, container, block_size, continuous=True, encoding=encoding)
+
+def mfsk_modulation_to_base64(
+    bit_sequence: NDArray[np.int_],
+    freqs: Sequence[float],
+    sampling_rate: float,
+    baud_rate: float,
+    container: str = "wav",
+    encoding: str = "pcm16"
+) -> str:
+    """
+    Perform M-ary FSK modulation and return the audio as a Base64-encoded WAV file.
+
+    Parameters:
+        bit_sequence: NDArray of bits (0s and 1s) representing the digital data.
+        freqs: M tone frequencies (Hz), M a power of two.
+        sampling_rate: The number of audio samples per second.
+        baud_rate: The symbol rate (symbols per second).
+        container: "wav" for a WAV file, or "raw" for headerless samples.
+        encoding: Sample encoding, "pcm16", "pcm8" or "mulaw" (see audio_format.ENCODINGS).
+
+    Returns:
+        A Base64-encoded string representing the generated WAV audio file (or raw samples).
+    """
+    with io.BytesIO() as buffer:
+        mfsk_modulation_to_sink(bit_sequence, buffer, freqs, sampling_rate, baud_rate, container, encoding=encoding)
+        with metrics.stage("b64encode") as timer:
+            audio_base64 = base64.b64encode(buffer.getbuffer()).decode('ascii')
+            timer.count(nbytes=len(audio_base64))
+    return audio_base64
+
+def cpmfsk_modulation_to_base64(
+    bit_sequence: NDArray[np.int_],
+    freqs: Sequence[float],
+    sampling_rate: float,
+    baud_rate: float,
+    container: str = "wav",
+    encoding: str = "pcm16"
+) -> str:
+    """
+    Perform CP-MFSK modulation and return the audio as a Base64-encoded WAV file.
+
+    Parameters:
+        bit_sequence: NDArray of bits (0s and 1s) representing the digital data.
+        freqs: M tone frequencies (Hz), M a power of two.
+        sampling_rate: The number of audio samples per second.
+        baud_rate: The symbol rate (symbols per second).
+        container: "wav" for a WAV file, or "raw" for headerless samples.
+        encoding: Sample encoding, "pcm16", "pcm8" or "mulaw" (see audio_format.ENCODINGS).
+
+    Returns:
+        A Base64-encoded string representing the generated WAV audio file (or raw samples).
+    """
+    with io.BytesIO() as buffer:
+        cpmfsk_modulation_to_sink(bit_sequence, buffer, freqs, sampling_rate, baud_rate, container, encoding=encoding)
+        with metrics.stage("b64encode") as timer:
+            audio_base64 = base64.b64encode(buffer.getbuffer()).decode('ascii')
+            timer.count(nbytes=len(audio_base64))
+    return audio_base64
+#endregion
+
+#region M-ary FSK Demodulation Functions
+def mfsk_demodulation(
+    modulated_signal: NDArray[np.float_],
+    sampling_rate: float,
+    baud_rate: float,
+    freqs: Sequence[float],
+    method: str = "correlate"
+) -> NDArray[np.uint8]:
+    """
+    Demodulate an M-ary FSK (or CP-MFSK) signal by picking the strongest of the M tones per symbol.
+
+    Parameters:
+        modulated_signal: NDArray of floats representing the received signal.
+        sampling_rate: Number of samples per second (Hz) used in modulation.
+        baud_rate: Symbol rate (symbols per second).
+        freqs: The M tone frequencies (Hz) used by the transmitter, in the same order.
+        method: Demodulation backend, "correlate", "goertzel" or "fft" (see fsk_demodulation).
+
+    Returns:
+        bits: NDArray of type uint8, log2(M) bits per complete symbol.
+    """
+    k = bits_per_symbol(freqs)
+    tables = get_tables(tuple(freqs), sampling_rate, baud_rate)
+    mags = symbol_magnitudes(modulated_signal, tables, method)
+    return tones_to_bits(np.argmax(mags, axis=1), k)
+
+def mfsk_demodulation_from_base64(
+    audio_base64: str,
+    sampling_rate: float,
+    baud_rate: float,
+    freqs: Sequence[float],
+    method: str = "correlate",
+    container: str = "wav",
+    encoding: str = "pcm16",
+    channel: Optional[int] = None,
+    decimate: Optional[bool] = None
+) -> bytes:
+    """
+    Demodulate M-ary FSK (or CP-MFSK) audio provided as a Base64-encoded WAV file.
+
+    Parameters:
+        audio_base64: Base64-encoded string representing a WAV file (or raw mono samples).
+        sampling_rate: Number of samples per second (Hz) of raw audio; WAV audio uses its header rate.
+        baud_rate: Symbol rate (symbols per second).
+        freqs: The M tone frequencies (Hz) used by the transmitter, in the same order.
+        method: Demodulation backend, "correlate", "goertzel" or "fft" (see fsk_demodulation).
+        container: "wav" (any encoding, read from the header) or "raw" for headerless samples.
+        encoding: Sample encoding of raw audio, "pcm16", "pcm8" or "mulaw"; ignored for WAV.
+        channel: Channel to demodulate, or None for the average of all channels.
+        decimate: Resample to the lowest rate that keeps the tones first (see
+                  fsk_demod.fsk_demodulation_from_base64).
+
+    Returns:
+        The recovered bytes; padding bits of the last symbol are dropped.
+    """
+    modulated_signal, framerate = _signal_from_base64(audio_base64, container, encoding, channel)
+    modulated_signal, rate = _demodulation_signal(
+        modulated_signal, framerate, sampling_rate, baud_rate, freqs, method, decimate
+    )
+    with metrics.stage("demodulate") as timer:
+        bits = mfsk_demodulation(modulated_signal, rate, baud_rate, freqs, method)
+        timer.count(samples=modulated_signal.size)
+    with metrics.stage("packbits") as timer:
+        recovered_bytes = np.packbits(bits[: bits.size - bits.size % 8])
+        timer.count(nbytes=recovered_bytes.size)
+    return recovered_bytes.tobytes()
+#endregion
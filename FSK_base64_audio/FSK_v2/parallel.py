@@ -0,0 +1,108 @@
+# parallel.py
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Optional
+import numpy as np
+from numpy.typing import NDArray
+from .tables import get_tables, complete_symbols, symbol_boundaries
+from .fsk_demod import DEMOD_METHODS, _demodulate_block
+
+#region Shard Worker
+def _demodulate_shard(
+    shm_name: str,
+    dtype: str,
+    length: int,
+    start: int,
+    stop: int,
+    first_symbol: int,
+    sampling_rate: float,
+    baud_rate: float,
+    freq0: float,
+    freq1: float,
+    method: str
+) -> NDArray[np.uint8]:
+    """
+    Demodulate samples [start, stop) of a signal held in shared memory (runs in a worker process).
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        signal = np.ndarray((length,), dtype=dtype, buffer=shm.buf)
+        tables = get_tables((freq0, freq1), sampling_rate, baud_rate)
+        bits = _demodulate_block(signal[start:stop], tables, method, first_symbol)
+        # Drop the view before closing so the shared buffer can be released.
+        del signal
+        return bits
+    finally:
+        shm.close()
+#endregion
+
+#region Parallel FSK Demodulation
+def fsk_demodulation_parallel(
+    modulated_signal: NDArray[np.float_],
+    sampling_rate: float,
+    baud_rate: float,
+    freq0: float,
+    freq1: float,
+    workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    method: str = "correlate"
+) -> NDArray[np.uint8]:
+    """
+    Demodulate an FSK (or CPFSK) signal on several CPU cores.
+
+    The signal is copied once into shared memory and split at symbol boundaries into one
+    shard per worker; workers attach to the shared block by name, so no sample array is
+    pickled. The per-shard bit arrays are stitched back in order, giving exactly the
+    result of fsk_demodulation.
+
+    Parameters:
+        modulated_signal: NDArray of floats representing the received signal.
+        sampling_rate: Number of samples per second (Hz) used in modulation.
+        baud_rate: Symbol rate (symbols per second).
+        freq0: Carrier frequency representing bit 0.
+        freq1: Carrier frequency representing bit 1.
+        workers: Number of worker processes (defaults to os.cpu_count()).
+        executor: Optional existing process pool to reuse across calls; workers then
+                  only sets the number of shards.
+        method: Demodulation backend, "correlate", "goertzel" or "fft" (see fsk_demodulation).
+
+    Returns:
+        bits: NDArray of type uint8 representing the recovered bit sequence.
+    """
+    if method not in DEMOD_METHODS:
+        raise ValueError(f"Unknown demodulation method {method!r}; expected one of {sorted(DEMOD_METHODS)}")
+    modulated_signal = np.ascontiguousarray(modulated_signal)
+    tables = get_tables((freq0, freq1), sampling_rate, baud_rate)
+    num_symbols = complete_symbols(tables, 0, len(modulated_signal))
+    workers = max(1, workers or os.cpu_count() or 1)
+
+    # Split the symbols as evenly as possible; each shard starts on a symbol boundary.
+    symbol_edges = np.linspace(0, num_symbols, min(workers, max(num_symbols, 1)) + 1).astype(int)
+    shard_edges = symbol_boundaries(tables, 0, num_symbols)[symbol_edges]
+
+    shm = shared_memory.SharedMemory(create=True, size=max(modulated_signal.nbytes, 1))
+    own_executor = executor is None
+    try:
+        shared = np.ndarray(modulated_signal.shape, dtype=modulated_signal.dtype, buffer=shm.buf)
+        shared[:] = modulated_signal
+        del shared
+
+        if own_executor:
+            executor = ProcessPoolExecutor(max_workers=workers)
+        futures = [
+            executor.submit(
+                _demodulate_shard, shm.name, modulated_signal.dtype.str, modulated_signal.size,
+                int(start), int(stop), int(first_symbol), sampling_rate, baud_rate, freq0, freq1, method
+            )
+            for start, stop, first_symbol in zip(shard_edges[:-1], shard_edges[1:], symbol_edges[:-1])
+        ]
+        # Collect the shards in submission order so the bits stay in stream order.
+        bits = np.concatenate([future.result() for future in futures])
+    finally:
+        if own_executor and executor is not None:
+            executor.shutdown()
+        shm.close()
+        shm.unlink()
+    return bits.astype(np.uint8, copy=False)
+#endregion
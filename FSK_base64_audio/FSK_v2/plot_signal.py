@@ -1,66 +1,268 @@
 # plot_signal.py
 import numpy as np
-import matplotlib.pyplot as plt
 import base64
-import io
-import wave
+from typing import Optional, Sequence
+from numpy.typing import NDArray
+from .audio_format import ENCODINGS, audio_info, check_layout, decode_samples, float_samples, wav_encoding
 
-def decode_wav_from_base64(audio_base64: str) -> tuple[np.ndarray, np.ndarray]:
+#region Decoding
+def _samples_from_base64(audio_base64: str, channel: Optional[int] = None) -> tuple[NDArray, int, float]:
+    """
+    Return the samples of Base64 WAV audio, its sampling rate and the sample value of full scale.
+
+    Mono 16-bit, 8-bit and µ-law audio stays int16 (a view for 16-bit PCM, full scale 32767);
+    any other layout is decoded to float32 samples of one channel or the downmix (full scale 1.0).
+    """
+    wav_bytes = base64.b64decode(audio_base64)
+    info = audio_info(wav_bytes)
+    check_layout(info, channel)
+    if info.n_channels == 1 and (info.format_tag, info.sampwidth) in ENCODINGS.values():
+        encoding = wav_encoding(info.format_tag, info.sampwidth)
+        return decode_samples(wav_bytes, encoding, count=info.n_frames, offset=info.data_offset), info.framerate, 32767.0
+    return float_samples(wav_bytes, info, channel), info.framerate, 1.0
+
+def _time_window(n_samples: int, sr: int, start: float, end: Optional[float]) -> tuple[int, int]:
+    """Convert a [start, end) window in seconds to sample indices clipped to the signal."""
+    first = min(max(int(round(start * sr)), 0), n_samples)
+    last = n_samples if end is None else min(max(int(round(end * sr)), first), n_samples)
+    return first, last
+
+def decode_wav_from_base64(audio_base64: str, channel: Optional[int] = None) -> tuple[np.ndarray, np.ndarray]:
     """
     Decode a Base64-encoded WAV file into a PCM waveform and its corresponding time vector.
-    
+
     Parameters:
-        audio_base64: Base64-encoded string representing the WAV audio.
-        
+        audio_base64: Base64-encoded string representing the WAV audio (any layout
+                      audio_format.float_samples reads).
+        channel: Channel to decode, or None for the average of all channels.
+
     Returns:
         waveform: NumPy array of floats (normalized to roughly [-1, 1]).
         t: NumPy array representing the time (seconds) for each sample.
     """
-    # Decode the Base64 string into WAV bytes.
-    wav_bytes = base64.b64decode(audio_base64)
-    with io.BytesIO(wav_bytes) as buffer:
-        with wave.open(buffer, 'rb') as wav_file:
-            sr = wav_file.getframerate()
-            n_frames = wav_file.getnframes()
-            frames = wav_file.readframes(n_frames)
-    # Convert the PCM bytes into a normalized float array (assuming 16-bit PCM).
-    waveform = np.frombuffer(frames, dtype=np.int16).astype(np.float32) / 32767.0
+    samples, sr, full_scale = _samples_from_base64(audio_base64, channel)
+    # Convert the PCM samples into a normalized float array.
+    waveform = samples.astype(np.float32) / full_scale
     t = np.arange(len(waveform)) / sr
     return waveform, t
+#endregion
+
+#region Waveform Envelope
+def minmax_envelope(
+    samples: NDArray,
+    columns: int
+) -> tuple[NDArray[np.intp], NDArray, NDArray]:
+    """
+    Reduce a signal to the minimum and maximum of each of `columns` equal slices.
+
+    Drawn as vertical strokes from min to max, the envelope looks exactly like the full
+    waveform at a resolution of `columns` pixels. The reductions run on the samples
+    directly, so no float copy of int16 samples is made.
 
-def plot_modulated_signal(audio_base64: str, title: str = "Modulated Signal", show_plot: bool = True) -> tuple[np.ndarray, np.ndarray]:
+    Parameters:
+        samples: int16 samples (e.g. a view of the WAV data) or float samples.
+        columns: Number of slices (typically the plot width in pixels).
+
+    Returns:
+        starts: Index of the first sample of each slice.
+        mins: Minimum sample of each slice.
+        maxs: Maximum sample of each slice.
+    """
+    if columns <= 0:
+        raise ValueError("columns must be positive")
+    starts = np.unique(np.linspace(0, len(samples), columns, endpoint=False).astype(np.intp))
+    if len(samples) == 0:
+        starts = starts[:0]
+    return starts, np.minimum.reduceat(samples, starts), np.maximum.reduceat(samples, starts)
+#endregion
+
+#region Waveform Plot
+def plot_modulated_signal(
+    audio_base64: str,
+    title: str = "Modulated Signal",
+    show_plot: bool = True,
+    start: float = 0.0,
+    end: Optional[float] = None,
+    decimate: bool = True,
+    channel: Optional[int] = None
+) -> tuple[np.ndarray, np.ndarray]:
     """
     Decode a Base64-encoded WAV file and plot its waveform.
-    
+
     This function is intended to help you verify that the modulation works correctly by providing
-    a visual plot of the output signal.
-    
+    a visual plot of the output signal. Long signals are drawn as a min/max envelope with one
+    column per pixel of the figure width, which looks the same as plotting every sample but
+    stays fast for captures of any length.
+
     Parameters:
         audio_base64: Base64-encoded string representing the modulated WAV audio.
         title: Title for the plot (e.g., "FSK Modulated Signal" or "CPFSK Modulated Signal").
         show_plot: If True, the plot is displayed immediately (set to False if you just want to get the data).
-        
+        start: Start of the plotted time window (seconds).
+        end: End of the plotted time window (seconds), or None for the end of the signal.
+        decimate: If False, plot every sample of the window.
+        channel: Channel to plot, or None for the average of all channels.
+
     Returns:
-        A tuple (waveform, t) where:
-            waveform: NDArray of floats (the audio signal).
-            t: NDArray of times corresponding to samples in the signal.
-    
+        A tuple (waveform, t) of what was drawn:
+            waveform: NDArray of floats, the window's samples, or when decimated the envelope
+                      as min, max, min, max, ... per column.
+            t: NDArray of times corresponding to the values in waveform.
+
     Usage Example:
         waveform, t = plot_modulated_signal(my_audio_base64, "FSK Modulated Signal")
     """
-    waveform, t = decode_wav_from_base64(audio_base64)
-    
-    plt.figure(figsize=(10, 4))
-    plt.plot(t, waveform, label="Signal")
+    # matplotlib takes longer to import than the whole modem, so load it only when plotting.
+    import matplotlib.pyplot as plt
+
+    samples, sr, full_scale = _samples_from_base64(audio_base64, channel)
+    first, last = _time_window(len(samples), sr, start, end)
+    window = samples[first:last]
+
+    fig = plt.figure(figsize=(10, 4))
+    columns = int(fig.get_figwidth() * fig.dpi)
+    if decimate and len(window) > 2 * columns:
+        starts, mins, maxs = minmax_envelope(window, columns)
+        waveform = np.empty(2 * starts.size, dtype=np.float32)
+        waveform[0::2] = mins
+        waveform[1::2] = maxs
+        waveform /= full_scale
+        t = np.repeat((first + starts) / sr, 2)
+    else:
+        waveform = window.astype(np.float32) / full_scale
+        t = (first + np.arange(len(window))) / sr
+
+    plt.plot(t, waveform, label="Signal", linewidth=0.8 if decimate else None)
     plt.title(title)
     plt.xlabel("Time (s)")
     plt.ylabel("Amplitude")
     plt.legend()
-    
+
     if show_plot:
         plt.show()
-    
+
     return waveform, t
+#endregion
+
+#region Spectrogram
+# Samples transformed per rfft call (64 frames of 1024), bounding the float working set
+# to a few MB whatever the signal length.
+_SPECTROGRAM_BLOCK_VALUES = 1 << 16
+
+def spectrogram(
+    samples: NDArray,
+    sampling_rate: float,
+    n_fft: int = 1024,
+    hop: Optional[int] = None
+) -> tuple[NDArray[np.float32], NDArray[np.float_], NDArray[np.float_]]:
+    """
+    Compute a Hann-windowed power spectrogram blockwise from int16 or float samples.
+
+    Frames are gathered from the sample buffer a block at a time and only that block is
+    converted to float32, so memory stays bounded by the block and the output, never a
+    float copy of the whole signal.
+
+    Parameters:
+        samples: int16 samples (e.g. a view of the WAV data, full scale 32767) or float
+                 samples (full scale 1.0).
+        sampling_rate: Number of samples per second (Hz).
+        n_fft: Samples per frame (reduced to the signal length for short signals).
+        hop: Samples between frame starts (default: n_fft // 4).
+
+    Returns:
+        power_db: NDArray of shape (num_frames, n_fft // 2 + 1), power in dB relative to full scale.
+        t: Time of each frame centre (seconds).
+        f: Frequency of each bin (Hz).
+    """
+    if len(samples) == 0:
+        raise ValueError("Cannot compute the spectrogram of an empty signal")
+    n_fft = min(n_fft, len(samples))
+    hop = max(1, n_fft // 4 if hop is None else hop)
+    starts = np.arange(0, len(samples) - n_fft + 1, hop)
+    frames = np.lib.stride_tricks.sliding_window_view(samples, n_fft)
+    window = np.hanning(n_fft).astype(np.float32)
+    full_scale = 32767.0 if np.asarray(samples).dtype.kind in 'iu' else 1.0
+    scale = 1.0 / (full_scale * window.sum() / 2) ** 2  # A full-scale tone reads 0 dB.
+
+    power_db = np.empty((starts.size, n_fft // 2 + 1), dtype=np.float32)
+    block_frames = max(1, _SPECTROGRAM_BLOCK_VALUES // n_fft)
+    for first in range(0, starts.size, block_frames):
+        block = frames[starts[first : first + block_frames]].astype(np.float32)
+        block *= window
+        spectrum = np.fft.rfft(block, axis=1)
+        power = np.square(spectrum.real)
+        power += np.square(spectrum.imag)
+        power *= scale
+        power += 1e-12
+        power_db[first : first + block.shape[0]] = 10 * np.log10(power)
+    t = (starts + n_fft / 2) / sampling_rate
+    f = np.fft.rfftfreq(n_fft, 1.0 / sampling_rate)
+    return power_db, t, f
+
+def plot_spectrogram(
+    audio_base64: str,
+    title: str = "Spectrogram",
+    show_plot: bool = True,
+    start: float = 0.0,
+    end: Optional[float] = None,
+    n_fft: int = 1024,
+    tones: Optional[Sequence[float]] = None,
+    max_freq: Optional[float] = None,
+    channel: Optional[int] = None
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Decode a Base64-encoded WAV file and plot its spectrogram, showing the tones over time.
+
+    The hop between frames grows with the window length so there are at most as many
+    frames as pixels across the figure; see spectrogram() for the blockwise computation.
+
+    Parameters:
+        audio_base64: Base64-encoded string representing the modulated WAV audio.
+        title: Title for the plot.
+        show_plot: If True, the plot is displayed immediately.
+        start: Start of the plotted time window (seconds).
+        end: End of the plotted time window (seconds), or None for the end of the signal.
+        n_fft: Samples per frame; larger values resolve closer tones but blur short symbols.
+        tones: Optional tone frequencies (e.g. (freq0, freq1)) marked with dashed lines.
+        max_freq: Upper frequency limit of the plot (default: Nyquist, or twice the highest tone).
+        channel: Channel to plot, or None for the average of all channels.
+
+    Returns:
+        A tuple (power_db, t, f) as returned by spectrogram() for the plotted window.
+
+    Usage Example:
+        plot_spectrogram(my_audio_base64, tones=(1200.0, 2200.0))
+    """
+    import matplotlib.pyplot as plt
+
+    samples, sr, _ = _samples_from_base64(audio_base64, channel)
+    first, last = _time_window(len(samples), sr, start, end)
+    window = samples[first:last]
+
+    fig = plt.figure(figsize=(10, 4))
+    columns = int(fig.get_figwidth() * fig.dpi)
+    n_fft = min(n_fft, len(window)) if len(window) else n_fft
+    hop = max(n_fft // 4, -(-(len(window) - n_fft) // columns))
+    power_db, t, f = spectrogram(window, sr, n_fft, hop)
+    t = t + first / sr
+
+    plt.pcolormesh(t, f, power_db.T, shading="nearest", vmin=power_db.max() - 80.0)
+    plt.colorbar(label="Power (dBFS)")
+    if tones:
+        for tone in tones:
+            plt.axhline(tone, color="white", linestyle="--", linewidth=0.8)
+    if max_freq is None and tones:
+        max_freq = min(2 * max(tones), sr / 2)
+    plt.ylim(0, max_freq if max_freq is not None else sr / 2)
+    plt.title(title)
+    plt.xlabel("Time (s)")
+    plt.ylabel("Frequency (Hz)")
+
+    if show_plot:
+        plt.show()
+
+    return power_db, t, f
+#endregion
 
 # Optional: If you run this file directly, the following block can be used for quick testing.
 if __name__ == "__main__":
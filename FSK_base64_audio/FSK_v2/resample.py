@@ -0,0 +1,319 @@
+# resample.py
+import math
+from fractions import Fraction
+from typing import Optional, Sequence
+import numpy as np
+from numpy.typing import DTypeLike, NDArray
+
+#region Polyphase Resampler
+# Stopband attenuation of the anti-aliasing filter. Aliased content only raises the noise
+# floor under the tones, so 50 dB is ample for FSK decisions and keeps the filter short.
+_ATTENUATION_DB = 50.0
+# Window values per matrix product, bounding any temporary the product makes to ~8 MB.
+_BLOCK_VALUES = 1 << 20
+# Largest numerator or denominator of a resampling ratio; bounds the filter bank size.
+_MAX_RATIO_TERM = 1024
+
+def kaiser_lowpass(cutoff: float, transition: float, attenuation_db: float = _ATTENUATION_DB) -> NDArray[np.float_]:
+    """
+    Design a linear-phase, odd-length Kaiser-windowed sinc low-pass filter with unit DC gain.
+
+    Parameters:
+        cutoff: Centre of the transition band, in cycles per sample (0 < cutoff < 0.5).
+        transition: Width of the transition band, in cycles per sample.
+        attenuation_db: Stopband attenuation in dB.
+
+    Returns:
+        taps: The filter coefficients.
+    """
+    if not 0 < cutoff < 0.5 or transition <= 0:
+        raise ValueError("Need 0 < cutoff < 0.5 and a positive transition width")
+    # Kaiser's estimates of the length and window shape for the requested attenuation.
+    n_taps = int(math.ceil((attenuation_db - 7.95) / (14.36 * transition))) | 1
+    if attenuation_db > 50:
+        beta = 0.1102 * (attenuation_db - 8.7)
+    elif attenuation_db > 21:
+        beta = 0.5842 * (attenuation_db - 21) ** 0.4 + 0.07886 * (attenuation_db - 21)
+    else:
+        beta = 0.0
+    n = np.arange(n_taps) - (n_taps - 1) / 2
+    taps = 2 * cutoff * np.sinc(2 * cutoff * n) * np.kaiser(n_taps, beta)
+    return taps / taps.sum()
+
+def _phase_bank(up: int, taps: NDArray[np.float_], dtype: np.dtype) -> NDArray[np.float_]:
+    """
+    Split a filter into its up polyphase components: row p holds taps p, p + up, p + 2 * up, ...
+    (scaled by up to keep the gain after zero insertion), reversed so rows line up with input
+    windows in time order.
+    """
+    per_phase = -(-len(taps) // up)
+    bank = np.zeros(per_phase * up)
+    bank[: len(taps)] = up * np.asarray(taps, dtype=np.float64)
+    return bank.reshape(per_phase, up).T[:, ::-1].astype(dtype)
+
+def _polyphase(
+    padded: NDArray[np.float_],
+    first_input: int,
+    bank: NDArray[np.float_],
+    up: int,
+    down: int,
+    center: int,
+    first_output: int,
+    n_out: int
+) -> NDArray[np.float_]:
+    """
+    Compute outputs first_output .. first_output + n_out - 1 of the filter, where padded[i]
+    holds input sample first_input + i and covers every input those outputs use.
+    """
+    per_phase = bank.shape[1]
+    out = np.empty(n_out, dtype=padded.dtype)
+    if not n_out:
+        return out
+    windows = np.lib.stride_tricks.sliding_window_view(padded, per_phase)
+    # Output m uses inputs n_hi - per_phase + 1 .. n_hi with n_hi = (m * down + center) // up,
+    # which is window n_hi - per_phase + 1 - first_input. Outputs m, m + up, m + 2 * up, ...
+    # share the phase (m * down + center) % up and their windows start exactly down samples
+    # apart, so each phase is a strided view of the windows times one tap vector - no gathered copy.
+    step = max(1, _BLOCK_VALUES // per_phase)
+    for first in range(min(up, n_out)):
+        position = (first_output + first) * down + center
+        rows = windows[position // up - per_phase + 1 - first_input :: down][: -(-(n_out - first) // up)]
+        phase_taps = bank[position % up]
+        for start in range(0, rows.shape[0], step):
+            out[first + start * up : first + (start + step) * up : up] = rows[start : start + step] @ phase_taps
+    return out
+
+def resample_poly(
+    signal: NDArray[np.float_],
+    up: int,
+    down: int,
+    taps: Optional[NDArray[np.float_]] = None
+) -> NDArray[np.float_]:
+    """
+    Change the sampling rate of a signal by the rational factor up / down.
+
+    Conceptually the signal is upsampled by inserting up - 1 zeros between samples, low-pass
+    filtered and then only every down-th sample kept. The polyphase form computes just the
+    kept samples: outputs that use the same filter phase are one matrix product between
+    a strided view of the input windows and that phase's taps. The filter is centred, so output sample
+    m lies exactly at input time m * down / up (no group delay).
+
+    Parameters:
+        signal: NDArray of floats.
+        up: Upsampling factor.
+        down: Downsampling factor.
+        taps: Low-pass filter at the upsampled rate with unit DC gain; by default cut off at
+              the lower of the two Nyquist frequencies (see kaiser_lowpass).
+
+    Returns:
+        The resampled signal, ceil(len(signal) * up / down) samples of the input's float type.
+    """
+    if up < 1 or down < 1:
+        raise ValueError("up and down must be positive integers")
+    signal = np.asarray(signal)
+    dtype = signal.dtype if signal.dtype.kind == 'f' else np.float64
+    g = math.gcd(up, down)
+    up, down = up // g, down // g
+    if up == down == 1:
+        return signal.astype(dtype, copy=True)
+    if taps is None:
+        taps = _default_taps(up, down)
+    bank = _phase_bank(up, taps, dtype)
+    per_phase = bank.shape[1]
+    center = (len(taps) - 1) // 2
+
+    n_out = -(-len(signal) * up // down)
+    # Pad so every window exists: zeros before the first sample and after the last.
+    last = ((n_out - 1) * down + center) // up if n_out else 0
+    padded = np.zeros(per_phase - 1 + max(last + 1, len(signal)), dtype=dtype)
+    padded[per_phase - 1 : per_phase - 1 + len(signal)] = signal
+    return _polyphase(padded, -(per_phase - 1), bank, up, down, center, 0, n_out)
+
+def _default_taps(up: int, down: int) -> NDArray[np.float_]:
+    band = 0.5 / max(up, down)
+    return kaiser_lowpass(0.9 * band, 0.2 * band)
+
+class StreamingResampler:
+    """
+    Incremental resample_poly for audio that arrives in chunks.
+
+    The samples fed so far are kept only as far back as the filter reaches, and each call
+    returns every output whose inputs have all arrived; flush() zero-pads the tail exactly
+    as resample_poly does. Concatenating the outputs gives the same samples as
+    resample_poly on the whole signal.
+
+    Usage Example:
+        resampler = StreamingResampler(1, 3)
+        for chunk in audio_chunks:
+            reduced = resampler.feed(chunk)
+        reduced = resampler.flush()
+    """
+    def __init__(self, up: int, down: int, taps: Optional[NDArray[np.float_]] = None, dtype: DTypeLike = np.float32):
+        """
+        Parameters:
+            up: Upsampling factor.
+            down: Downsampling factor.
+            taps: Low-pass filter at the upsampled rate (see resample_poly).
+            dtype: Float type of the samples produced.
+        """
+        if up < 1 or down < 1:
+            raise ValueError("up and down must be positive integers")
+        g = math.gcd(up, down)
+        self.up, self.down = up // g, down // g
+        taps = _default_taps(self.up, self.down) if taps is None else taps
+        self._dtype = np.dtype(dtype)
+        self._bank = _phase_bank(self.up, taps, self._dtype)
+        self._center = (len(taps) - 1) // 2
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard any buffered samples and start a new signal."""
+        per_phase = self._bank.shape[1]
+        self._buffer = np.zeros(per_phase - 1, dtype=self._dtype)  # zeros before the first sample
+        self._first_input = -(per_phase - 1)  # input index of self._buffer[0]
+        self._received = 0
+        self._next_output = 0
+
+    def _emit(self, n_out: int) -> NDArray[np.float_]:
+        out = _polyphase(self._buffer, self._first_input, self._bank, self.up, self.down,
+                         self._center, self._next_output, n_out)
+        self._next_output += n_out
+        # Keep only the inputs from the first window of the next output on.
+        keep = (self._next_output * self.down + self._center) // self.up - self._bank.shape[1] + 1
+        self._buffer = self._buffer[keep - self._first_input :].copy()
+        self._first_input = keep
+        return out
+
+    def feed(self, chunk: NDArray[np.float_]) -> NDArray[np.float_]:
+        """
+        Resample the next chunk of samples.
+
+        Parameters:
+            chunk: NDArray of floats.
+
+        Returns:
+            The outputs completed by this chunk (possibly empty).
+        """
+        self._buffer = np.concatenate([self._buffer, np.asarray(chunk, dtype=self._dtype)])
+        self._received += len(chunk)
+        # Output m is complete once its newest input (m * down + center) // up has arrived.
+        complete = max((self._received * self.up - 1 - self._center) // self.down + 1, 0)
+        return self._emit(max(complete - self._next_output, 0))
+
+    def flush(self) -> NDArray[np.float_]:
+        """
+        Finish the signal, zero-padding the inputs past its end.
+
+        Returns:
+            The remaining outputs, up to ceil(samples fed * up / down) in total.
+        """
+        n_out = -(-self._received * self.up // self.down) - self._next_output
+        if n_out > 0:
+            last = ((self._next_output + n_out - 1) * self.down + self._center) // self.up
+            pad = last + 1 - (self._first_input + self._buffer.size)
+            if pad > 0:
+                self._buffer = np.concatenate([self._buffer, np.zeros(pad, dtype=self._dtype)])
+            out = self._emit(n_out)
+        else:
+            out = np.empty(0, dtype=self._dtype)
+        self.reset()
+        return out
+
+def resample(signal: NDArray[np.float_], sampling_rate: float, new_rate: float) -> NDArray[np.float_]:
+    """
+    Convert a signal between two sampling rates (e.g. a 48 kHz capture to 44.1 kHz).
+
+    Parameters:
+        signal: NDArray of floats at sampling_rate.
+        sampling_rate: Current sampling rate (Hz).
+        new_rate: Wanted sampling rate (Hz); the ratio is approximated with terms up to
+                  _MAX_RATIO_TERM.
+
+    Returns:
+        The resampled signal (the input itself when the rates are equal).
+    """
+    ratio = (Fraction(new_rate) / Fraction(sampling_rate)).limit_denominator(_MAX_RATIO_TERM)
+    if ratio == 1:
+        return signal
+    return resample_poly(signal, ratio.numerator, ratio.denominator)
+#endregion
+
+#region Demodulation Rate
+# Keying spreads each tone into sidebands about the baud rate wide; hard-keyed FSK needs
+# about _SIDEBAND_BAUDS of them to decode as well as at the full rate. The cheapest rate is
+# _RATE_FACTOR times that band edge, which leaves a transition band wider than the band
+# itself so the filter stays short; rates within _MIN_SAVING of the input are kept.
+_SIDEBAND_BAUDS = 3
+_RATE_FACTOR = 3.0
+_MIN_SAVING = 1.5
+
+def _band_edge(baud_rate: float, freqs: Sequence[float]) -> float:
+    return max(freqs) + _SIDEBAND_BAUDS * baud_rate
+
+def demodulation_rate(sampling_rate: float, baud_rate: float, freqs: Sequence[float]) -> tuple[int, int]:
+    """
+    Choose the resampling ratio up / down to the lowest rate that still represents the tones.
+
+    The target rate is a whole number of samples per symbol, so the demodulator can use its
+    zero-copy reshape instead of gathering fractional symbols.
+
+    Parameters:
+        sampling_rate: Current sampling rate (Hz).
+        baud_rate: Symbol rate (symbols per second).
+        freqs: Tone frequencies (Hz).
+
+    Returns:
+        (up, down); (1, 1) when resampling would not save enough work.
+    """
+    min_rate = _RATE_FACTOR * _band_edge(baud_rate, freqs)
+    target = math.ceil(min_rate / baud_rate - 1e-9) * baud_rate
+    if target * _MIN_SAVING > sampling_rate:
+        return 1, 1
+    ratio = (Fraction(target) / Fraction(sampling_rate)).limit_denominator(_MAX_RATIO_TERM)
+    return ratio.numerator, ratio.denominator
+
+def resample_for_demodulation(
+    signal: NDArray[np.float_],
+    sampling_rate: float,
+    baud_rate: float,
+    freqs: Sequence[float]
+) -> tuple[NDArray[np.float_], float]:
+    """
+    Resample a received signal to demodulation_rate(), filtering just enough to keep the tones.
+
+    Parameters:
+        signal: NDArray of floats at sampling_rate.
+        sampling_rate: Sampling rate of signal (Hz).
+        baud_rate: Symbol rate (symbols per second).
+        freqs: Tone frequencies (Hz).
+
+    Returns:
+        (signal, sampling_rate) to demodulate with; the input itself when no resampling pays off.
+    """
+    up, down = demodulation_rate(sampling_rate, baud_rate, freqs)
+    if up == down:
+        return signal, sampling_rate
+    taps = demodulation_taps(sampling_rate, baud_rate, freqs, up, down)
+    return resample_poly(signal, up, down, taps), sampling_rate * up / down
+
+def demodulation_taps(
+    sampling_rate: float,
+    baud_rate: float,
+    freqs: Sequence[float],
+    up: int,
+    down: int
+) -> NDArray[np.float_]:
+    """
+    Design the anti-aliasing filter for resampling by up / down to demodulate (see
+    resample_for_demodulation); also used by the streaming demodulator.
+
+    Returns:
+        taps: Low-pass filter at the upsampled rate.
+    """
+    new_rate = sampling_rate * up / down
+    # Pass the tones and their sidebands; stop from the lowest frequency that would alias
+    # onto that band.
+    edge = _band_edge(baud_rate, freqs)
+    upsampled = sampling_rate * up
+    return kaiser_lowpass(new_rate / 2 / upsampled, (new_rate - 2 * edge) / upsampled)
+#endregion
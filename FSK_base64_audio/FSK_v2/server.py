@@ -0,0 +1,422 @@
+# server.py
+import asyncio
+import json
+import struct
+import time
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Optional
+from .batch import byte_arrays_to_fsk, byte_arrays_to_cpfsk, fsk_to_byte_arrays, cpfsk_to_byte_arrays
+
+#region Wire Protocol
+# Every message is a frame: a 4-byte big-endian length, then a JSON header line
+# terminated by b"\n", then the raw body.
+#
+# Request header:  {"op": "encode" | "decode" | "stats", "modulation": "fsk" | "cpfsk",
+#                   "freq0": ..., "freq1": ..., "sampling_rate": ..., "baud_rate": ...}
+# Request body:    payload bytes (encode) or ASCII Base64 WAV (decode)
+# Response header: {"ok": true} or {"ok": false, "error": "..."}
+# Response body:   ASCII Base64 WAV (encode), payload bytes (decode) or JSON counters (stats)
+_LENGTH = struct.Struct('>I')
+
+BATCH_FUNCTIONS = {
+    ("encode", "fsk"): byte_arrays_to_fsk,
+    ("encode", "cpfsk"): byte_arrays_to_cpfsk,
+    ("decode", "fsk"): fsk_to_byte_arrays,
+    ("decode", "cpfsk"): cpfsk_to_byte_arrays,
+}
+
+def pack_frame(header: dict, body: bytes = b'') -> bytes:
+    """Serialize one frame."""
+    payload = json.dumps(header).encode() + b'\n' + body
+    return _LENGTH.pack(len(payload)) + payload
+
+async def read_frame(reader: asyncio.StreamReader, max_frame_size: int) -> Optional[tuple[dict, bytes]]:
+    """Read one frame, or return None at a clean end of stream."""
+    try:
+        prefix = await reader.readexactly(_LENGTH.size)
+    except asyncio.IncompleteReadError as exc:
+        if exc.partial:
+            raise
+        return None
+    (length,) = _LENGTH.unpack(prefix)
+    if length > max_frame_size:
+        raise ValueError(f"Frame of {length} bytes exceeds the {max_frame_size}-byte limit")
+    payload = await reader.readexactly(length)
+    header, _, body = payload.partition(b'\n')
+    return json.loads(header), body
+#endregion
+
+#region Service Counters
+class ServiceStats:
+    """
+    Latency and throughput counters for the service.
+
+    Latencies are kept in a bounded window, so percentiles describe recent traffic.
+    """
+    def __init__(self, window: int = 10000):
+        self.started = time.monotonic()
+        self.requests = 0
+        self.errors = 0
+        self.rejected = 0
+        self.batches = 0
+        self.batched_requests = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self._latencies: deque = deque(maxlen=window)
+
+    def record(self, latency: float, bytes_in: int, bytes_out: int) -> None:
+        self.requests += 1
+        self.bytes_in += bytes_in
+        self.bytes_out += bytes_out
+        self._latencies.append(latency)
+
+    def percentile(self, q: float) -> float:
+        """Latency percentile in seconds over the recent window (0.0 if no traffic yet)."""
+        if not self._latencies:
+            return 0.0
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(q / 100.0 * len(ordered)))]
+
+    def snapshot(self) -> dict[str, Any]:
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "rejected": self.rejected,
+            "batches": self.batches,
+            "mean_batch_size": self.batched_requests / self.batches if self.batches else 0.0,
+            "requests_per_s": self.requests / elapsed,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "latency_p50_ms": 1000.0 * self.percentile(50),
+            "latency_p99_ms": 1000.0 * self.percentile(99),
+        }
+#endregion
+
+#region Request Coalescing
+class _Coalescer:
+    """
+    Groups concurrent requests with identical operation and modem parameters into
+    micro-batches and runs each batch once in the executor.
+    """
+    def __init__(self, executor: Executor, stats: ServiceStats, batch_window: float, max_batch: int):
+        self._executor = executor
+        self._stats = stats
+        self._batch_window = batch_window
+        self._max_batch = max_batch
+        self._pending: dict[tuple, list[tuple[Any, asyncio.Future]]] = {}
+
+    def submit(self, key: tuple, item: Any) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        queue = self._pending.setdefault(key, [])
+        queue.append((item, future))
+        if len(queue) == 1:
+            # First request for this key opens a short window for others to join.
+            loop.call_later(self._batch_window, self._flush, key)
+        elif len(queue) >= self._max_batch:
+            self._flush(key)
+        return future
+
+    def _flush(self, key: tuple) -> None:
+        queue = self._pending.pop(key, None)
+        if queue:
+            asyncio.ensure_future(self._run(key, queue))
+
+    async def _run(self, key: tuple, queue: list) -> None:
+        op, modulation, freq0, freq1, sampling_rate, baud_rate = key
+        batch_function = BATCH_FUNCTIONS[(op, modulation)]
+        items = [item for item, _ in queue]
+        self._stats.batches += 1
+        self._stats.batched_requests += len(items)
+
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(
+                self._executor, batch_function, items, freq0, freq1, sampling_rate, baud_rate
+            )
+        except Exception as exc:
+            if len(queue) == 1:
+                # The caller may have gone away (cancelled future) while the batch ran.
+                if not queue[0][1].done():
+                    queue[0][1].set_exception(exc)
+                return
+            # One malformed request must not fail its batch-mates: retry them one by one.
+            for item, future in queue:
+                await self._run(key, [(item, future)])
+            return
+        for (_, future), result in zip(queue, results):
+            if not future.done():
+                future.set_result(result)
+#endregion
+
+#region Server
+class FSKServer:
+    """
+    Local asyncio encode/decode service for FSK and CPFSK.
+
+    NumPy work runs in an executor so the event loop stays responsive; concurrent requests
+    that share modem parameters are coalesced into one batch call. At most max_pending
+    requests are in flight: beyond that, new requests are rejected with a "busy" error,
+    and each connection stops reading while it has max_inflight_per_connection requests open.
+
+    Usage Example:
+        server = FSKServer(port=8765)
+        await server.start()
+        await server.serve_forever()
+    """
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        path: Optional[str] = None,
+        executor: Optional[Executor] = None,
+        batch_window: float = 0.002,
+        max_batch: int = 256,
+        max_pending: int = 1024,
+        max_inflight_per_connection: int = 64,
+        max_frame_size: int = 64 * 1024 * 1024
+    ):
+        """
+        Parameters:
+            host: Interface to bind the TCP listener to.
+            port: TCP port (0 picks a free port).
+            path: If given, listen on this Unix socket path instead of TCP.
+            executor: Executor for the NumPy work (defaults to a small thread pool).
+            batch_window: Seconds to wait for more requests with the same parameters.
+            max_batch: Flush a micro-batch as soon as it reaches this many requests.
+            max_pending: Maximum requests in flight across all connections.
+            max_inflight_per_connection: Maximum unanswered requests per connection.
+            max_frame_size: Largest accepted request frame in bytes.
+        """
+        self.host = host
+        self.port = port
+        self.path = path
+        self.stats = ServiceStats()
+        self._executor = executor or ThreadPoolExecutor(max_workers=4)
+        self._coalescer = _Coalescer(self._executor, self.stats, batch_window, max_batch)
+        self._max_pending = max_pending
+        self._pending = 0
+        self._max_inflight = max_inflight_per_connection
+        self._max_frame_size = max_frame_size
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        if self.path:
+            self._server = await asyncio.start_unix_server(self._handle_connection, path=self.path)
+        else:
+            self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+            self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self, timeout: float = 5.0) -> None:
+        """Stop listening and give open connections up to timeout seconds to finish."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._connections:
+            _, still_open = await asyncio.wait(set(self._connections), timeout=timeout)
+            for task in still_open:
+                task.cancel()
+            await asyncio.gather(*still_open, return_exceptions=True)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        # Responses are written in request order; the semaphore bounds how far reading
+        # may run ahead of answering, which pushes back on the client through TCP.
+        task = asyncio.current_task()
+        self._connections.add(task)
+        task.add_done_callback(self._connections.discard)
+        responses: asyncio.Queue = asyncio.Queue()
+        inflight = asyncio.Semaphore(self._max_inflight)
+        writer_task = asyncio.ensure_future(self._write_responses(responses, writer, inflight))
+        try:
+            while True:
+                await inflight.acquire()
+                try:
+                    frame = await read_frame(reader, self._max_frame_size)
+                except (asyncio.IncompleteReadError, ConnectionResetError):
+                    # The client went away mid-frame; there is nobody left to answer.
+                    inflight.release()
+                    break
+                except (json.JSONDecodeError, UnicodeDecodeError) as exc:
+                    # The whole frame was read, so the stream is still in step: answer it and keep the connection.
+                    await responses.put(asyncio.ensure_future(self._error(f"Invalid frame header: {exc}")))
+                    continue
+                except ValueError as exc:
+                    await responses.put(asyncio.ensure_future(self._error(str(exc))))
+                    break
+                if frame is None:
+                    inflight.release()
+                    break
+                if not isinstance(frame[0], dict):
+                    # Well-framed but unusable: answer it and keep the connection.
+                    await responses.put(asyncio.ensure_future(self._error("Frame header must be a JSON object")))
+                    continue
+                await responses.put(asyncio.ensure_future(self._answer(*frame)))
+        finally:
+            responses.put_nowait(None)
+            try:
+                await writer_task
+            finally:
+                writer.close()
+                try:
+                    await writer.wait_closed()
+                except ConnectionError:
+                    pass
+
+    async def _write_responses(self, responses: asyncio.Queue, writer: asyncio.StreamWriter, inflight: asyncio.Semaphore) -> None:
+        while True:
+            task = await responses.get()
+            if task is None:
+                return
+            try:
+                header, body = await task
+            except Exception as exc:
+                # A failing request becomes an error response; the connection stays up.
+                header, body = await self._error(f"{type(exc).__name__}: {exc}")
+            inflight.release()
+            try:
+                writer.write(pack_frame(header, body))
+                await writer.drain()
+            except ConnectionError:
+                pass
+
+    async def _error(self, message: str) -> tuple[dict, bytes]:
+        self.stats.errors += 1
+        return {"ok": False, "error": message}, b''
+
+    async def _answer(self, header: dict, body: bytes) -> tuple[dict, bytes]:
+        op = header.get("op")
+        if op == "stats":
+            return {"ok": True}, json.dumps(self.stats.snapshot()).encode()
+        if self._pending >= self._max_pending:
+            self.stats.rejected += 1
+            return await self._error("busy")
+
+        start = time.perf_counter()
+        self._pending += 1
+        try:
+            key = (
+                op, header.get("modulation", "fsk"),
+                float(header["freq0"]), float(header["freq1"]),
+                float(header["sampling_rate"]), float(header["baud_rate"]),
+            )
+            if key[:2] not in BATCH_FUNCTIONS:
+                raise ValueError(f"Unsupported operation {key[:2]!r}")
+            item = bytes(body) if op == "encode" else body.decode('ascii')
+            result = await self._coalescer.submit(key, item)
+        except Exception as exc:
+            return await self._error(f"{type(exc).__name__}: {exc}")
+        finally:
+            self._pending -= 1
+
+        out = result.encode('ascii') if op == "encode" else result
+        self.stats.record(time.perf_counter() - start, len(body), len(out))
+        return {"ok": True}, out
+#endregion
+
+#region Client
+class FSKClient:
+    """
+    Minimal asyncio client for FSKServer. Requests may be issued concurrently on one client;
+    the server answers in order, so responses are matched to requests by position.
+    """
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader = reader
+        self._writer = writer
+        self._waiting: deque = deque()
+        self._reader_task = asyncio.ensure_future(self._read_responses())
+
+    @classmethod
+    async def connect(cls, host: str = "127.0.0.1", port: int = 8765, path: Optional[str] = None) -> "FSKClient":
+        if path:
+            reader, writer = await asyncio.open_unix_connection(path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def close(self) -> None:
+        self._writer.close()
+        await self._writer.wait_closed()
+        self._reader_task.cancel()
+
+    async def _read_responses(self) -> None:
+        try:
+            while True:
+                frame = await read_frame(self._reader, 1 << 31)
+                if frame is None:
+                    break
+                self._waiting.popleft().set_result(frame)
+        except (asyncio.CancelledError, ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            while self._waiting:
+                future = self._waiting.popleft()
+                if not future.done():
+                    future.set_exception(ConnectionError("Connection closed"))
+
+    async def _request(self, header: dict, body: bytes = b'') -> bytes:
+        future = asyncio.get_running_loop().create_future()
+        self._waiting.append(future)
+        self._writer.write(pack_frame(header, body))
+        await self._writer.drain()
+        response_header, response_body = await future
+        if not response_header.get("ok"):
+            raise RuntimeError(response_header.get("error", "request failed"))
+        return response_body
+
+    async def encode(self, data: bytes, freq0: float, freq1: float, sampling_rate: float, baud_rate: float, modulation: str = "fsk") -> str:
+        """Modulate data on the server and return the Base64 WAV string."""
+        header = {"op": "encode", "modulation": modulation, "freq0": freq0, "freq1": freq1,
+                  "sampling_rate": sampling_rate, "baud_rate": baud_rate}
+        return (await self._request(header, data)).decode('ascii')
+
+    async def decode(self, audio_base64: str, freq0: float, freq1: float, sampling_rate: float, baud_rate: float, modulation: str = "fsk") -> bytes:
+        """Demodulate a Base64 WAV string on the server and return the recovered bytes."""
+        header = {"op": "decode", "modulation": modulation, "freq0": freq0, "freq1": freq1,
+                  "sampling_rate": sampling_rate, "baud_rate": baud_rate}
+        return await self._request(header, audio_base64.encode('ascii'))
+
+    async def stats(self) -> dict[str, Any]:
+        """Fetch the server's latency and throughput counters."""
+        return json.loads(await self._request({"op": "stats"}))
+#endregion
+
+#region Command-Line Entry Point
+def main(argv: Optional[list[str]] = None) -> None:
+    import argparse
+    parser = argparse.ArgumentParser(description="Run the local FSK encode/decode service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", dest="path", help="Listen on this Unix socket path instead of TCP")
+    parser.add_argument("--batch-window-ms", type=float, default=2.0)
+    parser.add_argument("--max-batch", type=int, default=256)
+    parser.add_argument("--max-pending", type=int, default=1024)
+    parser.add_argument("--workers", type=int, default=4, help="Executor threads for NumPy work")
+    args = parser.parse_args(argv)
+
+    async def run() -> None:
+        server = FSKServer(
+            args.host, args.port, args.path,
+            executor=ThreadPoolExecutor(max_workers=args.workers),
+            batch_window=args.batch_window_ms / 1000.0,
+            max_batch=args.max_batch,
+            max_pending=args.max_pending,
+        )
+        await server.start()
+        print(f"FSK service listening on {args.path or f'{server.host}:{server.port}'}")
+        await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
+#endregion
@@ -0,0 +1,310 @@
+# streaming.py
+from typing import Iterable, Iterator, Optional, Union
+import numpy as np
+from numpy.typing import NDArray
+from . import metrics
+from .tables import get_tables, complete_symbols, repeat_symbols, symbol_start
+from .fsk_demod import _DECIMATE_METHODS, _demodulate_block, pcm16_to_float
+from .resample import StreamingResampler, demodulation_rate, demodulation_taps
+
+PCMChunk = Union[bytes, bytearray, memoryview, NDArray[np.int16], NDArray[np.float_]]
+
+#region Streaming Demodulator
+class StreamingDemodulator:
+    """
+    Incremental FSK (or CPFSK) demodulator for audio that arrives in chunks.
+
+    Chunks may have any length. Samples of a partial symbol and bits of a partial byte
+    are carried over to the next call, so each byte is returned as soon as its last
+    symbol has been received. State never grows beyond one symbol of samples plus
+    seven bits (and the resampler's filter history when decimating), however long the
+    stream runs.
+
+    Usage Example:
+        demod = StreamingDemodulator(44100.0, 300.0, 1200.0, 2200.0)
+        for chunk in audio_chunks:
+            data = demod.feed(chunk)
+    """
+    def __init__(
+        self,
+        sampling_rate: float,
+        baud_rate: float,
+        freq0: float,
+        freq1: float,
+        method: str = "correlate",
+        decimate: Optional[bool] = None
+    ):
+        """
+        Parameters:
+            sampling_rate: Number of samples per second (Hz) used during modulation.
+            baud_rate: Symbol rate (symbols per second).
+            freq0: Carrier frequency representing bit 0.
+            freq1: Carrier frequency representing bit 1.
+            method: Demodulation backend, "correlate", "goertzel" or "fft" (see fsk_demodulation).
+            decimate: Resample to the lowest rate that keeps the tones before demodulating,
+                      as fsk_demodulation_from_base64 does; None does so for "goertzel".
+        """
+        self.sampling_rate = sampling_rate
+        self.baud_rate = baud_rate
+        self.freq0 = freq0
+        self.freq1 = freq1
+        self.method = method
+        if decimate is None:
+            decimate = method in _DECIMATE_METHODS
+        up, down = demodulation_rate(sampling_rate, baud_rate, (freq0, freq1)) if decimate else (1, 1)
+        self._resampler = None
+        if up != down:
+            taps = demodulation_taps(sampling_rate, baud_rate, (freq0, freq1), up, down)
+            self._resampler = StreamingResampler(up, down, taps)
+        self._tables = get_tables((freq0, freq1), sampling_rate * up / down, baud_rate)
+        self.reset()
+
+    @property
+    def samples_per_bit(self) -> int:
+        """
+        Whole number of demodulated samples in one symbol (the shorter symbol length if it is
+        fractional); counted at the reduced rate when decimating.
+        """
+        return self._tables.samples_per_bit
+
+    def reset(self) -> None:
+        """Discard any buffered samples and bits."""
+        if self._resampler is not None:
+            self._resampler.reset()
+        self._pending_samples: NDArray[np.float32] = np.empty(0, dtype=np.float32)
+        self._pending_bits: NDArray[np.uint8] = np.empty(0, dtype=np.uint8)
+        self._symbol_index = 0  # global index of the next symbol, for fractional symbol lengths
+
+    def feed(self, chunk: PCMChunk) -> bytes:
+        """
+        Demodulate the next chunk of audio.
+
+        Parameters:
+            chunk: int16 samples, float samples in [-1, 1], or raw little-endian 16-bit PCM bytes
+                   (a whole number of samples).
+
+        Returns:
+            The bytes completed by this chunk (possibly empty).
+        """
+        samples = self._to_float(chunk)
+        if self._resampler is not None:
+            with metrics.stage("resample") as timer:
+                samples = self._resampler.feed(samples)
+                timer.count(samples=samples.size)
+        return self._demodulate(samples)
+
+    def _demodulate(self, samples: NDArray[np.float_]) -> bytes:
+        # Prepend the partial symbol left over from the previous call.
+        if self._pending_samples.size:
+            samples = np.concatenate([self._pending_samples, samples])
+
+        # Demodulate every complete symbol and keep the remainder for next time.
+        first_symbol = self._symbol_index
+        num_symbols = complete_symbols(self._tables, first_symbol, samples.size)
+        used = symbol_start(self._tables, first_symbol + num_symbols) - symbol_start(self._tables, first_symbol)
+        bits = _demodulate_block(samples[:used], self._tables, self.method, first_symbol)
+        self._pending_samples = samples[used:].copy()
+        self._symbol_index += num_symbols
+
+        # Prepend the partial byte left over from the previous call and emit whole bytes.
+        if self._pending_bits.size:
+            bits = np.concatenate([self._pending_bits, bits])
+        complete = (bits.size // 8) * 8
+        self._pending_bits = bits[complete:].copy()
+        return np.packbits(bits[:complete]).tobytes()
+
+    def flush(self) -> bytes:
+        """
+        Finish the stream.
+
+        A trailing partial byte is zero-padded, exactly as np.packbits does for
+        fsk_demodulation_from_base64; a trailing partial symbol is dropped.
+
+        Returns:
+            The final (possibly empty) bytes.
+        """
+        data = b''
+        if self._resampler is not None:
+            # The resampler's tail may complete more symbols.
+            data = self._demodulate(self._resampler.flush())
+        data += np.packbits(self._pending_bits).tobytes()
+        self.reset()
+        return data
+
+    def stream(self, chunks: Iterable[PCMChunk]) -> Iterator[bytes]:
+        """
+        Demodulate an iterable of audio chunks, yielding bytes as soon as they are decided.
+
+        Parameters:
+            chunks: Iterable of chunks accepted by feed().
+
+        Yields:
+            Non-empty byte strings in stream order, including the flushed tail.
+        """
+        for chunk in chunks:
+            data = self.feed(chunk)
+            if data:
+                yield data
+        data = self.flush()
+        if data:
+            yield data
+
+    @staticmethod
+    def _to_float(chunk: PCMChunk) -> NDArray[np.float_]:
+        if isinstance(chunk, (bytes, bytearray, memoryview)):
+            chunk = np.frombuffer(chunk, dtype='<i2')
+        chunk = np.asarray(chunk)
+        if chunk.dtype.kind in 'iu':
+            return pcm16_to_float(chunk)
+        return chunk
+#endregion
+
+#region Streaming Modulators
+ByteSource = Union[bytes, bytearray, memoryview, Iterable[bytes]]
+
+# Payload bytes are unpacked this many at a time, so a large payload never
+# materializes as one full-length bit or sample array.
+_BYTES_PER_SEGMENT = 64
+
+def _bit_segments(data: ByteSource) -> Iterator[NDArray[np.uint8]]:
+    """Unpack a byte string or an iterable of byte strings into bounded bit segments."""
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        data = (data,)
+    for piece in data:
+        piece = np.frombuffer(piece, dtype=np.uint8)
+        for start in range(0, piece.size, _BYTES_PER_SEGMENT):
+            yield np.unpackbits(piece[start : start + _BYTES_PER_SEGMENT])
+
+def _bit_array_segments(bit_sequence: NDArray[np.int_]) -> Iterator[NDArray[np.int_]]:
+    """Split an already unpacked bit sequence into the same bounded segments."""
+    bit_sequence = np.asarray(bit_sequence)
+    step = 8 * _BYTES_PER_SEGMENT
+    for start in range(0, bit_sequence.size, step):
+        yield bit_sequence[start : start + step]
+
+def _binary_tones(bit_segments: Iterator[NDArray[np.int_]]) -> Iterator[NDArray[np.intp]]:
+    """Map bit segments to tone indices: bits=0 -> freq0, bits=1 -> freq1."""
+    for bits in bit_segments:
+        yield (np.asarray(bits) != 0).astype(np.intp)
+
+def _fixed_blocks(segments: Iterator[NDArray[np.float_]], block_size: int) -> Iterator[NDArray[np.float_]]:
+    """Regroup variable-length sample segments into blocks of exactly block_size samples (the last may be shorter)."""
+    buffer = np.empty(block_size, dtype=np.float64)
+    filled = 0
+    for segment in segments:
+        while segment.size:
+            take = min(block_size - filled, segment.size)
+            buffer[filled : filled + take] = segment[:take]
+            filled += take
+            segment = segment[take:]
+            if filled == block_size:
+                yield buffer.copy()
+                filled = 0
+    if filled:
+        yield buffer[:filled].copy()
+
+def _modulation_stream(
+    tone_segments: Iterator[NDArray[np.intp]],
+    freqs: tuple[float, ...],
+    sampling_rate: float,
+    baud_rate: float,
+    block_size: int,
+    pcm16: bool,
+    continuous: bool
+) -> Iterator[NDArray]:
+    if block_size <= 0:
+        raise ValueError("block_size must be positive")
+    tables = get_tables(freqs, sampling_rate, baud_rate)
+
+    def segments() -> Iterator[NDArray[np.float_]]:
+        symbol_offset = 0   # global index of the next symbol (fractional symbol layout)
+        sample_offset = 0   # global index of the next sample (FSK time axis)
+        phase = 0.0         # accumulated phase at the end of the previous segment (CPFSK)
+        for tone_index in tone_segments:
+            if not tone_index.size:
+                continue
+            first_symbol, symbol_offset = symbol_offset, symbol_offset + tone_index.size
+            if continuous:
+                # Seed the first increment with the carried phase so np.cumsum reproduces
+                # the sequential accumulation of the one-shot cpfsk_modulation exactly.
+                delta_phi = repeat_symbols(tables, tables.phase_increments[tone_index], first_symbol)
+                delta_phi[0] += phase
+                phi = np.cumsum(delta_phi)
+                phase = phi[-1]
+                yield np.sin(phi)
+            else:
+                symbol_freqs = repeat_symbols(tables, tables.freqs[tone_index], first_symbol)
+                t = np.arange(sample_offset, sample_offset + symbol_freqs.size) / sampling_rate
+                sample_offset += symbol_freqs.size
+                yield np.sin(2.0 * np.pi * symbol_freqs * t)
+
+    for block in _fixed_blocks(segments(), block_size):
+        if pcm16:
+            # Blocks are fresh copies, so quantize in place instead of allocating another float block.
+            block *= 32767
+            block = block.astype(np.int16)
+        yield block
+
+def cpfsk_modulation_stream(
+    data: ByteSource,
+    freq0: float,
+    freq1: float,
+    sampling_rate: float,
+    baud_rate: float,
+    block_size: int = 4096,
+    pcm16: bool = False
+) -> Iterator[NDArray]:
+    """
+    Generate a CPFSK modulated signal block by block, for payloads of any length.
+    
+    The accumulated phase is carried across block boundaries, so concatenating the
+    blocks gives exactly the signal returned by cpfsk_modulation for the same bits,
+    while memory use stays constant.
+    
+    Parameters:
+        data: Payload bytes, or an iterable of byte strings (e.g. read from a file or socket).
+        freq0: Carrier frequency for bit 0.
+        freq1: Carrier frequency for bit 1.
+        sampling_rate: Number of samples per second (Hz).
+        baud_rate: Symbol rate (symbols per second).
+        block_size: Number of samples per yielded block (the last block may be shorter).
+        pcm16: If True, yield 16-bit PCM blocks instead of floats in [-1, 1].
+        
+    Yields:
+        NDArray blocks of float64 samples (or int16 if pcm16 is set).
+    """
+    return _modulation_stream(
+        _binary_tones(_bit_segments(data)), (freq0, freq1), sampling_rate, baud_rate, block_size, pcm16, continuous=True
+    )
+
+def fsk_modulation_stream(
+    data: ByteSource,
+    freq0: float,
+    freq1: float,
+    sampling_rate: float,
+    baud_rate: float,
+    block_size: int = 4096,
+    pcm16: bool = False
+) -> Iterator[NDArray]:
+    """
+    Generate an FSK modulated signal block by block, for payloads of any length.
+    
+    The global time axis is carried across block boundaries, so concatenating the
+    blocks gives exactly the signal returned by fsk_modulation for the same bits.
+    
+    Parameters:
+        data: Payload bytes, or an iterable of byte strings (e.g. read from a file or socket).
+        freq0: Carrier frequency for bit 0.
+        freq1: Carrier frequency for bit 1.
+        sampling_rate: Number of samples per second (Hz).
+        baud_rate: Symbol rate (symbols per second).
+        block_size: Number of samples per yielded block (the last block may be shorter).
+        pcm16: If True, yield 16-bit PCM blocks instead of floats in [-1, 1].
+        
+    Yields:
+        NDArray blocks of float64 samples (or int16 if pcm16 is set).
+    """
+    return _modulation_stream(
+        _binary_tones(_bit_segments(data)), (freq0, freq1), sampling_rate, baud_rate, block_size, pcm16, continuous=False
+    )
+#endregion
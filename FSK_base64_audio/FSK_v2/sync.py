@@ -0,0 +1,212 @@
+# sync.py
+import struct
+from typing import Optional
+import numpy as np
+from numpy.typing import NDArray
+from .tables import get_tables, symbol_start
+from .fsk_mod import fsk_modulation
+from .cpfsk_mod import cpfsk_modulation
+from .fsk_demod import _demodulate_block, _demodulation_signal, _signal_from_base64
+
+#region Frame Format
+# A frame is: PREAMBLE | SYNC_WORD | payload length (2 bytes, big-endian) | payload.
+# The alternating preamble gives the detector energy on both tones; the sync word
+# makes the correlation peak unique at the true frame start.
+PREAMBLE = b"\x55\x55\x55\x55"
+SYNC_WORD = b"\x2d\xd4"
+_LENGTH = struct.Struct('>H')
+MAX_FRAME_PAYLOAD = 0xFFFF
+
+def frame_payload(data: bytes) -> bytes:
+    """
+    Wrap a payload in a frame: preamble, sync word and a 2-byte big-endian length header.
+
+    Parameters:
+        data: Payload bytes (at most MAX_FRAME_PAYLOAD bytes).
+
+    Returns:
+        The framed bytes, ready to be modulated.
+    """
+    if len(data) > MAX_FRAME_PAYLOAD:
+        raise ValueError(f"Frame payload is limited to {MAX_FRAME_PAYLOAD} bytes")
+    return PREAMBLE + SYNC_WORD + _LENGTH.pack(len(data)) + bytes(data)
+#endregion
+
+#region FFT Frame Detection
+def _sync_template(
+    freq0: float,
+    freq1: float,
+    sampling_rate: float,
+    baud_rate: float,
+    modulation: str
+) -> NDArray[np.float_]:
+    """Modulate the preamble and sync word exactly as a frame start is transmitted."""
+    bits = np.unpackbits(np.frombuffer(PREAMBLE + SYNC_WORD, dtype=np.uint8))
+    modulate = cpfsk_modulation if modulation == "cpfsk" else fsk_modulation
+    template, _ = modulate(bits, freq0, freq1, sampling_rate, baud_rate)
+    return template
+
+def _quadrature_pair(template: NDArray[np.float_]) -> NDArray[np.float_]:
+    """Return the Hilbert transform of template, so (template, result) spans every carrier phase."""
+    spectrum = np.fft.fft(template)
+    n = template.size
+    weights = np.zeros(n)
+    weights[0] = 1.0
+    weights[1 : (n + 1) // 2] = 2.0
+    if n % 2 == 0:
+        weights[n // 2] = 1.0
+    return np.fft.ifft(spectrum * weights).imag
+
+def find_frames(
+    signal: NDArray[np.float_],
+    sampling_rate: float,
+    baud_rate: float,
+    freq0: float,
+    freq1: float,
+    modulation: str = "cpfsk",
+    threshold: float = 0.75,
+    block_size: int = 1 << 18
+) -> list[int]:
+    """
+    Locate every frame start in a long recording with FFT cross-correlation.
+
+    The signal is correlated against the modulated preamble + sync word and its quadrature
+    pair (so the result does not depend on the carrier phase), using overlap-save blocks
+    of block_size samples: O(N log block_size) overall. The correlation is normalized by
+    the template and local signal energy, so threshold is a similarity in [0, 1].
+
+    Parameters:
+        signal: NDArray of floats representing the received recording.
+        sampling_rate: Number of samples per second (Hz).
+        baud_rate: Symbol rate (symbols per second).
+        freq0: Carrier frequency representing bit 0.
+        freq1: Carrier frequency representing bit 1.
+        modulation: "cpfsk" or "fsk", the modulator used by the transmitter.
+        threshold: Minimum normalized correlation to accept a frame start.
+        block_size: FFT length for the overlap-save correlation.
+
+    Returns:
+        Sample offsets of the detected frame starts, in increasing order.
+    """
+    signal = np.asarray(signal, dtype=np.float64)
+    template = _sync_template(freq0, freq1, sampling_rate, baud_rate, modulation)
+    length = template.size
+    if signal.size < length:
+        return []
+    block_size = max(block_size, 1 << int(np.ceil(np.log2(2 * length))))
+    step = block_size - length + 1
+
+    template_norm = np.linalg.norm(template)
+    h_i = np.conj(np.fft.rfft(template, block_size))
+    h_q = np.conj(np.fft.rfft(_quadrature_pair(template), block_size))
+
+    # Local signal energy over every template-length window.
+    energy = np.concatenate([[0.0], np.cumsum(signal * signal)])
+    window_energy = energy[length:] - energy[:-length]
+
+    n_lags = signal.size - length + 1
+    score = np.empty(n_lags)
+    for start in range(0, n_lags, step):
+        block = signal[start : start + block_size]
+        spectrum = np.fft.rfft(block, block_size)
+        count = min(step, n_lags - start)
+        c_i = np.fft.irfft(spectrum * h_i, block_size)[:count]
+        c_q = np.fft.irfft(spectrum * h_q, block_size)[:count]
+        score[start : start + count] = np.hypot(c_i, c_q)
+    score /= template_norm * np.sqrt(np.maximum(window_energy, 1e-12))
+
+    # Non-maximum suppression: take local peaks above threshold from strongest to weakest
+    # and drop any peak within one template length of an accepted one (preamble sidelobes).
+    interior = score[1:-1]
+    peaks = np.flatnonzero((interior >= threshold) & (interior >= score[:-2]) & (interior >= score[2:])) + 1
+    if score.size and score[0] >= threshold and (score.size == 1 or score[0] >= score[1]):
+        peaks = np.concatenate([[0], peaks])
+    starts: list[int] = []
+    for peak in peaks[np.argsort(-score[peaks], kind='stable')]:
+        if all(abs(peak - accepted) >= length for accepted in starts):
+            starts.append(int(peak))
+    starts.sort()
+    return starts
+#endregion
+
+#region Frame Decoding
+def decode_frames(
+    signal: NDArray[np.float_],
+    sampling_rate: float,
+    baud_rate: float,
+    freq0: float,
+    freq1: float,
+    modulation: str = "cpfsk",
+    threshold: float = 0.75
+) -> list[bytes]:
+    """
+    Find every frame in a recording and demodulate only the located frames.
+
+    Parameters:
+        signal: NDArray of floats representing the received recording.
+        sampling_rate: Number of samples per second (Hz).
+        baud_rate: Symbol rate (symbols per second).
+        freq0: Carrier frequency representing bit 0.
+        freq1: Carrier frequency representing bit 1.
+        modulation: "cpfsk" or "fsk", the modulator used by the transmitter.
+        threshold: Minimum normalized correlation to accept a frame start.
+
+    Returns:
+        The payload of each complete frame, in order of appearance.
+    """
+    tables = get_tables((freq0, freq1), sampling_rate, baud_rate)
+    header_symbol = 8 * len(PREAMBLE + SYNC_WORD)
+    payload_symbol = header_symbol + 8 * _LENGTH.size
+    header_start = symbol_start(tables, header_symbol)
+    payload_start = symbol_start(tables, payload_symbol)
+
+    payloads = []
+    for start in find_frames(signal, sampling_rate, baud_rate, freq0, freq1, modulation, threshold):
+        header = signal[start + header_start : start + payload_start]
+        if header.size < payload_start - header_start:
+            continue
+        header_bits = _demodulate_block(header, tables, first_symbol=header_symbol)
+        (length,) = _LENGTH.unpack(np.packbits(header_bits).tobytes())
+        body_size = symbol_start(tables, payload_symbol + 8 * length) - payload_start
+        body = signal[start + payload_start : start + payload_start + body_size]
+        if body.size < body_size:
+            continue  # frame cut off at the end of the recording
+        payloads.append(np.packbits(_demodulate_block(body, tables, first_symbol=payload_symbol)).tobytes())
+    return payloads
+
+def decode_frames_from_base64(
+    audio_base64: str,
+    sampling_rate: float,
+    baud_rate: float,
+    freq0: float,
+    freq1: float,
+    modulation: str = "cpfsk",
+    threshold: float = 0.75,
+    channel: Optional[int] = None,
+    decimate: Optional[bool] = None
+) -> list[bytes]:
+    """
+    Find and demodulate every frame in a Base64-encoded WAV recording.
+
+    Parameters:
+        audio_base64: Base64-encoded string representing a WAV recording (any layout
+                      audio_format.float_samples reads).
+        sampling_rate: Number of samples per second (Hz), used only if the header gives none.
+        baud_rate: Symbol rate (symbols per second).
+        freq0: Carrier frequency representing bit 0.
+        freq1: Carrier frequency representing bit 1.
+        modulation: "cpfsk" or "fsk", the modulator used by the transmitter.
+        threshold: Minimum normalized correlation to accept a frame start.
+        channel: Channel to demodulate, or None for the average of all channels.
+        decimate: Resample to the lowest rate that keeps the tones first (see
+                  fsk_demod.fsk_demodulation_from_base64).
+
+    Returns:
+        The payload of each complete frame, in order of appearance.
+    """
+    signal, framerate = _signal_from_base64(audio_base64, "wav", "pcm16", channel)
+    signal, rate = _demodulation_signal(
+        signal, framerate, sampling_rate, baud_rate, (freq0, freq1), "correlate", decimate
+    )
+    return decode_frames(signal, rate, baud_rate, freq0, freq1, modulation, threshold)
+#endregion
@@ -0,0 +1,124 @@
+# synthesis.py
+from typing import Iterator, Optional
+import numpy as np
+from numpy.typing import DTypeLike, NDArray
+from .tables import ModemTables, repeat_symbols, symbol_boundaries, symbol_start
+from .wavetable import get_wavetable, wavetable_pcm16
+
+#region Lean PCM16 Synthesis
+# Working dtypes for the sine evaluation. float64 reproduces fsk_modulation / cpfsk_modulation
+# followed by (signal * 32767).astype(np.int16) bit for bit. float32 keeps the phase
+# bookkeeping in float64, wraps it to whole cycles and evaluates the sine in float32:
+# several times faster, and within 1 LSB of the float64 result.
+SYNTH_DTYPES = (np.float64, np.float32)
+
+# Synthesis engines: "sin" evaluates np.sin per sample; "wavetable" gathers precomputed int16
+# symbol templates (see wavetable.py) and falls back to "sin" when the tones have no exact phase grid.
+SYNTH_ENGINES = ("sin", "wavetable")
+
+# Samples synthesized per block; scratch memory is a few times this, independent of signal length.
+_BLOCK_SAMPLES = 1 << 16
+
+def _pcm16_blocks(
+    tone_index: NDArray[np.intp],
+    tables: ModemTables,
+    sampling_rate: float,
+    continuous: bool,
+    dtype: DTypeLike = np.float64,
+    out: Optional[NDArray[np.int16]] = None,
+    block_samples: int = _BLOCK_SAMPLES
+) -> Iterator[NDArray[np.int16]]:
+    """
+    Synthesize 16-bit PCM for a tone index sequence, one block of whole symbols at a time.
+
+    Yields views of out when it is given, otherwise views of one reused int16 block buffer
+    (valid until the next block is requested). No time axis or full-length float array is built.
+    """
+    dtype = np.dtype(dtype)
+    if dtype not in SYNTH_DTYPES:
+        raise ValueError(f"Unsupported synthesis dtype {dtype}; expected float64 or float32")
+    symbols_per_block = max(1, block_samples // (tables.samples_per_bit + 1))
+    max_block = symbols_per_block * (tables.samples_per_bit + 1)
+    scratch = np.empty(max_block if out is None else 0, dtype=np.int16)
+    sine = np.empty(max_block, dtype=np.float32) if dtype == np.float32 else None
+    phase = 0.0  # accumulated phase at the end of the previous block (CPFSK)
+
+    for first in range(0, tone_index.size, symbols_per_block):
+        block_tones = tone_index[first : first + symbols_per_block]
+        bounds = symbol_boundaries(tables, first, block_tones.size)
+        start, stop = int(bounds[0]), int(bounds[-1])
+        n = stop - start
+
+        if continuous:
+            # Seed the first increment with the carried phase, exactly like the streaming modulator.
+            work = repeat_symbols(tables, tables.phase_increments[block_tones], first)
+            work[0] += phase
+            np.cumsum(work, out=work)
+            phase = work[-1]
+            if dtype == np.float32:
+                work *= 1 / (2 * np.pi)  # radians -> cycles
+        else:
+            work = repeat_symbols(tables, tables.freqs[block_tones], first)
+            t = np.arange(start, stop, dtype=np.float64)
+            t /= sampling_rate
+            if dtype == np.float32:
+                work *= t  # cycles
+            else:
+                # Same operation order as fsk_modulation: (2π * f) * t on the global time axis.
+                work *= 2.0 * np.pi
+                work *= t
+
+        if dtype == np.float32:
+            # Whole cycles carry no information: keep the fraction in float64, then go to float32.
+            work -= np.floor(work)
+            angles = sine[:n]
+            angles[...] = work
+            angles *= np.float32(2 * np.pi)
+        else:
+            angles = work
+        np.sin(angles, out=angles)
+        angles *= 32767
+
+        target = scratch[:n] if out is None else out[start:stop]
+        np.copyto(target, angles, casting='unsafe')
+        yield target
+
+def synthesize_pcm16(
+    tone_index: NDArray[np.intp],
+    tables: ModemTables,
+    sampling_rate: float,
+    continuous: bool,
+    out: Optional[NDArray[np.int16]] = None,
+    dtype: DTypeLike = np.float64,
+    engine: str = "sin"
+) -> NDArray[np.int16]:
+    """
+    Synthesize the 16-bit PCM signal for a tone index sequence with bounded working memory.
+
+    Parameters:
+        tone_index: Tone index of every symbol.
+        tables: Modem tables for the tone set and rates.
+        sampling_rate: Number of samples per second (Hz).
+        continuous: True for continuous-phase (CPFSK) synthesis, False for plain FSK.
+        out: Optional int16 buffer of exactly the signal length to write into.
+        dtype: np.float64 (bit-exact) or np.float32 (faster, within 1 LSB); see SYNTH_DTYPES.
+        engine: "sin" or "wavetable" (see SYNTH_ENGINES); dtype only applies to "sin".
+
+    Returns:
+        The int16 signal (out, if it was given).
+    """
+    if engine not in SYNTH_ENGINES:
+        raise ValueError(f"Unknown synthesis engine {engine!r}; expected one of {SYNTH_ENGINES}")
+    if engine == "wavetable":
+        wavetable = get_wavetable(tables, sampling_rate, continuous)
+        if wavetable is not None:
+            return wavetable_pcm16(tone_index, tables, wavetable, continuous, out=out)
+    n_samples = symbol_start(tables, tone_index.size)
+    if out is None:
+        out = np.empty(n_samples, dtype=np.int16)
+    elif out.shape != (n_samples,) or out.dtype != np.int16:
+        raise ValueError(f"out must be an int16 array of shape ({n_samples},)")
+    for _ in _pcm16_blocks(tone_index, tables, sampling_rate, continuous, dtype, out):
+        pass
+    return out
+#endregion
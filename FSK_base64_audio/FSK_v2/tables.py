@@ -0,0 +1,244 @@
+# tables.py
+import threading
+from collections import OrderedDict
+from fractions import Fraction
+from typing import Callable, NamedTuple
+import numpy as np
+from numpy.typing import NDArray
+
+#region Modem Tables
+class ModemTables(NamedTuple):
+    """
+    Precomputed, read-only tables for one set of modem parameters.
+
+    Attributes:
+        freqs: Tone frequencies (Hz) indexed by symbol value.
+        samples_per_bit: Whole number of samples in the shortest symbol (floor of symbol_ratio).
+        symbol_ratio: Exact number of samples per symbol, sampling_rate / baud_rate, as a Fraction.
+        phase_increments: Per-sample phase increment 2π * f / sampling_rate for each tone.
+        t_symbol: Time vector for one symbol duration.
+        bank: Quadrature reference bank of shape (samples_per_bit, 2 * len(freqs)).
+    """
+    freqs: NDArray[np.float_]
+    samples_per_bit: int
+    symbol_ratio: Fraction
+    phase_increments: NDArray[np.float_]
+    t_symbol: NDArray[np.float_]
+    bank: NDArray[np.float_]
+
+def reference_bank(
+    freqs: tuple[float, ...],
+    sampling_rate: float,
+    samples_per_bit: int
+) -> NDArray[np.float_]:
+    """
+    Build the quadrature reference bank used to correlate one symbol against every tone.
+
+    Parameters:
+        freqs: Tone frequencies (Hz), in symbol order (freq0, freq1, ...).
+        sampling_rate: Number of samples per second (Hz).
+        samples_per_bit: Number of samples in one symbol.
+
+    Returns:
+        bank: NDArray of shape (samples_per_bit, 2 * len(freqs)) holding the columns
+              cos(f0), sin(f0), cos(f1), sin(f1), ... over one symbol duration.
+    """
+    # Time vector for one symbol duration
+    t_symbol = np.arange(samples_per_bit) / sampling_rate
+
+    # One angle column per tone, then interleave cos/sin so columns pair up as (I, Q).
+    angles = 2 * np.pi * np.outer(t_symbol, np.asarray(freqs, dtype=np.float64))
+    bank = np.empty((samples_per_bit, 2 * len(freqs)), dtype=np.float64)
+    bank[:, 0::2] = np.cos(angles)
+    bank[:, 1::2] = np.sin(angles)
+    return bank
+
+# Rate ratios are kept exact; only pathological float rates (denominators beyond this)
+# are approximated, with a relative error far below one sample per day of audio.
+_MAX_RATIO_DENOMINATOR = 1 << 20
+
+def _symbol_ratio(sampling_rate: float, baud_rate: float) -> Fraction:
+    ratio = Fraction(sampling_rate) / Fraction(baud_rate)
+    if ratio.denominator > _MAX_RATIO_DENOMINATOR:
+        ratio = ratio.limit_denominator(_MAX_RATIO_DENOMINATOR)
+    if ratio < 1:
+        raise ValueError("baud_rate must not exceed sampling_rate")
+    return ratio
+
+def _build_tables(
+    freqs: tuple[float, ...],
+    sampling_rate: float,
+    baud_rate: float
+) -> ModemTables:
+    symbol_ratio = _symbol_ratio(sampling_rate, baud_rate)
+    samples_per_bit = symbol_ratio.numerator // symbol_ratio.denominator
+    freq_table = np.asarray(freqs, dtype=np.float64)
+    tables = ModemTables(
+        freqs=freq_table,
+        samples_per_bit=samples_per_bit,
+        symbol_ratio=symbol_ratio,
+        phase_increments=freq_table * (2 * np.pi) / sampling_rate,
+        t_symbol=np.arange(samples_per_bit) / sampling_rate,
+        bank=reference_bank(freqs, sampling_rate, samples_per_bit),
+    )
+    # Tables are shared between callers, so make sure nobody can modify them in place.
+    for array in (tables.freqs, tables.phase_increments, tables.t_symbol, tables.bank):
+        array.setflags(write=False)
+    return tables
+#endregion
+
+#region Symbol Boundaries
+# Symbol k occupies samples [floor(k * R), floor((k + 1) * R)) where R = sampling_rate / baud_rate.
+# Boundaries are computed from the exact ratio with integer arithmetic, so they never drift,
+# and symbols are floor(R) or floor(R) + 1 samples long when R is fractional.
+def symbol_boundaries(tables: ModemTables, first_symbol: int, count: int) -> NDArray[np.int64]:
+    """
+    Return the absolute sample indices at which symbols first_symbol .. first_symbol + count start.
+
+    Parameters:
+        tables: Modem tables for the stream's parameters.
+        first_symbol: Index of the first symbol.
+        count: Number of symbols.
+
+    Returns:
+        NDArray of count + 1 boundaries; the last one is where the following symbol starts.
+    """
+    num, den = tables.symbol_ratio.numerator, tables.symbol_ratio.denominator
+    k = np.arange(first_symbol, first_symbol + count + 1, dtype=np.int64)
+    return k * num if den == 1 else (k * num) // den
+
+def symbol_lengths(tables: ModemTables, first_symbol: int, count: int) -> NDArray[np.int64]:
+    """Return the number of samples in each of symbols first_symbol .. first_symbol + count - 1."""
+    return np.diff(symbol_boundaries(tables, first_symbol, count))
+
+def symbol_start(tables: ModemTables, symbol: int) -> int:
+    """Return the absolute sample index at which the given symbol starts."""
+    return symbol * tables.symbol_ratio.numerator // tables.symbol_ratio.denominator
+
+def repeat_symbols(
+    tables: ModemTables,
+    values: NDArray,
+    first_symbol: int = 0
+) -> NDArray:
+    """
+    Hold each per-symbol value for the duration of its symbol, along the last axis.
+
+    Parameters:
+        tables: Modem tables for the stream's parameters.
+        values: NDArray whose last axis has one entry per symbol.
+        first_symbol: Global index of the first symbol, so fractional layouts stay aligned.
+
+    Returns:
+        NDArray with the last axis expanded from symbols to samples.
+    """
+    if tables.symbol_ratio.denominator == 1:
+        return np.repeat(values, tables.samples_per_bit, axis=-1)
+    return np.repeat(values, symbol_lengths(tables, first_symbol, values.shape[-1]), axis=-1)
+
+def complete_symbols(tables: ModemTables, first_symbol: int, n_samples: int) -> int:
+    """
+    Return how many whole symbols fit in n_samples samples starting at first_symbol's boundary.
+    """
+    num, den = tables.symbol_ratio.numerator, tables.symbol_ratio.denominator
+    if den == 1:
+        return n_samples // num
+    # Largest m with floor((first + m) * R) <= start + n_samples, solved exactly in integers.
+    end = symbol_start(tables, first_symbol) + n_samples
+    return max(0, ((end + 1) * den - 1) // num - first_symbol)
+#endregion
+
+#region LRU Cache
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+class ModemCache:
+    """
+    A bounded, thread-safe LRU cache of ModemTables keyed by modem parameters.
+    """
+    def __init__(self, maxsize: int = 32):
+        if maxsize < 0:
+            raise ValueError("maxsize must be non-negative")
+        self._maxsize = maxsize
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: tuple, factory: Callable[[], ModemTables]) -> ModemTables:
+        """Return the entry stored under key, building it with factory() on a miss."""
+        with self._lock:
+            if key in self._entries:
+                self._hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self._misses += 1
+
+        # Build outside the lock; a concurrent miss on the same key just builds twice.
+        value = factory()
+        with self._lock:
+            if self._maxsize > 0:
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+                self._evict()
+        return value
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._maxsize, len(self._entries))
+
+    def clear(self) -> None:
+        """Drop every entry and reset the hit/miss counters."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def resize(self, maxsize: int) -> None:
+        """Change the maximum number of entries, evicting the least recently used ones if needed."""
+        if maxsize < 0:
+            raise ValueError("maxsize must be non-negative")
+        with self._lock:
+            self._maxsize = maxsize
+            self._evict()
+
+    def _evict(self) -> None:
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+# Process-wide cache shared by the modulators and the demodulator.
+_cache = ModemCache()
+
+def get_tables(
+    freqs: tuple[float, ...],
+    sampling_rate: float,
+    baud_rate: float
+) -> ModemTables:
+    """
+    Return the (cached) modem tables for the given tone set and rates.
+
+    Parameters:
+        freqs: Tone frequencies (Hz), in symbol order (freq0, freq1, ...).
+        sampling_rate: Number of samples per second (Hz).
+        baud_rate: Symbol rate (symbols per second).
+
+    Returns:
+        The shared, read-only ModemTables for these parameters.
+    """
+    key = (tuple(float(f) for f in freqs), float(sampling_rate), float(baud_rate))
+    return _cache.get(key, lambda: _build_tables(key[0], key[1], key[2]))
+
+def cache_info() -> CacheInfo:
+    """Return hits, misses, maxsize and current size of the shared modem table cache."""
+    return _cache.info()
+
+def clear_cache() -> None:
+    """Empty the shared modem table cache and reset its counters."""
+    _cache.clear()
+
+def set_cache_size(maxsize: int) -> None:
+    """Set the maximum number of parameter sets kept in the shared modem table cache."""
+    _cache.resize(maxsize)
+#endregion
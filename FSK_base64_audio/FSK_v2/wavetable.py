@@ -0,0 +1,150 @@
+# wavetable.py
+import math
+from fractions import Fraction
+from typing import NamedTuple, Optional, Sequence
+import numpy as np
+from numpy.typing import NDArray
+from .tables import ModemCache, ModemTables
+
+#region Wavetables
+# When every tone is a rational fraction f/sr of the sampling rate, every sample phase lies on
+# a grid of Q = lcm(denominators of f/sr) points around the circle, so each symbol is one of
+# M * Q precomputed waveforms, selected by its tone and its starting phase on that grid.
+# Templates hold final int16 samples, quantized like the sin path: (sin * 32767).astype(int16).
+#
+# Accuracy: phases on the grid are exact integers, so templates equal the sine of the exact phase.
+#   - FSK: matches fsk_modulation_pcm16, whose angles are exact up to float64 rounding
+#     (identical output in every configuration we measured).
+#   - CPFSK: identical to an exact-phase CPFSK. The np.sin reference accumulates float64
+#     rounding in its running phase, so the two agree to the LSB for short messages and
+#     drift apart slowly: measured < 0.1 LSB after 10^6 samples, ~3 LSB after 10^7 and
+#     ~8 LSB after 2 * 10^7 samples (7 minutes at 44.1 kHz). Demodulation is unaffected.
+
+# Templates larger than this are not built; callers fall back to the sin engine.
+_MAX_TEMPLATE_BYTES = 1 << 24
+
+class Wavetable(NamedTuple):
+    """
+    Precomputed int16 symbol templates for one parameter set.
+
+    Attributes:
+        grid: Number of phase grid points Q around the circle.
+        steps: Phase advance of each tone per sample, in grid units (f * Q / sr).
+        templates: int16 array of shape (num_tones * Q, template_length); row tone * Q + p holds
+                   the symbol of that tone starting at grid phase p.
+    """
+    grid: int
+    steps: NDArray[np.int64]
+    templates: NDArray[np.int16]
+
+def phase_grid(freqs: Sequence[float], sampling_rate: float) -> int:
+    """
+    Return the number of distinct sample phases Q of the given tones, lcm of the denominators of f / sr.
+    """
+    grid = 1
+    for freq in freqs:
+        grid = math.lcm(grid, (Fraction(freq) / Fraction(sampling_rate)).denominator)
+    return grid
+
+def _build_wavetable(tables: ModemTables, sampling_rate: float, continuous: bool) -> Optional[Wavetable]:
+    grid = phase_grid(tables.freqs, sampling_rate)
+    length = tables.samples_per_bit + (tables.symbol_ratio.denominator != 1)
+    if grid * tables.freqs.size * length * 2 > _MAX_TEMPLATE_BYTES:
+        return None
+    steps = np.array([int(Fraction(f) / Fraction(sampling_rate) * grid) for f in tables.freqs], dtype=np.int64)
+
+    # CPFSK's first sample already includes one phase increment (sin(phi) with phi = cumsum);
+    # FSK's first sample is at the symbol's start phase.
+    offset = 1 if continuous else 0
+    start = np.arange(grid, dtype=np.int64)[:, None]
+    sample = np.arange(offset, length + offset, dtype=np.int64)[None, :]
+    templates = np.empty((steps.size * grid, length), dtype=np.int16)
+    for tone, step in enumerate(steps):
+        angles = (start + step * sample) % grid * (2 * np.pi / grid)
+        np.sin(angles, out=angles)
+        angles *= 32767
+        templates[tone * grid : (tone + 1) * grid] = angles
+    templates.setflags(write=False)
+    return Wavetable(grid, steps, templates)
+
+# Templates are cached per parameter set, like the modem tables.
+_cache = ModemCache(maxsize=8)
+
+def get_wavetable(tables: ModemTables, sampling_rate: float, continuous: bool) -> Optional[Wavetable]:
+    """
+    Return the (cached) symbol templates for these modem tables, or None if the tones have no
+    small exact phase grid (e.g. arbitrary float frequencies) and the sin engine must be used.
+    """
+    key = (tuple(tables.freqs.tolist()), float(sampling_rate), tables.symbol_ratio, bool(continuous))
+    return _cache.get(key, lambda: _build_wavetable(tables, sampling_rate, continuous))
+#endregion
+
+#region Wavetable Synthesis
+def _start_phases(
+    wavetable: Wavetable,
+    tables: ModemTables,
+    tone_index: NDArray[np.intp],
+    local_symbol: NDArray[np.int64],
+    lengths: NDArray[np.int64],
+    continuous: bool
+) -> NDArray[np.int64]:
+    """Grid phase at which every symbol starts; local_symbol counts symbols from each message start."""
+    steps = wavetable.steps[tone_index]
+    if not continuous:
+        # FSK evaluates every tone on the message's time axis: phase = step * first sample index.
+        num, den = tables.symbol_ratio.numerator, tables.symbol_ratio.denominator
+        return steps * (local_symbol * num // den) % wavetable.grid
+    # CPFSK: exclusive running sum of each symbol's phase advance, restarted with every message.
+    advance = steps * lengths % wavetable.grid
+    phase = np.cumsum(advance) - advance
+    message_starts = np.flatnonzero(local_symbol == 0)
+    message_symbols = np.diff(np.append(message_starts, local_symbol.size))
+    phase -= np.repeat(phase[message_starts], message_symbols)
+    return phase % wavetable.grid
+
+def wavetable_pcm16(
+    tone_index: NDArray[np.intp],
+    tables: ModemTables,
+    wavetable: Wavetable,
+    continuous: bool,
+    local_symbol: Optional[NDArray[np.int64]] = None,
+    out: Optional[NDArray[np.int16]] = None
+) -> NDArray[np.int16]:
+    """
+    Build 16-bit PCM by gathering one template row per symbol, with no sine evaluation.
+
+    Parameters:
+        tone_index: Tone index of every symbol.
+        tables: Modem tables for the tone set and rates.
+        wavetable: Templates from get_wavetable() for the same parameters.
+        continuous: True for CPFSK, False for FSK (must match the wavetable).
+        local_symbol: Index of every symbol within its own message, for several messages laid
+                      end to end (defaults to one message: 0, 1, 2, ...).
+        out: Optional int16 buffer of exactly the output length.
+
+    Returns:
+        The int16 signal (out, if it was given).
+    """
+    tone_index = np.asarray(tone_index, dtype=np.intp)
+    if local_symbol is None:
+        local_symbol = np.arange(tone_index.size, dtype=np.int64)
+    num, den = tables.symbol_ratio.numerator, tables.symbol_ratio.denominator
+    lengths = (local_symbol + 1) * num // den - local_symbol * num // den
+    n_samples = int(lengths.sum())
+    if out is None:
+        out = np.empty(n_samples, dtype=np.int16)
+    elif out.shape != (n_samples,) or out.dtype != np.int16:
+        raise ValueError(f"out must be an int16 array of shape ({n_samples},)")
+    if not tone_index.size:
+        return out
+
+    rows = tone_index * wavetable.grid + _start_phases(wavetable, tables, tone_index, local_symbol, lengths, continuous)
+    if den == 1:
+        # Whole samples per bit: the gathered rows are the output, written in place.
+        np.take(wavetable.templates, rows, axis=0, out=out.reshape(tone_index.size, tables.samples_per_bit))
+    else:
+        # Symbols are floor(R) or floor(R) + 1 samples long: drop the unused last column where needed.
+        gathered = wavetable.templates[rows]
+        out[...] = gathered[np.arange(gathered.shape[1]) < lengths[:, None]]
+    return out
+#endregion
@@ -1,8 +1,13 @@
 # wrapper.py
 import numpy as np
-from .fsk_mod import fsk_modulation_to_base64
-from .cpfsk_mod import cpfsk_modulation_to_base64
+from typing import BinaryIO, Optional, Sequence
+from . import metrics
+from .fsk_mod import fsk_modulation_to_base64, fsk_modulation_to_sink
+from .cpfsk_mod import cpfsk_modulation_to_base64, cpfsk_modulation_to_sink
 from .fsk_demod import fsk_demodulation_from_base64
+from .mfsk import mfsk_modulation_to_base64, cpmfsk_modulation_to_base64, mfsk_demodulation_from_base64
+from .packet import encode_packet, packet_from_base64
+from .sync import frame_payload
 
 #region FSK Wrappers
 def byte_array_to_fsk(
@@ -10,7 +15,12 @@ def byte_array_to_fsk(
     freq0: float,
     freq1: float,
     sampling_rate: float,
-    baud_rate: float
+    baud_rate: float,
+    *,
+    framed: bool = False,
+    container: str = "wav",
+    encoding: str = "pcm16",
+    fec: Optional[str] = None
 ) -> str:
     """
     Convert a byte array into a Base64-encoded FSK modulated WAV audio.
@@ -21,20 +31,79 @@ def byte_array_to_fsk(
         freq1: Carrier frequency for binary 1.
         sampling_rate: Sampling rate in Hz.
         baud_rate: Symbol rate (symbols per second).
+        framed: If True, prepend a preamble, sync word and length header (see sync.frame_payload).
+        container: "wav" for a WAV file, or "raw" for headerless samples.
+        encoding: Sample encoding, "pcm16", "pcm8" or "mulaw" (see audio_format.ENCODINGS).
+        fec: If given, send data as a packet (length header + CRC-32) protected by this FEC
+             code, "none", "hamming74" or "conv" (see packet.encode_packet).
         
     Returns:
         A Base64 encoded WAV audio string representing the FSK modulated signal.
     """
+    if fec is not None:
+        data = encode_packet(data, fec)
+    if framed:
+        data = frame_payload(data)
     # Convert the byte array into a bit sequence.
-    bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8))
-    return fsk_modulation_to_base64(bits, freq0, freq1, sampling_rate, baud_rate)
+    with metrics.stage("unpackbits") as timer:
+        bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8))
+        timer.count(nbytes=len(data))
+    return fsk_modulation_to_base64(bits, freq0, freq1, sampling_rate, baud_rate, container, encoding)
+
+def byte_array_to_fsk_sink(
+    data: bytes,
+    sink: BinaryIO,
+    freq0: float,
+    freq1: float,
+    sampling_rate: float,
+    baud_rate: float,
+    *,
+    framed: bool = False,
+    container: str = "wav",
+    encoding: str = "pcm16",
+    fec: Optional[str] = None
+) -> int:
+    """
+    Convert a byte array into FSK modulated audio written directly to a binary sink.
+    
+    Parameters:
+        data: Input byte array.
+        sink: Writable binary object (open file, socket file, BytesIO, ...).
+        freq0: Carrier frequency for binary 0.
+        freq1: Carrier frequency for binary 1.
+        sampling_rate: Sampling rate in Hz.
+        baud_rate: Symbol rate (symbols per second).
+        framed: If True, prepend a preamble, sync word and length header (see sync.frame_payload).
+        container: "wav" for a WAV file, or "raw" for headerless samples.
+        encoding: Sample encoding, "pcm16", "pcm8" or "mulaw" (see audio_format.ENCODINGS).
+        fec: If given, send data as a packet (length header + CRC-32) protected by this FEC
+             code, "none", "hamming74" or "conv" (see packet.encode_packet).
+        
+    Returns:
+        The number of bytes written to the sink.
+    """
+    if fec is not None:
+        data = encode_packet(data, fec)
+    if framed:
+        data = frame_payload(data)
+    # Convert the byte array into a bit sequence.
+    with metrics.stage("unpackbits") as timer:
+        bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8))
+        timer.count(nbytes=len(data))
+    return fsk_modulation_to_sink(bits, sink, freq0, freq1, sampling_rate, baud_rate, container, encoding=encoding)
 
 def fsk_to_byte_array(
     audio_base64: str,
     freq0: float,
     freq1: float,
     sampling_rate: float,
-    baud_rate: float
+    baud_rate: float,
+    container: str = "wav",
+    encoding: str = "pcm16",
+    fec: Optional[str] = None,
+    method: str = "correlate",
+    channel: Optional[int] = None,
+    decimate: Optional[bool] = None
 ) -> bytes:
     """
     Convert a Base64-encoded FSK modulated WAV audio back to its original byte array.
@@ -45,11 +114,23 @@ def fsk_to_byte_array(
         freq1: Carrier frequency for binary 1.
         sampling_rate: Sampling rate in Hz.
         baud_rate: Symbol rate (symbols per second).
+        container: "wav" (any encoding, read from the header) or "raw" for headerless samples.
+        encoding: Sample encoding of raw audio, "pcm16", "pcm8" or "mulaw"; ignored for WAV.
+        fec: FEC code of a packet sent with fec=...; the packet is decoded from soft symbol
+             decisions and its CRC-32 verified (raises packet.PacketError on failure).
+        method: Demodulation backend, "correlate", "goertzel" or "fft" (see fsk_demodulation).
+        channel: Channel of multichannel WAV audio to demodulate, or None for the average of all.
+        decimate: Resample to the lowest rate that keeps the tones first (see
+                  fsk_demod.fsk_demodulation_from_base64).
         
     Returns:
         The recovered byte array.
     """
-    return fsk_demodulation_from_base64(audio_base64, sampling_rate, baud_rate, freq0, freq1)
+    if fec is not None:
+        return packet_from_base64(audio_base64, sampling_rate, baud_rate, freq0, freq1, fec, method, container, encoding,
+                                  channel, decimate)
+    return fsk_demodulation_from_base64(audio_base64, sampling_rate, baud_rate, freq0, freq1, method, container, encoding,
+                                        channel, decimate)
 #endregion
 
 #region CPFSK Wrappers
@@ -58,7 +139,12 @@ def byte_array_to_cpfsk(
     freq0: float,
     freq1: float,
     sampling_rate: float,
-    baud_rate: float
+    baud_rate: float,
+    *,
+    framed: bool = False,
+    container: str = "wav",
+    encoding: str = "pcm16",
+    fec: Optional[str] = None
 ) -> str:
     """
     Convert a byte array into a Base64-encoded CPFSK modulated WAV audio.
@@ -69,20 +155,79 @@ def byte_array_to_cpfsk(
         freq1: Carrier frequency for binary 1.
         sampling_rate: Sampling rate in Hz.
         baud_rate: Symbol rate (symbols per second).
+        framed: If True, prepend a preamble, sync word and length header (see sync.frame_payload).
+        container: "wav" for a WAV file, or "raw" for headerless samples.
+        encoding: Sample encoding, "pcm16", "pcm8" or "mulaw" (see audio_format.ENCODINGS).
+        fec: If given, send data as a packet (length header + CRC-32) protected by this FEC
+             code, "none", "hamming74" or "conv" (see packet.encode_packet).
         
     Returns:
         A Base64 encoded WAV audio string representing the CPFSK modulated signal.
     """
+    if fec is not None:
+        data = encode_packet(data, fec)
+    if framed:
+        data = frame_payload(data)
+    # Convert the byte array into a bit sequence.
+    with metrics.stage("unpackbits") as timer:
+        bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8))
+        timer.count(nbytes=len(data))
+    return cpfsk_modulation_to_base64(bits, freq0, freq1, sampling_rate, baud_rate, container, encoding)
+
+def byte_array_to_cpfsk_sink(
+    data: bytes,
+    sink: BinaryIO,
+    freq0: float,
+    freq1: float,
+    sampling_rate: float,
+    baud_rate: float,
+    *,
+    framed: bool = False,
+    container: str = "wav",
+    encoding: str = "pcm16",
+    fec: Optional[str] = None
+) -> int:
+    """
+    Convert a byte array into CPFSK modulated audio written directly to a binary sink.
+    
+    Parameters:
+        data: Input byte array.
+        sink: Writable binary object (open file, socket file, BytesIO, ...).
+        freq0: Carrier frequency for binary 0.
+        freq1: Carrier frequency for binary 1.
+        sampling_rate: Sampling rate in Hz.
+        baud_rate: Symbol rate (symbols per second).
+        framed: If True, prepend a preamble, sync word and length header (see sync.frame_payload).
+        container: "wav" for a WAV file, or "raw" for headerless samples.
+        encoding: Sample encoding, "pcm16", "pcm8" or "mulaw" (see audio_format.ENCODINGS).
+        fec: If given, send data as a packet (length header + CRC-32) protected by this FEC
+             code, "none", "hamming74" or "conv" (see packet.encode_packet).
+        
+    Returns:
+        The number of bytes written to the sink.
+    """
+    if fec is not None:
+        data = encode_packet(data, fec)
+    if framed:
+        data = frame_payload(data)
     # Convert the byte array into a bit sequence.
-    bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8))
-    return cpfsk_modulation_to_base64(bits, freq0, freq1, sampling_rate, baud_rate)
+    with metrics.stage("unpackbits") as timer:
+        bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8))
+        timer.count(nbytes=len(data))
+    return cpfsk_modulation_to_sink(bits, sink, freq0, freq1, sampling_rate, baud_rate, container, encoding=encoding)
 
 def cpfsk_to_byte_array(
     audio_base64: str,
     freq0: float,
     freq1: float,
     sampling_rate: float,
-    baud_rate: float
+    baud_rate: float,
+    container: str = "wav",
+    encoding: str = "pcm16",
+    fec: Optional[str] = None,
+    method: str = "correlate",
+    channel: Optional[int] = None,
+    decimate: Optional[bool] = None
 ) -> bytes:
     """
     Convert a Base64-encoded CPFSK modulated WAV audio back to its original byte array.
@@ -93,10 +238,145 @@ def cpfsk_to_byte_array(
         freq1: Carrier frequency for binary 1.
         sampling_rate: Sampling rate in Hz.
         baud_rate: Symbol rate (symbols per second).
+        container: "wav" (any encoding, read from the header) or "raw" for headerless samples.
+        encoding: Sample encoding of raw audio, "pcm16", "pcm8" or "mulaw"; ignored for WAV.
+        fec: FEC code of a packet sent with fec=...; the packet is decoded from soft symbol
+             decisions and its CRC-32 verified (raises packet.PacketError on failure).
+        method: Demodulation backend, "correlate", "goertzel" or "fft" (see fsk_demodulation).
+        channel: Channel of multichannel WAV audio to demodulate, or None for the average of all.
+        decimate: Resample to the lowest rate that keeps the tones first (see
+                  fsk_demod.fsk_demodulation_from_base64).
         
     Returns:
         The recovered byte array.
     """
     # In this implementation we use the same demodulation function since the receiver treats both modulations similarly.
-    return fsk_demodulation_from_base64(audio_base64, sampling_rate, baud_rate, freq0, freq1)
+    if fec is not None:
+        return packet_from_base64(audio_base64, sampling_rate, baud_rate, freq0, freq1, fec, method, container, encoding,
+                                  channel, decimate)
+    return fsk_demodulation_from_base64(audio_base64, sampling_rate, baud_rate, freq0, freq1, method, container, encoding,
+                                        channel, decimate)
+#endregion
+
+#region M-ary FSK Wrappers
+def byte_array_to_mfsk(
+    data: bytes,
+    freqs: Sequence[float],
+    sampling_rate: float,
+    baud_rate: float,
+    container: str = "wav",
+    encoding: str = "pcm16"
+) -> str:
+    """
+    Convert a byte array into a Base64-encoded M-ary FSK modulated WAV audio.
+    
+    Parameters:
+        data: Input byte array.
+        freqs: M tone frequencies (Hz), M a power of two; each symbol carries log2(M) bits.
+        sampling_rate: Sampling rate in Hz.
+        baud_rate: Symbol rate (symbols per second).
+        container: "wav" for a WAV file, or "raw" for headerless samples.
+        encoding: Sample encoding, "pcm16", "pcm8" or "mulaw" (see audio_format.ENCODINGS).
+        
+    Returns:
+        A Base64 encoded WAV audio string representing the M-ary FSK modulated signal.
+    """
+    # Convert the byte array into a bit sequence.
+    with metrics.stage("unpackbits") as timer:
+        bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8))
+        timer.count(nbytes=len(data))
+    return mfsk_modulation_to_base64(bits, freqs, sampling_rate, baud_rate, container, encoding)
+
+def mfsk_to_byte_array(
+    audio_base64: str,
+    freqs: Sequence[float],
+    sampling_rate: float,
+    baud_rate: float,
+    container: str = "wav",
+    encoding: str = "pcm16",
+    method: str = "correlate",
+    channel: Optional[int] = None,
+    decimate: Optional[bool] = None
+) -> bytes:
+    """
+    Convert a Base64-encoded M-ary FSK modulated WAV audio back to its original byte array.
+    
+    Parameters:
+        audio_base64: Base64 encoded WAV audio.
+        freqs: The M tone frequencies (Hz) used by the transmitter, in the same order.
+        sampling_rate: Sampling rate in Hz.
+        baud_rate: Symbol rate (symbols per second).
+        container: "wav" (any encoding, read from the header) or "raw" for headerless samples.
+        encoding: Sample encoding of raw audio, "pcm16", "pcm8" or "mulaw"; ignored for WAV.
+        method: Demodulation backend, "correlate", "goertzel" or "fft" (see fsk_demod.fsk_magnitudes).
+        channel: Channel of multichannel WAV audio to demodulate, or None for the average of all.
+        decimate: Resample to the lowest rate that keeps the tones first (see
+                  fsk_demod.fsk_demodulation_from_base64).
+        
+    Returns:
+        The recovered byte array.
+    """
+    return mfsk_demodulation_from_base64(audio_base64, sampling_rate, baud_rate, freqs, method, container, encoding,
+                                         channel, decimate)
+
+def byte_array_to_cpmfsk(
+    data: bytes,
+    freqs: Sequence[float],
+    sampling_rate: float,
+    baud_rate: float,
+    container: str = "wav",
+    encoding: str = "pcm16"
+) -> str:
+    """
+    Convert a byte array into a Base64-encoded continuous-phase M-ary FSK modulated WAV audio.
+    
+    Parameters:
+        data: Input byte array.
+        freqs: M tone frequencies (Hz), M a power of two; each symbol carries log2(M) bits.
+        sampling_rate: Sampling rate in Hz.
+        baud_rate: Symbol rate (symbols per second).
+        container: "wav" for a WAV file, or "raw" for headerless samples.
+        encoding: Sample encoding, "pcm16", "pcm8" or "mulaw" (see audio_format.ENCODINGS).
+        
+    Returns:
+        A Base64 encoded WAV audio string representing the CP-MFSK modulated signal.
+    """
+    # Convert the byte array into a bit sequence.
+    with metrics.stage("unpackbits") as timer:
+        bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8))
+        timer.count(nbytes=len(data))
+    return cpmfsk_modulation_to_base64(bits, freqs, sampling_rate, baud_rate, container, encoding)
+
+def cpmfsk_to_byte_array(
+    audio_base64: str,
+    freqs: Sequence[float],
+    sampling_rate: float,
+    baud_rate: float,
+    container: str = "wav",
+    encoding: str = "pcm16",
+    method: str = "correlate",
+    channel: Optional[int] = None,
+    decimate: Optional[bool] = None
+) -> bytes:
+    """
+    Convert a Base64-encoded CP-MFSK modulated WAV audio back to its original byte array.
+    
+    Parameters:
+        audio_base64: Base64 encoded WAV audio.
+        freqs: The M tone frequencies (Hz) used by the transmitter, in the same order.
+        sampling_rate: Sampling rate in Hz.
+        baud_rate: Symbol rate (symbols per second).
+        container: "wav" (any encoding, read from the header) or "raw" for headerless samples.
+        encoding: Sample encoding of raw audio, "pcm16", "pcm8" or "mulaw"; ignored for WAV.
+        method: Demodulation backend, "correlate", "goertzel" or "fft" (see fsk_demod.fsk_magnitudes).
+        channel: Channel of multichannel WAV audio to demodulate, or None for the average of all.
+        decimate: Resample to the lowest rate that keeps the tones first (see
+                  fsk_demod.fsk_demodulation_from_base64).
+        
+    Returns:
+        The recovered byte array.
+    """
+    # The receiver treats both modulations the same way, as for binary CPFSK.
+    return mfsk_demodulation_from_base64(audio_base64, sampling_rate, baud_rate, freqs, method, container, encoding,
+                                         channel, decimate)
 #endregion
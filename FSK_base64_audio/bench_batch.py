@@ -0,0 +1,77 @@
+# bench_batch.py
+import base64
+import time
+import numpy as np
+from FSK_v2 import (
+    byte_array_to_fsk,
+    fsk_to_byte_array,
+    byte_array_to_cpfsk,
+    cpfsk_to_byte_array,
+    byte_arrays_to_fsk,
+    fsk_to_byte_arrays,
+    byte_arrays_to_cpfsk,
+    cpfsk_to_byte_arrays,
+)
+
+#region Define Parameters
+sampling_rate = 44100.0  # Samples per second (Hz)
+baud_rate = 300.0        # Symbols per second (baud rate)
+freq0 = 1200.0           # Carrier frequency for bit 0
+freq1 = 2200.0           # Carrier frequency for bit 1
+num_messages = 2000      # Messages per batch
+message_size = 16        # Bytes per message
+repeats = 3              # Timing runs per measurement (best is kept)
+#endregion
+
+# What batching can and cannot save: the single-message wrappers are already vectorized per
+# message, so a batch only removes per-message overhead and shares work between messages.
+# - FSK encode synthesizes each tone once for the whole batch and selects between them per row.
+# - CPFSK encode with the "sin" engine integrates the phase and evaluates np.sin per sample
+#   exactly like the wrapper (that is what makes its output identical), so it runs at loop
+#   speed; engine="wavetable" is the fast batch encoder for CPFSK.
+# - Decode is bounded by Base64 decoding, which stays per message: the "Base64 alone" column
+#   is the ceiling for any decoder of these strings.
+modulations = {
+    "fsk": (byte_array_to_fsk, byte_arrays_to_fsk, fsk_to_byte_array, fsk_to_byte_arrays),
+    "cpfsk": (byte_array_to_cpfsk, byte_arrays_to_cpfsk, cpfsk_to_byte_array, cpfsk_to_byte_arrays),
+}
+
+def best_of(func) -> tuple[float, object]:
+    """Run func a few times and return the fastest wall time and the last result."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def rate(seconds: float) -> str:
+    return f"{num_messages / seconds:>8,.0f} msg/s"
+
+def main():
+    rng = np.random.default_rng(0)
+    payloads = [rng.integers(0, 256, message_size, dtype=np.uint8).tobytes() for _ in range(num_messages)]
+    modem = (freq0, freq1, sampling_rate, baud_rate)
+
+    print(f"{num_messages} messages of {message_size} bytes; speedups are over a loop of the single-message wrappers")
+    for name, (encode_one, encode_many, decode_one, decode_many) in modulations.items():
+        loop_encode, looped = best_of(lambda: [encode_one(p, *modem) for p in payloads])
+        batch_encode, batched = best_of(lambda: encode_many(payloads, *modem))
+        assert batched == looped
+        wavetable_encode, _ = best_of(lambda: encode_many(payloads, *modem, engine="wavetable"))
+        wav_files = [base64.b64decode(audio) for audio in looped]
+        base64_encode, _ = best_of(lambda: [base64.b64encode(wav).decode('ascii') for wav in wav_files])
+
+        loop_decode, decoded = best_of(lambda: [decode_one(audio, *modem) for audio in looped])
+        batch_decode, batch_decoded = best_of(lambda: decode_many(looped, *modem))
+        assert batch_decoded == decoded == payloads
+        base64_decode, _ = best_of(lambda: [base64.b64decode(audio) for audio in looped])
+
+        print(f"{name:>5} encode: loop {rate(loop_encode)} | batch {rate(batch_encode)} {loop_encode / batch_encode:4.1f}x"
+              f" | batch wavetable {rate(wavetable_encode)} {loop_encode / wavetable_encode:4.1f}x"
+              f" | Base64 alone {rate(base64_encode)}")
+        print(f"{name:>5} decode: loop {rate(loop_decode)} | batch {rate(batch_decode)} {loop_decode / batch_decode:4.1f}x"
+              f" | Base64 alone {rate(base64_decode)} (at most {loop_decode / base64_decode:.1f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+# bench_channel.py
+import os
+import time
+from FSK_v2.channel import ber_curves, noncoherent_bfsk_ber
+
+#region Define Parameters
+sampling_rate = 44100.0                         # Samples per second (Hz)
+baud_rate = 1200.0                              # Symbols per second (baud rate)
+freq0 = 1200.0                                  # Carrier frequency for bit 0
+freq1 = 2200.0                                  # Carrier frequency for bit 1 (Bell 202, not orthogonal at 1200 baud)
+ebn0_db = [0.0, 2.0, 4.0, 6.0, 8.0, 10.0, 12.0] # Eb/N0 points (dB)
+frames = 500                                    # Frames per point
+frame_bits = 256                                # Bits per frame
+seed = 2024                                     # Fixed seed: every run prints the same curves
+workers = os.cpu_count() or 1                   # Processes across Eb/N0 points
+impairments = {                                 # Channel conditions to compare
+    "AWGN only": {},
+    "AWGN + 100 Hz offset": {"freq_offset": 100.0},
+    "AWGN + 0.5 sample jitter": {"jitter": 0.5},
+}
+#endregion
+
+def main():
+    theory = noncoherent_bfsk_ber(ebn0_db)
+    print(f"{frames} frames x {frame_bits} bits per point, seed {seed}, {workers} workers")
+    for label, kwargs in impairments.items():
+        start = time.perf_counter()
+        curves = ber_curves(ebn0_db, sampling_rate, baud_rate, freq0, freq1,
+                            frames=frames, frame_bits=frame_bits, seed=seed, workers=workers, **kwargs)
+        elapsed = time.perf_counter() - start
+        n_bits = sum(curve.bits * len(ebn0_db) for curve in curves.values())
+        print(f"\n{label} ({n_bits / elapsed / 1e6:.1f} Mbit/s simulated)")
+        print(f"{'Eb/N0 dB':<20} " + " ".join(f"{point:>8g}" for point in ebn0_db))
+        print(f"{'theory (orthogonal)':<20} " + " ".join(f"{ber:>8.1e}" for ber in theory))
+        for (modulation, method), curve in curves.items():
+            print(f"{f'{modulation}/{method} BER':<20} " + " ".join(f"{ber:>8.1e}" for ber in curve.ber))
+            print(f"{f'{modulation}/{method} FER':<20} " + " ".join(f"{fer:>8.1e}" for fer in curve.fer))
+
+if __name__ == "__main__":
+    main()
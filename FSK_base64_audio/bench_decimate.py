@@ -0,0 +1,62 @@
+# bench_decimate.py
+import time
+import numpy as np
+from FSK_v2.cpfsk_mod import cpfsk_modulation
+from FSK_v2.fsk_demod import fsk_demodulation, fsk_magnitudes
+from FSK_v2.fsk_mod import fsk_modulation
+from FSK_v2.resample import demodulation_rate, resample_for_demodulation
+
+#region Define Parameters
+captures = [(44100.0, 300.0), (48000.0, 300.0), (48000.0, 1200.0)]  # (sampling rate, baud rate)
+tone_sets = {
+    "2 tones": (1200.0, 2200.0),
+    "8 tones": tuple(1200.0 + 200.0 * np.arange(8)),
+}
+methods = ["correlate", "goertzel", "fft"]
+signal_seconds = 60.0                       # Length of the timed signal
+ber_bits = 200_000                          # Bits per bit error rate measurement
+eb_n0_db = 9.0                              # Channel Eb/N0 of the bit error rate check
+repeats = 3                                 # Timing runs per configuration (best is kept)
+#endregion
+
+def best_of(func) -> float:
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"Demodulation time over {signal_seconds:g} s of audio: full rate -> resample + demodulate at the reduced rate")
+    for sampling_rate, baud_rate in captures:
+        signal = rng.normal(0.0, 1.0, int(signal_seconds * sampling_rate)).astype(np.float32)
+        for name, freqs in tone_sets.items():
+            up, down = demodulation_rate(sampling_rate, baud_rate, freqs)
+            reduced, rate = resample_for_demodulation(signal, sampling_rate, baud_rate, freqs)
+            resample_time = best_of(lambda: resample_for_demodulation(signal, sampling_rate, baud_rate, freqs))
+            cells = []
+            for method in methods:
+                full = best_of(lambda: fsk_magnitudes(signal, sampling_rate, baud_rate, freqs, method))
+                decimated = best_of(lambda: fsk_magnitudes(reduced, rate, baud_rate, freqs, method))
+                cells.append(f"{method} {full:.3f} -> {resample_time:.3f} + {decimated:.3f} s")
+            print(f"{sampling_rate:>7.0f} Hz {baud_rate:>5.0f} baud {name}: {up}/{down} to {rate:.0f} Hz "
+                  f"({rate / baud_rate:.0f} samples/bit) | " + " | ".join(cells))
+
+    print(f"\nBit error rate at Eb/N0 = {eb_n0_db:g} dB, full rate vs decimated (correlate)")
+    for sampling_rate, baud_rate in captures:
+        for modulate in (fsk_modulation, cpfsk_modulation):
+            bits = rng.integers(0, 2, ber_bits)
+            clean, _ = modulate(bits, 1200.0, 2200.0, sampling_rate, baud_rate)
+            # Symbol energy is samples_per_bit / 2 for a unit-amplitude tone.
+            sigma = np.sqrt(sampling_rate / baud_rate / 4 / 10 ** (eb_n0_db / 10))
+            received = (clean + rng.normal(0.0, sigma, clean.size)).astype(np.float32)
+            full = fsk_demodulation(received, sampling_rate, baud_rate, 1200.0, 2200.0)[: bits.size]
+            reduced, rate = resample_for_demodulation(received, sampling_rate, baud_rate, (1200.0, 2200.0))
+            decimated = fsk_demodulation(reduced, rate, baud_rate, 1200.0, 2200.0)[: bits.size]
+            print(f"{sampling_rate:>7.0f} Hz {baud_rate:>5.0f} baud {modulate.__name__:>16}: "
+                  f"{np.mean(full != bits):.5f} full rate, {np.mean(decimated != bits):.5f} at {rate:.0f} Hz")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# bench_demod.py
+import time
+import numpy as np
+from numpy.typing import NDArray
+from FSK_v2.cpfsk_mod import cpfsk_modulation
+from FSK_v2.fsk_demod import fsk_demodulation
+
+#region Define Parameters
+sampling_rate = 44100.0  # Samples per second (Hz)
+baud_rate = 300.0        # Symbols per second (baud rate)
+freq0 = 1200.0           # Carrier frequency for bit 0
+freq1 = 2200.0           # Carrier frequency for bit 1
+payload_sizes = [64, 1024, 16384]  # Payload sizes in bytes
+#endregion
+
+#region Reference Per-Symbol Loop
+def fsk_demodulation_loop(
+    modulated_signal: NDArray[np.float_],
+    sampling_rate: float,
+    baud_rate: float,
+    freq0: float,
+    freq1: float
+) -> NDArray[np.uint8]:
+    """
+    The original per-symbol demodulator, kept here as the baseline for the benchmark.
+    """
+    samples_per_bit = int(sampling_rate / baud_rate)
+    num_symbols = len(modulated_signal) // samples_per_bit
+    bits = np.empty(num_symbols, dtype=np.uint8)
+    t_symbol = np.arange(samples_per_bit) / sampling_rate
+
+    for i in range(num_symbols):
+        chunk = modulated_signal[i * samples_per_bit : (i + 1) * samples_per_bit]
+        I0 = np.dot(chunk, np.cos(2 * np.pi * freq0 * t_symbol))
+        Q0 = np.dot(chunk, np.sin(2 * np.pi * freq0 * t_symbol))
+        mag0 = np.sqrt(I0**2 + Q0**2)
+        I1 = np.dot(chunk, np.cos(2 * np.pi * freq1 * t_symbol))
+        Q1 = np.dot(chunk, np.sin(2 * np.pi * freq1 * t_symbol))
+        mag1 = np.sqrt(I1**2 + Q1**2)
+        bits[i] = 0 if mag0 > mag1 else 1
+
+    return bits
+#endregion
+
+def best_of(func, *args, repeats: int = 3) -> tuple[float, NDArray[np.uint8]]:
+    """Run func(*args) a few times and return the fastest wall time and the last result."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'bytes':>8} {'symbols':>9} {'loop sym/s':>14} {'block sym/s':>14} {'speedup':>9} {'goertzel sym/s':>15}")
+    for size in payload_sizes:
+        bits = np.unpackbits(rng.integers(0, 256, size, dtype=np.uint8))
+        signal, _ = cpfsk_modulation(bits, freq0, freq1, sampling_rate, baud_rate)
+        signal = (signal * 32767).astype(np.int16).astype(np.float32) / 32767.0
+
+        loop_time, loop_bits = best_of(fsk_demodulation_loop, signal, sampling_rate, baud_rate, freq0, freq1)
+        block_time, block_bits = best_of(fsk_demodulation, signal, sampling_rate, baud_rate, freq0, freq1)
+        goertzel_time, goertzel_bits = best_of(fsk_demodulation, signal, sampling_rate, baud_rate, freq0, freq1, "goertzel")
+        assert np.array_equal(loop_bits, block_bits), "block engine disagrees with the loop"
+        assert np.array_equal(loop_bits, goertzel_bits), "goertzel backend disagrees with the loop"
+
+        n = bits.size
+        print(f"{size:>8} {n:>9} {n / loop_time:>14,.0f} {n / block_time:>14,.0f} {loop_time / block_time:>8.1f}x {n / goertzel_time:>15,.0f}")
+
+if __name__ == "__main__":
+    main()
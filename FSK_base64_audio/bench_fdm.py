@@ -0,0 +1,46 @@
+# bench_fdm.py
+import time
+import numpy as np
+from FSK_v2 import fdm_tone_plan, byte_arrays_to_fdm, fdm_to_byte_arrays
+from FSK_v2.fdm import fdm_soft_demodulation
+from FSK_v2.fsk_demod import _signal_from_base64, fsk_soft_demodulation
+
+#region Define Parameters
+sampling_rate = 44100.0                 # Samples per second (Hz)
+baud_rate = 300.0                       # Symbols per second per channel
+payload_size = 1024                     # Bytes per channel
+channel_counts = [1, 2, 4, 8, 16, 32]   # Channels summed into one WAV
+repeats = 3                             # Timing runs per configuration (best is kept)
+#endregion
+
+def best_of(func) -> float:
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{payload_size}-byte payload per channel, {baud_rate:.0f} baud CPFSK per channel")
+    print(f"{'channels':>8} {'airtime s':>10} {'bit/s on air':>13} {'encode s':>9} {'decode s':>9} "
+          f"{'rfft demod s':>13} {'per-channel demod s':>20}")
+    for n_channels in channel_counts:
+        payloads = [rng.integers(0, 256, payload_size, dtype=np.uint8).tobytes() for _ in range(n_channels)]
+        tones = fdm_tone_plan(n_channels, sampling_rate, baud_rate)
+        audio = byte_arrays_to_fdm(payloads, sampling_rate, baud_rate, tones)
+        assert fdm_to_byte_arrays(audio, sampling_rate, baud_rate, tones) == payloads
+        signal, _ = _signal_from_base64(audio, "wav", "pcm16")
+        airtime = signal.size / sampling_rate
+
+        encode = best_of(lambda: byte_arrays_to_fdm(payloads, sampling_rate, baud_rate, tones))
+        decode = best_of(lambda: fdm_to_byte_arrays(audio, sampling_rate, baud_rate, tones))
+        rfft_demod = best_of(lambda: fdm_soft_demodulation(signal, sampling_rate, baud_rate, tones))
+        # The alternative receiver: one two-tone correlator pass over the whole signal per channel.
+        per_channel = best_of(lambda: [fsk_soft_demodulation(signal, sampling_rate, baud_rate, f0, f1) for f0, f1 in tones])
+        print(f"{n_channels:>8} {airtime:>10.2f} {8 * payload_size * n_channels / airtime:>13.0f} {encode:>9.3f} "
+              f"{decode:>9.3f} {rfft_demod:>13.4f} {per_channel:>20.4f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# bench_fec.py
+import numpy as np
+from FSK_v2 import encode_packet, decode_packet, PacketError
+from FSK_v2.cpfsk_mod import cpfsk_modulation
+from FSK_v2.fsk_demod import fsk_soft_demodulation
+
+#region Define Parameters
+sampling_rate = 44100.0                 # Samples per second (Hz)
+baud_rate = 1200.0                      # Symbols per second (baud rate)
+freq0 = 1200.0                          # Carrier frequency for bit 0
+freq1 = 2200.0                          # Carrier frequency for bit 1
+payload_size = 128                      # Bytes per packet
+trials = 40                             # Packets sent per configuration
+snrs_db = [3.0, 0.0, -3.0, -5.0, -7.0]   # Per-sample channel SNRs (dB)
+#endregion
+
+def goodput(fec: str, snr_db: float, soft_decisions: bool, rng: np.random.Generator) -> tuple[float, float]:
+    """Return (delivered payload bits per second of airtime, packet success rate) over AWGN."""
+    delivered = 0
+    airtime = 0.0
+    for _ in range(trials):
+        data = rng.integers(0, 256, payload_size, dtype=np.uint8).tobytes()
+        packet = encode_packet(data, fec)
+        signal, _ = cpfsk_modulation(np.unpackbits(np.frombuffer(packet, dtype=np.uint8)), freq0, freq1, sampling_rate, baud_rate)
+        noise_rms = np.sqrt(np.mean(signal ** 2) / 10 ** (snr_db / 10))
+        soft = fsk_soft_demodulation(signal + rng.normal(0.0, noise_rms, signal.size), sampling_rate, baud_rate, freq0, freq1)
+        if not soft_decisions:
+            soft = np.sign(soft)
+        airtime += signal.size / sampling_rate
+        try:
+            delivered += decode_packet(soft, fec) == data
+        except PacketError:
+            pass
+    return delivered * 8 * payload_size / airtime, delivered / trials
+
+def main():
+    configs = [("none", True), ("hamming74", False), ("hamming74", True), ("conv", False), ("conv", True)]
+    print(f"goodput in payload bit/s ({payload_size}-byte packets, {baud_rate:.0f} baud CPFSK, success rate in brackets)")
+    print(f"{'fec':<18} " + " ".join(f"{f'{snr:g} dB':>14}" for snr in snrs_db))
+    for fec, soft_decisions in configs:
+        label = f"{fec} ({'soft' if soft_decisions else 'hard'})" if fec != "none" else "none (CRC only)"
+        cells = []
+        for snr in snrs_db:
+            rate, success = goodput(fec, snr, soft_decisions, np.random.default_rng(0))
+            cells.append(f"{rate:>7.0f} ({success:>4.0%})")
+        print(f"{label:<18} " + " ".join(f"{cell:>14}" for cell in cells))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# bench_fft_demod.py
+import time
+from typing import Optional
+import numpy as np
+from FSK_v2.fsk_demod import symbol_magnitudes, fft_size
+from FSK_v2.tables import get_tables
+
+#region Define Parameters
+sampling_rate = 44100.0                     # Samples per second (Hz)
+baud_rates = [1200.0, 300.0, 100.0, 30.0]   # 36, 147, 441 and 1470 samples per bit
+tone_counts = [2, 4, 8, 16, 32, 64, 128]    # Tones per symbol (M-ary alphabet size)
+low, high = 510.0, 15010.0                  # Band the tones are spread over (Hz)
+signal_seconds = 20.0                       # Length of the demodulated signal
+repeats = 3                                 # Timing runs per configuration (best is kept)
+#endregion
+
+def best_of(func) -> float:
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def tone_set(n_tones: int, baud_rate: float, on_grid: bool) -> Optional[tuple[float, ...]]:
+    """n_tones tones across the band, snapped to the symbol's FFT bins if on_grid (None if they do not fit)."""
+    freqs = np.linspace(low, high, n_tones)
+    if not on_grid:
+        return tuple(freqs)
+    spacing = sampling_rate / get_tables((), sampling_rate, baud_rate).samples_per_bit
+    bins = np.unique(np.rint(freqs / spacing))
+    return tuple(bins * spacing) if bins.size == n_tones else None
+
+def main():
+    rng = np.random.default_rng(0)
+    signal = rng.normal(0.0, 1.0, int(signal_seconds * sampling_rate))
+    print(f"correlate / fft demodulation time over {signal_seconds:g} s of audio (>1 means fft is faster)")
+    for on_grid in (False, True):
+        print(f"\ntones {'on' if on_grid else 'between'} FFT bins")
+        print(f"{'samples/bit':>11} {'n_fft':>6} " + " ".join(f"{f'{n} tones':>10}" for n in tone_counts) + f" {'crossover':>12}")
+        for baud_rate in baud_rates:
+            cells = []
+            crossover = None
+            n_fft = None
+            for n_tones in tone_counts:
+                freqs = tone_set(n_tones, baud_rate, on_grid)
+                if freqs is None:
+                    cells.append(f"{'-':>10}")
+                    continue
+                tables = get_tables(freqs, sampling_rate, baud_rate)
+                correlate = best_of(lambda: symbol_magnitudes(signal, tables, "correlate"))
+                fft = best_of(lambda: symbol_magnitudes(signal, tables, "fft"))
+                if crossover is None and fft < correlate:
+                    crossover = n_tones
+                cells.append(f"{correlate / fft:>9.2f}x")
+                n_fft = fft_size(tables.samples_per_bit, tables.phase_increments)
+            label = f">= {crossover} tones" if crossover else "never"
+            print(f"{tables.samples_per_bit:>11} {n_fft:>6} " + " ".join(cells) + f" {label:>12}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# bench_formats.py
+import numpy as np
+from FSK_v2 import byte_array_to_cpfsk, cpfsk_to_byte_array
+from FSK_v2.cpfsk_mod import cpfsk_modulation
+from FSK_v2.fsk_demod import fsk_demodulation, pcm16_to_float
+from FSK_v2.audio_format import ENCODINGS, encode_samples, decode_samples
+
+#region Define Parameters
+sampling_rate = 44100.0            # Samples per second (Hz)
+baud_rate = 1200.0                 # Symbols per second (baud rate)
+freq0 = 1200.0                     # Carrier frequency for bit 0
+freq1 = 2200.0                     # Carrier frequency for bit 1
+payload_size = 4096                # Bytes per message
+amplitudes = [1.0, 0.1, 0.01]      # Signal levels relative to full scale
+snrs_db = [12.0, 6.0, 3.0, 0.0]    # Channel SNRs (dB) for the bit error rate comparison
+#endregion
+
+def quantization_snr(signal: np.ndarray, encoding: str) -> float:
+    """SNR (dB) of a float signal after a 16-bit + encoding round trip."""
+    pcm = (signal * 32767).astype(np.int16)
+    decoded = pcm16_to_float(decode_samples(encode_samples(pcm, encoding).tobytes(), encoding))
+    noise = decoded - signal
+    return 10 * np.log10(np.mean(signal ** 2) / np.mean(noise ** 2))
+
+def bit_error_rate(signal: np.ndarray, bits: np.ndarray, encoding: str, snr_db: float, rng: np.random.Generator) -> float:
+    """BER after adding white noise at snr_db, quantizing to 16 bits and round-tripping through the encoding."""
+    noise_rms = np.sqrt(np.mean(signal ** 2) / 10 ** (snr_db / 10))
+    received = signal + rng.normal(0.0, noise_rms, signal.size)
+    # Scale the noisy signal into range like an AGC would before the encoder.
+    received *= 0.9 / np.abs(received).max()
+    pcm = (received * 32767).astype(np.int16)
+    decoded = pcm16_to_float(decode_samples(encode_samples(pcm, encoding).tobytes(), encoding))
+    return float(np.mean(fsk_demodulation(decoded, sampling_rate, baud_rate, freq0, freq1) != bits))
+
+def main():
+    rng = np.random.default_rng(0)
+    payload = rng.integers(0, 256, payload_size, dtype=np.uint8).tobytes()
+    bits = np.unpackbits(np.frombuffer(payload, dtype=np.uint8))
+    signal, _ = cpfsk_modulation(bits, freq0, freq1, sampling_rate, baud_rate)
+
+    reference = None
+    print(f"{'encoding':<9} {'container':<9} {'base64 bytes':>13} {'vs pcm16 wav':>13} {'round trip':>11}")
+    for encoding in ENCODINGS:
+        for container in ("wav", "raw"):
+            audio = byte_array_to_cpfsk(payload, freq0, freq1, sampling_rate, baud_rate, container=container, encoding=encoding)
+            reference = reference or len(audio)
+            ok = cpfsk_to_byte_array(audio, freq0, freq1, sampling_rate, baud_rate, container=container, encoding=encoding) == payload
+            print(f"{encoding:<9} {container:<9} {len(audio):>13,} {len(audio) / reference:>12.1%} {'exact' if ok else 'ERRORS':>11}")
+
+    print("\nquantization SNR (dB) by signal level:")
+    print(f"{'encoding':<9} " + " ".join(f"{f'{a:g} FS':>9}" for a in amplitudes))
+    for encoding in ENCODINGS:
+        print(f"{encoding:<9} " + " ".join(f"{quantization_snr(a * signal, encoding):>9.1f}" for a in amplitudes))
+
+    print("\nbit error rate by channel SNR:")
+    print(f"{'encoding':<9} " + " ".join(f"{f'{s:g} dB':>9}" for s in snrs_db))
+    for encoding in ENCODINGS:
+        rates = [bit_error_rate(signal, bits, encoding, snr, np.random.default_rng(1)) for snr in snrs_db]
+        print(f"{encoding:<9} " + " ".join(f"{r:>9.2e}" for r in rates))
+
+if __name__ == "__main__":
+    main()
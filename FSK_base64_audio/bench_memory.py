@@ -0,0 +1,58 @@
+# bench_memory.py
+import time
+import tracemalloc
+import numpy as np
+from FSK_v2.fsk_mod import fsk_modulation, fsk_modulation_pcm16
+from FSK_v2.cpfsk_mod import cpfsk_modulation, cpfsk_modulation_pcm16
+
+#region Define Parameters
+sampling_rate = 44100.0  # Samples per second (Hz)
+baud_rate = 300.0        # Symbols per second (baud rate)
+freq0 = 1200.0           # Carrier frequency for bit 0
+freq1 = 2200.0           # Carrier frequency for bit 1
+payload_size = 16384     # Payload size in bytes (~19M samples)
+#endregion
+
+def measure(func, *args, **kwargs):
+    """Return (wall time, peak traced bytes allocated during the call, result)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+def float_then_quantize(modulate, bits):
+    """The pre-existing path: float64 signal and time axis, then two more full copies to get int16."""
+    signal, _ = modulate(bits, freq0, freq1, sampling_rate, baud_rate)
+    return (signal * 32767).astype(np.int16)
+
+def main():
+    rng = np.random.default_rng(0)
+    bits = np.unpackbits(rng.integers(0, 256, payload_size, dtype=np.uint8))
+    n_samples = bits.size * int(sampling_rate / baud_rate)
+    print(f"{n_samples:,} samples")
+    print(f"{'path':<34} {'peak MB':>9} {'B/sample':>9} {'time s':>8}")
+
+    for name, modulate, lean in (("fsk", fsk_modulation, fsk_modulation_pcm16), ("cpfsk", cpfsk_modulation, cpfsk_modulation_pcm16)):
+        base_time, base_peak, reference = measure(float_then_quantize, modulate, bits)
+        rows = [(f"{name}: float64 + quantize", base_time, base_peak)]
+
+        lean_time, lean_peak, pcm = measure(lean, bits, freq0, freq1, sampling_rate, baud_rate)
+        assert np.array_equal(pcm, reference)
+        rows.append((f"{name}: lean pcm16, float64", lean_time, lean_peak))
+
+        f32_time, f32_peak, pcm = measure(lean, bits, freq0, freq1, sampling_rate, baud_rate, dtype=np.float32)
+        assert np.abs(pcm.astype(np.int32) - reference).max() <= 1
+        rows.append((f"{name}: lean pcm16, float32", f32_time, f32_peak))
+
+        out = np.empty(n_samples, dtype=np.int16)
+        out_time, out_peak, _ = measure(lean, bits, freq0, freq1, sampling_rate, baud_rate, out=out, dtype=np.float32)
+        rows.append((f"{name}: lean pcm16, float32, out=", out_time, out_peak))
+
+        for label, elapsed, peak in rows:
+            print(f"{label:<34} {peak / 1e6:>9.1f} {peak / n_samples:>9.2f} {elapsed:>8.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+# bench_mfsk.py
+import time
+import numpy as np
+from FSK_v2 import byte_array_to_cpmfsk, cpmfsk_to_byte_array
+
+#region Define Parameters
+sampling_rate = 44100.0  # Samples per second (Hz)
+baud_rate = 300.0        # Symbols per second (baud rate)
+base_freq = 1200.0       # Lowest tone; tones are spaced by the baud rate
+payload_size = 16384     # Payload size in bytes
+tone_counts = [2, 4, 8, 16]
+#endregion
+
+def main():
+    rng = np.random.default_rng(0)
+    data = rng.integers(0, 256, payload_size, dtype=np.uint8).tobytes()
+    print(f"{'M':>3} {'bits/sym':>9} {'air bit/s':>10} {'audio s':>9} {'encode B/s':>12} {'decode B/s':>12}")
+    for m in tone_counts:
+        freqs = [base_freq + baud_rate * i for i in range(m)]
+        bits_per_symbol = m.bit_length() - 1
+
+        start = time.perf_counter()
+        audio = byte_array_to_cpmfsk(data, freqs, sampling_rate, baud_rate)
+        encode_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        recovered = cpmfsk_to_byte_array(audio, freqs, sampling_rate, baud_rate)
+        decode_time = time.perf_counter() - start
+        assert recovered == data
+
+        audio_seconds = 8 * payload_size / bits_per_symbol / baud_rate
+        print(f"{m:>3} {bits_per_symbol:>9} {bits_per_symbol * baud_rate:>10,.0f} {audio_seconds:>9.1f} "
+              f"{payload_size / encode_time:>12,.0f} {payload_size / decode_time:>12,.0f}")
+
+if __name__ == "__main__":
+    main()
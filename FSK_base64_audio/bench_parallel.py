@@ -0,0 +1,42 @@
+# bench_parallel.py
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from FSK_v2.cpfsk_mod import cpfsk_modulation
+from FSK_v2.fsk_demod import fsk_demodulation
+from FSK_v2.parallel import fsk_demodulation_parallel
+
+#region Define Parameters
+sampling_rate = 44100.0  # Samples per second (Hz)
+baud_rate = 300.0        # Symbols per second (baud rate)
+freq0 = 1200.0           # Carrier frequency for bit 0
+freq1 = 2200.0           # Carrier frequency for bit 1
+payload_size = 65536     # Payload size in bytes (~4.2 minutes of audio)
+#endregion
+
+def main():
+    rng = np.random.default_rng(0)
+    bits = np.unpackbits(rng.integers(0, 256, payload_size, dtype=np.uint8))
+    signal, _ = cpfsk_modulation(bits, freq0, freq1, sampling_rate, baud_rate)
+    signal = signal.astype(np.float32)
+    print(f"{signal.size:,} samples, {bits.size:,} symbols, {os.cpu_count()} CPU(s)")
+
+    start = time.perf_counter()
+    expected = fsk_demodulation(signal, sampling_rate, baud_rate, freq0, freq1)
+    serial = time.perf_counter() - start
+    print(f"{'serial':>10} {bits.size / serial:>14,.0f} sym/s")
+
+    worker_counts = sorted({1, 2, 4, 8, os.cpu_count() or 1})
+    for workers in worker_counts:
+        # Reuse a warm pool so the timing covers sharding and demodulation, not process start-up.
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            fsk_demodulation_parallel(signal[:1470], sampling_rate, baud_rate, freq0, freq1, workers, pool)
+            start = time.perf_counter()
+            recovered = fsk_demodulation_parallel(signal, sampling_rate, baud_rate, freq0, freq1, workers, pool)
+            elapsed = time.perf_counter() - start
+        assert np.array_equal(recovered, expected), "parallel result differs from the serial path"
+        print(f"{workers:>7} wk {bits.size / elapsed:>14,.0f} sym/s {serial / elapsed:>7.2f}x")
+
+if __name__ == "__main__":
+    main()
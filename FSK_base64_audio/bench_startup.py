@@ -0,0 +1,58 @@
+# bench_startup.py
+import os
+import subprocess
+import sys
+import time
+
+#region Define Parameters
+repeats = 7         # Fresh interpreters started per case (best is kept)
+payload = b"Hello FSK!"
+top_modules = 8     # Slowest imports listed for the codec import
+#endregion
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ENCODED = subprocess.run([sys.executable, "-m", "FSK_v2", "encode"], input=payload, capture_output=True, cwd=HERE).stdout
+
+# (label, interpreter arguments, stdin)
+CASES = [
+    ("python -c pass", ["-c", "pass"], b""),
+    ("import FSK_v2", ["-c", "import FSK_v2"], b""),
+    ("import codec functions", ["-c", "from FSK_v2 import byte_array_to_fsk, fsk_to_byte_array"], b""),
+    ("import every public name", ["-c", "import FSK_v2\nfor name in FSK_v2.__all__: getattr(FSK_v2, name)"], b""),
+    ("fsk --help", ["-m", "FSK_v2", "--help"], b""),
+    ("fsk encode (10 bytes)", ["-m", "FSK_v2", "encode"], payload),
+    ("fsk decode (10 bytes)", ["-m", "FSK_v2", "decode"], ENCODED),
+]
+
+def wall_time(args: list[str], stdin: bytes) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], input=stdin, stdout=subprocess.DEVNULL, check=True, cwd=HERE)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def slowest_imports(code: str) -> list[tuple[str, int]]:
+    """Top-level imports triggered by code, by cumulative microseconds (python -X importtime)."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, cwd=HERE)
+    modules = []
+    for line in result.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[1].strip().isdigit() and not parts[2].startswith("  "):
+            modules.append((parts[2].strip(), int(parts[1])))
+    return sorted(modules, key=lambda module: -module[1])[:top_modules]
+
+def main():
+    baseline = None
+    print(f"{'case':<26} {'wall ms':>8} {'over python':>12}")
+    for label, args, stdin in CASES:
+        seconds = wall_time(args, stdin)
+        baseline = seconds if baseline is None else baseline
+        print(f"{label:<26} {1e3 * seconds:>8.1f} {1e3 * (seconds - baseline):>11.1f}")
+
+    print("\nslowest imports behind `from FSK_v2 import byte_array_to_fsk, fsk_to_byte_array` (cumulative ms)")
+    for module, micros in slowest_imports("from FSK_v2 import byte_array_to_fsk, fsk_to_byte_array"):
+        print(f"  {module:<30} {micros / 1e3:>7.1f}")
+
+if __name__ == "__main__":
+    main()
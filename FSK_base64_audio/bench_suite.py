@@ -0,0 +1,225 @@
+# bench_suite.py
+import argparse
+import base64
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Optional
+import numpy as np
+
+from FSK_v2 import byte_array_to_cpfsk, cpfsk_to_byte_array
+from FSK_v2.fsk_mod import fsk_modulation
+from FSK_v2.cpfsk_mod import cpfsk_modulation
+from FSK_v2.fsk_demod import fsk_demodulation
+from FSK_v2.wav_io import pcm16_from_wav_bytes
+
+# The original implementation lives next to this project; import it as the baseline.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "Basic_FSK"))
+import FSK as basic_fsk  # noqa: E402
+
+#region Define Parameters
+payload_sizes = [64, 4096, 262144, 1048576]  # Payload sizes in bytes
+baud_rates = [300.0, 1200.0, 9600.0]         # Symbols per second
+sampling_rates = [44100.0, 48000.0]          # Samples per second (Hz)
+max_samples = 40_000_000                     # Skip cases whose signal would be longer than this
+repeats = 3                                  # Timed runs per case; the fastest is reported
+#endregion
+
+#region Benchmark Cases
+# Modulators and demodulator of each implementation, benchmarked side by side.
+IMPLEMENTATIONS = {
+    "Basic_FSK": {"fsk_mod": basic_fsk.fsk_modulation, "cpfsk_mod": basic_fsk.cpfsk_modulation, "demod": basic_fsk.fsk_demodulation},
+    "FSK_v2": {"fsk_mod": fsk_modulation, "cpfsk_mod": cpfsk_modulation, "demod": fsk_demodulation},
+}
+STAGES = ("fsk_mod", "cpfsk_mod", "demod", "encode", "decode")
+# Stages that only exist in FSK_v2 (the Base64/WAV codec).
+CODEC_STAGES = ("encode", "decode")
+
+def tones_for(baud_rate: float) -> tuple[float, float]:
+    """Bell 202 tones at low rates; tones one baud apart around the symbol rate above that."""
+    if baud_rate <= 1200.0:
+        return 1200.0, 2200.0
+    return baud_rate / 2, 3 * baud_rate / 2
+
+def _case_runner(
+    impl: str,
+    stage: str,
+    payload: bytes,
+    baud_rate: float,
+    sampling_rate: float
+) -> tuple[Callable[[], object], Callable[[object], int], Callable[[object], bool]]:
+    """Prepare a case outside the timed region; return (run, samples processed by a result, check of a result)."""
+    freq0, freq1 = tones_for(baud_rate)
+    bits = np.unpackbits(np.frombuffer(payload, dtype=np.uint8))
+
+    if stage in ("fsk_mod", "cpfsk_mod"):
+        modulate = IMPLEMENTATIONS[impl][stage]
+        return (
+            lambda: modulate(bits, freq0, freq1, sampling_rate, baud_rate),
+            lambda result: result[0].size,
+            lambda result: result[0].size > 0,
+        )
+
+    if stage == "demod":
+        # Demodulate what a receiver would see: FSK_v2 CPFSK audio after 16-bit quantization.
+        signal, _ = cpfsk_modulation(bits, freq0, freq1, sampling_rate, baud_rate)
+        signal = (signal * 32767).astype(np.int16).astype(np.float32) / 32767.0
+        demodulate = IMPLEMENTATIONS[impl]["demod"]
+        return (
+            lambda: demodulate(signal, sampling_rate, baud_rate, freq0, freq1),
+            lambda result: signal.size,
+            lambda result: np.array_equal(result, bits),
+        )
+
+    audio = byte_array_to_cpfsk(payload, freq0, freq1, sampling_rate, baud_rate)
+    n_samples = pcm16_from_wav_bytes(base64.b64decode(audio)).size
+    if stage == "encode":
+        return (
+            lambda: byte_array_to_cpfsk(payload, freq0, freq1, sampling_rate, baud_rate),
+            lambda result: n_samples,
+            lambda result: result == audio,
+        )
+    return (
+        lambda: cpfsk_to_byte_array(audio, freq0, freq1, sampling_rate, baud_rate),
+        lambda result: n_samples,
+        lambda result: result == payload,
+    )
+
+def run_case(impl: str, stage: str, payload_size: int, baud_rate: float, sampling_rate: float, repeats: int) -> dict:
+    """
+    Time one case and measure its peak memory.
+
+    Returns:
+        A result record: case parameters, samples, best wall time, samples/s, bytes/s,
+        peak traced memory and whether the output was correct.
+    """
+    payload = np.random.default_rng(payload_size).integers(0, 256, payload_size, dtype=np.uint8).tobytes()
+    run, count, check = _case_runner(impl, stage, payload, baud_rate, sampling_rate)
+
+    wall = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = run()
+        wall = min(wall, time.perf_counter() - start)
+    n_samples = count(result)
+    ok = bool(check(result))
+    del result
+
+    # Peak memory is measured in a separate run, since tracing slows allocations down.
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "impl": impl,
+        "stage": stage,
+        "payload_bytes": payload_size,
+        "baud_rate": baud_rate,
+        "sampling_rate": sampling_rate,
+        "samples": n_samples,
+        "wall_s": wall,
+        "samples_per_s": n_samples / wall,
+        "bytes_per_s": payload_size / wall,
+        "peak_bytes": peak,
+        "ok": ok,
+    }
+#endregion
+
+#region Reporting
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def environment() -> dict:
+    """Describe where the results were measured, so runs from different commits can be compared fairly."""
+    return {
+        "commit": _git_commit(),
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+    }
+
+def _case_key(record: dict) -> tuple:
+    return (record["impl"], record["stage"], record["payload_bytes"], record["baud_rate"], record["sampling_rate"])
+
+def compare(results: list[dict], baseline: list[dict], tolerance: float) -> int:
+    """Print throughput and peak-memory ratios against a baseline run; return the number of regressions."""
+    previous = {_case_key(record): record for record in baseline}
+    regressions = 0
+    print(f"\n{'impl':<10} {'stage':<10} {'bytes':>8} {'baud':>6} {'rate':>6} {'speed':>7} {'memory':>7}")
+    for record in results:
+        old = previous.get(_case_key(record))
+        if old is None:
+            continue
+        speed = record["samples_per_s"] / old["samples_per_s"]
+        memory = record["peak_bytes"] / max(old["peak_bytes"], 1)
+        flag = ""
+        if speed < 1 - tolerance or memory > 1 + tolerance:
+            regressions += 1
+            flag = "  REGRESSION"
+        print(f"{record['impl']:<10} {record['stage']:<10} {record['payload_bytes']:>8} {record['baud_rate']:>6.0f} "
+              f"{record['sampling_rate']:>6.0f} {speed:>6.2f}x {memory:>6.2f}x{flag}")
+    return regressions
+#endregion
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark modulation, demodulation and codec stages and write the results as JSON.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=payload_sizes, help="payload sizes in bytes")
+    parser.add_argument("--bauds", type=float, nargs="+", default=baud_rates, help="baud rates")
+    parser.add_argument("--rates", type=float, nargs="+", default=sampling_rates, help="sampling rates (Hz)")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    parser.add_argument("--impls", nargs="+", choices=sorted(IMPLEMENTATIONS), default=list(IMPLEMENTATIONS))
+    parser.add_argument("--repeats", type=int, default=repeats)
+    parser.add_argument("--max-samples", type=int, default=max_samples, help="skip cases with longer signals")
+    parser.add_argument("--output", default="bench_results.json", help="JSON file to write")
+    parser.add_argument("--compare", help="earlier JSON results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="relative change reported as a regression")
+    args = parser.parse_args(argv)
+
+    results, skipped = [], []
+    print(f"{'impl':<10} {'stage':<10} {'bytes':>8} {'baud':>6} {'rate':>6} {'Msamp/s':>9} {'KB/s':>9} {'wall s':>8} {'peak MB':>8} ok")
+    for sampling_rate in args.rates:
+        for baud_rate in args.bauds:
+            samples_per_byte = 8 * sampling_rate / baud_rate
+            for size in args.sizes:
+                for stage in args.stages:
+                    for impl in args.impls:
+                        case = {"impl": impl, "stage": stage, "payload_bytes": size, "baud_rate": baud_rate, "sampling_rate": sampling_rate}
+                        if impl == "Basic_FSK" and stage in CODEC_STAGES:
+                            continue
+                        if size * samples_per_byte > args.max_samples:
+                            skipped.append(case)
+                            continue
+                        record = run_case(impl, stage, size, baud_rate, sampling_rate, args.repeats)
+                        results.append(record)
+                        print(f"{impl:<10} {stage:<10} {size:>8} {baud_rate:>6.0f} {sampling_rate:>6.0f} "
+                              f"{record['samples_per_s'] / 1e6:>9.1f} {record['bytes_per_s'] / 1e3:>9.1f} "
+                              f"{record['wall_s']:>8.4f} {record['peak_bytes'] / 1e6:>8.1f} {'yes' if record['ok'] else 'NO'}")
+
+    report = {"environment": environment(), "parameters": vars(args), "results": results, "skipped": skipped}
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n{len(results)} cases written to {args.output} ({len(skipped)} skipped by --max-samples)")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        return 1 if compare(results, baseline, args.tolerance) else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
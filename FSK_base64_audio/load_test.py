@@ -0,0 +1,74 @@
+# load_test.py
+import argparse
+import asyncio
+import time
+import numpy as np
+from FSK_v2.server import FSKServer, FSKClient
+
+#region Define Parameters
+sampling_rate = 44100.0  # Samples per second (Hz)
+baud_rate = 300.0        # Symbols per second (baud rate)
+freq0 = 1200.0           # Carrier frequency for bit 0
+freq1 = 2200.0           # Carrier frequency for bit 1
+#endregion
+
+async def client_worker(port: int, path, payloads: list[bytes], modulation: str, latencies: list[float]) -> None:
+    """Send each payload as an encode request followed by a decode of the result."""
+    client = await FSKClient.connect(port=port, path=path)
+    try:
+        for data in payloads:
+            start = time.perf_counter()
+            audio = await client.encode(data, freq0, freq1, sampling_rate, baud_rate, modulation)
+            latencies.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            recovered = await client.decode(audio, freq0, freq1, sampling_rate, baud_rate, modulation)
+            latencies.append(time.perf_counter() - start)
+            assert recovered == data, "round trip through the service failed"
+    finally:
+        await client.close()
+
+async def run(args) -> None:
+    server = None
+    port, path = args.port, args.unix
+    if not args.external:
+        # Start an in-process server on a free port so the script is self-contained.
+        server = FSKServer(port=0, path=path, batch_window=args.batch_window_ms / 1000.0)
+        await server.start()
+        port = server.port
+
+    rng = np.random.default_rng(0)
+    per_client = [
+        [rng.integers(0, 256, args.size, dtype=np.uint8).tobytes() for _ in range(args.requests)]
+        for _ in range(args.clients)
+    ]
+    latencies: list[float] = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client_worker(port, path, p, args.modulation, latencies) for p in per_client))
+    elapsed = time.perf_counter() - start
+
+    stats_client = await FSKClient.connect(port=port, path=path)
+    stats = await stats_client.stats()
+    await stats_client.close()
+    if server is not None:
+        await server.close()
+
+    ordered = np.sort(latencies)
+    print(f"{len(ordered)} requests from {args.clients} clients in {elapsed:.2f} s ({len(ordered) / elapsed:,.0f} req/s)")
+    print(f"client latency p50 {1000 * np.percentile(ordered, 50):.1f} ms, p99 {1000 * np.percentile(ordered, 99):.1f} ms")
+    print(f"server mean batch size {stats['mean_batch_size']:.1f}, rejected {stats['rejected']}, errors {stats['errors']}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure FSK service latency on one machine.")
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=20, help="Round trips per client")
+    parser.add_argument("--size", type=int, default=16, help="Payload bytes per request")
+    parser.add_argument("--modulation", choices=("fsk", "cpfsk"), default="cpfsk")
+    parser.add_argument("--batch-window-ms", type=float, default=2.0)
+    parser.add_argument("--external", action="store_true", help="Use an already running server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="Unix socket path")
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+# test_batch.py
+import numpy as np
+from FSK_v2 import (
+    byte_array_to_fsk,
+    byte_array_to_cpfsk,
+    fsk_to_byte_array,
+    byte_arrays_to_fsk,
+    byte_arrays_to_cpfsk,
+    fsk_to_byte_arrays,
+    cpfsk_to_byte_arrays,
+)
+
+sampling_rate = 44100.0
+baud_rate = 300.0
+freq0 = 1200.0
+freq1 = 2200.0
+
+def test_batch_matches_single_message_functions():
+    rng = np.random.default_rng(8)
+    payloads = [rng.integers(0, 256, n, dtype=np.uint8).tobytes() for n in (5, 0, 17, 1, 9, 5)]
+
+    for batch_encode, encode in ((byte_arrays_to_fsk, byte_array_to_fsk), (byte_arrays_to_cpfsk, byte_array_to_cpfsk)):
+        audios = batch_encode(payloads, freq0, freq1, sampling_rate, baud_rate)
+        assert audios == [encode(p, freq0, freq1, sampling_rate, baud_rate) for p in payloads]
+
+        recovered = cpfsk_to_byte_arrays(audios, freq0, freq1, sampling_rate, baud_rate)
+        assert recovered == [fsk_to_byte_array(a, freq0, freq1, sampling_rate, baud_rate) for a in audios]
+        assert recovered == payloads
+
+def test_batch_mixed_layouts_and_decimation():
+    # Messages with different headers are decoded in separate groups and returned in input order.
+    payloads = [b"pcm16", b"mu-law", b"pcm16 again", b"", b"mu"]
+    audios = [
+        byte_array_to_cpfsk(p, freq0, freq1, sampling_rate, baud_rate, encoding="mulaw" if i % 3 == 1 else "pcm16")
+        for i, p in enumerate(payloads)
+    ]
+    for decimate in (None, True, False):
+        assert fsk_to_byte_arrays(audios, freq0, freq1, sampling_rate, baud_rate, decimate=decimate) == payloads
+
+def test_batch_empty():
+    assert byte_arrays_to_fsk([], freq0, freq1, sampling_rate, baud_rate) == []
+    assert fsk_to_byte_arrays([], freq0, freq1, sampling_rate, baud_rate) == []
+
+if __name__ == "__main__":
+    test_batch_matches_single_message_functions()
+    test_batch_mixed_layouts_and_decimation()
+    test_batch_empty()
+    print("Batch tests passed!")
@@ -0,0 +1,51 @@
+# test_channel.py
+import numpy as np
+from FSK_v2.channel import awgn, frequency_shift, timing_jitter, simulate_ber, ber_curves, noncoherent_bfsk_ber
+
+sampling_rate = 44100.0
+baud_rate = 1200.0
+freq0 = 1200.0
+freq1 = 2400.0  # One baud apart: orthogonal tones, so the textbook curve applies.
+
+def test_impairments():
+    rng = np.random.default_rng(60)
+    t = np.arange(4410) / sampling_rate
+    tone = np.sin(2 * np.pi * 1000.0 * t)
+
+    # Noise variance is N0 / 2 for the measured bit energy.
+    noisy = awgn(np.tile(tone, (3, 1)), 10.0, 36.75, rng)
+    noise_var = np.var(noisy - tone, axis=1)
+    assert np.allclose(noise_var, 0.5 * 36.75 / (2 * 10.0), rtol=0.1)
+
+    shifted = frequency_shift(tone, 150.0, sampling_rate)
+    assert np.argmax(np.abs(np.fft.rfft(shifted))) * sampling_rate / tone.size == 1150.0
+
+    assert np.array_equal(timing_jitter(tone, 0.0, rng), tone)
+    # RMS error of a sampling-time error e on a sine is |slope| * e: 0.2 * 2π * 1000 / 44100 / √2.
+    error = np.sqrt(np.mean((timing_jitter(tone, 0.2, rng) - tone) ** 2))
+    assert abs(error - 0.2 * 2 * np.pi * 1000.0 / sampling_rate / np.sqrt(2)) < 0.003
+
+def test_ber_matches_theory_and_is_reproducible():
+    points = [4.0, 8.0]
+    curve = simulate_ber(points, sampling_rate, baud_rate, freq0, freq1, frames=300, seed=1)
+    assert curve.bits == 300 * 256
+    assert np.allclose(curve.ber, noncoherent_bfsk_ber(points), rtol=0.15)
+    assert np.all(curve.fer >= curve.ber)
+
+    again = simulate_ber(points, sampling_rate, baud_rate, freq0, freq1, frames=300, seed=1, workers=2)
+    assert np.array_equal(again.bit_errors, curve.bit_errors)
+
+    clean = simulate_ber([np.inf], sampling_rate, baud_rate, freq0, freq1, frames=10)
+    assert clean.bit_errors[0] == 0
+
+def test_curves_per_configuration():
+    curves = ber_curves([6.0], sampling_rate, baud_rate, freq0, freq1, frames=50, freq_offset=100.0, jitter=0.1)
+    assert set(curves) == {(modulation, method) for modulation in ("fsk", "cpfsk") for method in ("correlate", "goertzel", "fft")}
+    # Both backends compute the same magnitudes, so they make the same decisions.
+    assert np.array_equal(curves["fsk", "correlate"].bit_errors, curves["fsk", "goertzel"].bit_errors)
+
+if __name__ == "__main__":
+    test_impairments()
+    test_ber_matches_theory_and_is_reproducible()
+    test_curves_per_configuration()
+    print("Channel simulation tests passed!")
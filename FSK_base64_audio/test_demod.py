@@ -0,0 +1,116 @@
+# test_demod.py
+import numpy as np
+from FSK_v2.fsk_mod import fsk_modulation
+from FSK_v2.cpfsk_mod import cpfsk_modulation
+from FSK_v2 import fsk_demod
+from FSK_v2.fsk_demod import fsk_demodulation, fsk_demodulation_from_base64, fsk_magnitudes, symbol_magnitudes
+from FSK_v2.tables import get_tables
+from FSK_v2 import byte_array_to_cpfsk, StreamingDemodulator
+
+sampling_rate = 44100.0
+baud_rate = 300.0
+freq0 = 1200.0
+freq1 = 2200.0
+
+def fsk_demodulation_loop(modulated_signal, sampling_rate, baud_rate, freq0, freq1):
+    """The original per-symbol demodulator, the reference the block demodulator must match."""
+    samples_per_bit = int(sampling_rate / baud_rate)
+    num_symbols = len(modulated_signal) // samples_per_bit
+    bits = np.empty(num_symbols, dtype=np.uint8)
+    t_symbol = np.arange(samples_per_bit) / sampling_rate
+
+    for i in range(num_symbols):
+        chunk = modulated_signal[i * samples_per_bit : (i + 1) * samples_per_bit]
+        I0 = np.dot(chunk, np.cos(2 * np.pi * freq0 * t_symbol))
+        Q0 = np.dot(chunk, np.sin(2 * np.pi * freq0 * t_symbol))
+        mag0 = np.sqrt(I0**2 + Q0**2)
+        I1 = np.dot(chunk, np.cos(2 * np.pi * freq1 * t_symbol))
+        Q1 = np.dot(chunk, np.sin(2 * np.pi * freq1 * t_symbol))
+        mag1 = np.sqrt(I1**2 + Q1**2)
+        bits[i] = 0 if mag0 > mag1 else 1
+
+    return bits
+
+def test_block_demod_matches_loop():
+    rng = np.random.default_rng(1)
+    bits = rng.integers(0, 2, 400).astype(np.uint8)
+
+    for modulate in (fsk_modulation, cpfsk_modulation):
+        signal, _ = modulate(bits, freq0, freq1, sampling_rate, baud_rate)
+        # Add noise and a trailing partial symbol so decisions are not trivially clean.
+        noisy = signal + rng.normal(0, 1.5, signal.size)
+        noisy = np.concatenate([noisy, noisy[:50]])
+
+        expected = fsk_demodulation_loop(noisy, sampling_rate, baud_rate, freq0, freq1)
+        recovered = fsk_demodulation(noisy, sampling_rate, baud_rate, freq0, freq1)
+
+        assert recovered.dtype == np.uint8
+        assert np.array_equal(recovered, expected)
+
+def test_block_demod_empty_signal():
+    bits = fsk_demodulation(np.zeros(10), sampling_rate, baud_rate, freq0, freq1)
+    assert bits.size == 0
+
+def test_goertzel_matches_correlator():
+    rng = np.random.default_rng(10)
+    bits = rng.integers(0, 2, 300).astype(np.uint8)
+    signal, _ = cpfsk_modulation(bits, freq0, freq1, sampling_rate, baud_rate)
+    tables = get_tables((freq0, freq1), sampling_rate, baud_rate)
+
+    # The recurrence yields the same tone magnitudes as the correlator, up to rounding.
+    noisy = signal + rng.normal(0, 0.5, signal.size)
+    np.testing.assert_allclose(
+        symbol_magnitudes(noisy, tables, "goertzel"),
+        symbol_magnitudes(noisy, tables, "correlate"),
+        rtol=1e-9, atol=1e-9,
+    )
+    assert np.array_equal(fsk_demodulation(signal, sampling_rate, baud_rate, freq0, freq1, method="goertzel"), bits)
+
+    data = b"Goertzel"
+    audio = byte_array_to_cpfsk(data, freq0, freq1, sampling_rate, baud_rate)
+    assert fsk_demodulation_from_base64(audio, sampling_rate, baud_rate, freq0, freq1, method="goertzel") == data
+
+    pcm = (signal * 32767).astype(np.int16)
+    demod = StreamingDemodulator(sampling_rate, baud_rate, freq0, freq1, method="goertzel")
+    assert b"".join(demod.stream(np.array_split(pcm, 7))) == np.packbits(bits).tobytes()
+
+def test_fft_backend():
+    rng = np.random.default_rng(11)
+    # On the bin grid of a 147-sample symbol (300 Hz spacing) the FFT reads the exact magnitudes.
+    on_grid = (1200.0, 1500.0, 2100.0, 3000.0)
+    signal, _ = cpfsk_modulation(rng.integers(0, 2, 200).astype(np.uint8), on_grid[0], on_grid[1], sampling_rate, baud_rate)
+    noisy = signal + rng.normal(0, 0.5, signal.size)
+    np.testing.assert_allclose(
+        fsk_magnitudes(noisy, sampling_rate, baud_rate, on_grid, "fft"),
+        fsk_magnitudes(noisy, sampling_rate, baud_rate, on_grid, "correlate"),
+        rtol=1e-9, atol=1e-9,
+    )
+
+    # Between bins the magnitudes are interpolated: close to the correlator, same decisions.
+    bits = rng.integers(0, 2, 300).astype(np.uint8)
+    for rate in (baud_rate, 1200.0):
+        signal, _ = fsk_modulation(bits, freq0, freq1, sampling_rate, rate)
+        exact = fsk_magnitudes(signal, sampling_rate, rate, (freq0, freq1), "correlate")
+        approx = fsk_magnitudes(signal, sampling_rate, rate, (freq0, freq1), "fft")
+        assert np.all(np.abs(approx - exact) <= 0.15 * exact.max())
+        assert np.array_equal(fsk_demodulation(signal, sampling_rate, rate, freq0, freq1, method="fft"), bits)
+
+    # Long signals are transformed in blocks of symbols with identical results.
+    block_values = fsk_demod._FFT_BLOCK_VALUES
+    fsk_demod._FFT_BLOCK_VALUES = 3000
+    try:
+        blocked = fsk_magnitudes(signal, sampling_rate, 1200.0, (freq0, freq1), "fft")
+    finally:
+        fsk_demod._FFT_BLOCK_VALUES = block_values
+    np.testing.assert_array_equal(blocked, approx)
+
+    data = b"FFT backend"
+    audio = byte_array_to_cpfsk(data, freq0, freq1, sampling_rate, baud_rate)
+    assert fsk_demodulation_from_base64(audio, sampling_rate, baud_rate, freq0, freq1, method="fft") == data
+
+if __name__ == "__main__":
+    test_block_demod_matches_loop()
+    test_block_demod_empty_signal()
+    test_goertzel_matches_correlator()
+    test_fft_backend()
+    print("Demodulation tests passed!")
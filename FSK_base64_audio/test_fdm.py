@@ -0,0 +1,78 @@
+# test_fdm.py
+import base64
+import io
+import numpy as np
+from FSK_v2 import fdm_tone_plan, byte_arrays_to_fdm, fdm_to_byte_arrays
+from FSK_v2.audio_format import pcm16_from_wav_bytes
+from FSK_v2.fdm import fdm_soft_demodulation
+from FSK_v2.wav_io import write_pcm16
+
+sampling_rate = 44100.0
+baud_rate = 300.0
+
+def _payloads(rng: np.random.Generator, sizes) -> list[bytes]:
+    return [rng.integers(0, 256, size, dtype=np.uint8).tobytes() for size in sizes]
+
+def test_tone_plan():
+    tones = fdm_tone_plan(8, sampling_rate, baud_rate)
+    freqs = np.asarray(tones).ravel()
+    assert len(tones) == 8 and freqs[0] >= 1200.0 and freqs[-1] < sampling_rate / 2
+    # Tones sit on distinct multiples of the symbol-window bin spacing (147 samples -> 300 Hz).
+    assert np.allclose(freqs / 300.0, np.round(freqs / 300.0)) and np.all(np.diff(freqs) > 0)
+    for bad in (0, 1000):
+        try:
+            fdm_tone_plan(bad, sampling_rate, baud_rate)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"expected ValueError for {bad} channels")
+
+def test_round_trip_unequal_lengths():
+    rng = np.random.default_rng(21)
+    payloads = _payloads(rng, [40, 0, 7, 120, 33])
+    for rate in (baud_rate, 1200.0):  # 147 and 36.75 samples per bit.
+        tones = fdm_tone_plan(len(payloads), sampling_rate, rate)
+        for modulation in ("cpfsk", "fsk"):
+            audio = byte_arrays_to_fdm(payloads, sampling_rate, rate, tones, modulation=modulation)
+            assert fdm_to_byte_arrays(audio, sampling_rate, rate, tones) == payloads
+
+def test_no_clipping_and_encodings():
+    rng = np.random.default_rng(22)
+    payloads = _payloads(rng, [64] * 16)
+    tones = fdm_tone_plan(16, sampling_rate, baud_rate)
+    audio = byte_arrays_to_fdm(payloads, sampling_rate, baud_rate, tones, headroom=0.9)
+    samples = pcm16_from_wav_bytes(base64.b64decode(audio))
+    assert np.abs(samples.astype(np.int32)).max() <= 0.9 * 32767 + 1
+    for encoding in ("pcm8", "mulaw"):
+        audio = byte_arrays_to_fdm(payloads, sampling_rate, baud_rate, tones, fec="hamming74", encoding=encoding)
+        assert fdm_to_byte_arrays(audio, sampling_rate, baud_rate, tones, fec="hamming74") == payloads
+
+def test_channels_are_independent():
+    rng = np.random.default_rng(23)
+    payloads = _payloads(rng, [50, 50, 50])
+    tones = fdm_tone_plan(3, sampling_rate, baud_rate)
+    audio = byte_arrays_to_fdm(payloads, sampling_rate, baud_rate, tones)
+    # A strong carrier on channel 1's "1" tone ruins that channel only; the others still decode.
+    samples = pcm16_from_wav_bytes(base64.b64decode(audio)).astype(np.float64)
+    jammed = (samples + 3 * 32767 * np.sin(2 * np.pi * tones[1][1] * np.arange(samples.size) / sampling_rate)) / 4
+    assert np.all(fdm_soft_demodulation(jammed, sampling_rate, baud_rate, tones)[1] > 0)
+    with io.BytesIO() as buffer:
+        write_pcm16(buffer, [jammed.astype(np.int16)], samples.size, sampling_rate)
+        jammed_audio = base64.b64encode(buffer.getvalue()).decode('ascii')
+    assert fdm_to_byte_arrays(jammed_audio, sampling_rate, baud_rate, tones) == [payloads[0], None, payloads[2]]
+
+def test_off_grid_tones_rejected():
+    try:
+        byte_arrays_to_fdm([b"x"], sampling_rate, baud_rate, [(1200.0, 2200.0 + 37.0)])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError for tones off the bin grid")
+
+if __name__ == "__main__":
+    test_tone_plan()
+    test_round_trip_unequal_lengths()
+    test_no_clipping_and_encodings()
+    test_channels_are_independent()
+    test_off_grid_tones_rejected()
+    print("All FDM tests passed!")
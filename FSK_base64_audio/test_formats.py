@@ -0,0 +1,79 @@
+# test_formats.py
+import base64
+import io
+import numpy as np
+from FSK_v2 import (
+    byte_array_to_fsk, fsk_to_byte_array, byte_array_to_cpfsk, cpfsk_to_byte_array,
+    byte_array_to_cpfsk_sink, byte_array_to_cpmfsk, cpmfsk_to_byte_array, fsk_to_byte_arrays,
+)
+from FSK_v2.audio_format import (
+    ENCODINGS, WAVE_FORMAT_MULAW, encode_samples, decode_samples, read_wav_info, pcm16_from_wav_bytes,
+)
+
+sampling_rate = 44100.0
+baud_rate = 300.0
+freq0 = 1200.0
+freq1 = 2200.0
+
+def test_codecs():
+    pcm = np.array([0, -1, 1000, -1000, 32767, -32768], dtype=np.int16)
+    # G.711 reference codes: zero is 0xFF, full scale saturates to 0x80 / 0x00.
+    assert encode_samples(pcm, "mulaw").tolist() == [0xFF, 0x7E, 0xCE, 0x4E, 0x80, 0x00]
+    assert encode_samples(pcm, "pcm8").tolist() == [128, 128, 132, 124, 255, 0]
+
+    everything = np.arange(-32768, 32768, dtype=np.int32).astype(np.int16)
+    for encoding, limit in (("pcm16", 0), ("pcm8", 255), ("mulaw", 1024)):
+        decoded = decode_samples(encode_samples(everything, encoding).tobytes(), encoding)
+        assert decoded.dtype == np.int16
+        assert np.abs(decoded.astype(np.int32) - everything).max() <= limit
+
+    try:
+        encode_samples(pcm, "alaw")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError for an unknown encoding")
+
+def test_round_trip_every_format():
+    data = b"compact formats \x00\xff"
+    n_samples = len(data) * 8 * 147
+    for encoding, (format_tag, sampwidth) in ENCODINGS.items():
+        for encode, decode in ((byte_array_to_fsk, fsk_to_byte_array), (byte_array_to_cpfsk, cpfsk_to_byte_array)):
+            audio = encode(data, freq0, freq1, sampling_rate, baud_rate, encoding=encoding)
+            assert decode(audio, freq0, freq1, sampling_rate, baud_rate) == data
+            wav_bytes = base64.b64decode(audio)
+            with io.BytesIO(wav_bytes) as buffer:
+                info = read_wav_info(buffer)
+            assert (info.format_tag, info.sampwidth, info.n_frames) == (format_tag, sampwidth, n_samples)
+            assert len(wav_bytes) == info.data_offset + n_samples * sampwidth
+
+            raw = encode(data, freq0, freq1, sampling_rate, baud_rate, container="raw", encoding=encoding)
+            assert len(base64.b64decode(raw)) == n_samples * sampwidth
+            assert decode(raw, freq0, freq1, sampling_rate, baud_rate, container="raw", encoding=encoding) == data
+
+        freqs = (1200.0, 1600.0, 2000.0, 2400.0)
+        audio = byte_array_to_cpmfsk(data, freqs, sampling_rate, baud_rate, encoding=encoding)
+        assert cpmfsk_to_byte_array(audio, freqs, sampling_rate, baud_rate) == data
+
+def test_mulaw_wav_layout_and_other_readers():
+    data = b"mu-law"
+    with io.BytesIO() as sink:
+        written = byte_array_to_cpfsk_sink(data, sink, freq0, freq1, sampling_rate, baud_rate, encoding="mulaw")
+        wav_bytes = sink.getvalue()
+    assert written == len(wav_bytes)
+    # Non-PCM WAV files carry an 18-byte fmt chunk and a fact chunk with the sample count.
+    assert wav_bytes[12:16] == b'fmt ' and int.from_bytes(wav_bytes[16:20], 'little') == 18
+    assert wav_bytes[38:42] == b'fact'
+    assert int.from_bytes(wav_bytes[20:22], 'little') == WAVE_FORMAT_MULAW
+
+    # Every WAV decoder shares the same reader, so the batch path accepts the compact formats too.
+    pcm = pcm16_from_wav_bytes(wav_bytes)
+    assert pcm.size == len(data) * 8 * 147
+    audios = [byte_array_to_fsk(data, freq0, freq1, sampling_rate, baud_rate, encoding=encoding) for encoding in ENCODINGS]
+    assert fsk_to_byte_arrays(audios, freq0, freq1, sampling_rate, baud_rate) == [data] * len(ENCODINGS)
+
+if __name__ == "__main__":
+    test_codecs()
+    test_round_trip_every_format()
+    test_mulaw_wav_layout_and_other_readers()
+    print("Output format tests passed!")
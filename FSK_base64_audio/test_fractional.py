@@ -0,0 +1,85 @@
+# test_fractional.py
+import base64
+import io
+import numpy as np
+from FSK_v2 import (
+    byte_array_to_fsk,
+    byte_array_to_cpfsk,
+    fsk_to_byte_array,
+    byte_arrays_to_cpfsk,
+    fsk_to_byte_arrays,
+    cpfsk_modulation_stream,
+    StreamingDemodulator,
+    fsk_demodulation_parallel,
+    decode_frames,
+)
+from FSK_v2.fsk_mod import fsk_modulation
+from FSK_v2.cpfsk_mod import cpfsk_modulation, cpfsk_modulation_to_sink
+from FSK_v2.fsk_demod import fsk_demodulation
+from FSK_v2.tables import get_tables, symbol_boundaries
+from FSK_v2.wav_io import pcm16_from_wav_bytes
+
+# 1200 baud at 44.1 kHz: 36.75 samples per bit
+sampling_rate = 44100.0
+baud_rate = 1200.0
+freq0 = 1200.0
+freq1 = 2200.0
+
+def test_symbol_boundaries_do_not_drift():
+    tables = get_tables((freq0, freq1), sampling_rate, baud_rate)
+    boundaries = symbol_boundaries(tables, 0, 120000)
+    assert tables.samples_per_bit == 36
+    assert set(np.diff(boundaries)) == {36, 37}
+    # 100 seconds of symbols take exactly 100 seconds of samples.
+    assert boundaries[-1] == 100 * 44100
+
+def test_fractional_roundtrip():
+    rng = np.random.default_rng(12)
+    data = rng.integers(0, 256, 20000, dtype=np.uint8).tobytes()
+    for encode in (byte_array_to_fsk, byte_array_to_cpfsk):
+        audio = encode(data, freq0, freq1, sampling_rate, baud_rate)
+        assert pcm16_from_wav_bytes(base64.b64decode(audio)).size == 8 * len(data) * 147 // 4
+        assert fsk_to_byte_array(audio, freq0, freq1, sampling_rate, baud_rate) == data
+
+    # Higher rates at both standard sample rates, with tones spaced for the symbol rate.
+    for rate in (44100.0, 48000.0):
+        for baud in (2400.0, 4800.0, 9600.0):
+            bits = rng.integers(0, 2, 5000).astype(np.uint8)
+            for modulate in (fsk_modulation, cpfsk_modulation):
+                signal, t = modulate(bits, baud / 2, 3 * baud / 2, rate, baud)
+                assert signal.size == t.size
+                assert np.array_equal(fsk_demodulation(signal, rate, baud, baud / 2, 3 * baud / 2), bits)
+
+def test_fractional_paths_agree():
+    rng = np.random.default_rng(13)
+    data = rng.integers(0, 256, 3000, dtype=np.uint8).tobytes()
+    bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8))
+    signal, _ = cpfsk_modulation(bits, freq0, freq1, sampling_rate, baud_rate)
+
+    # Streaming modulation and the sink path carry the symbol index across blocks.
+    streamed = np.concatenate(list(cpfsk_modulation_stream(data, freq0, freq1, sampling_rate, baud_rate, block_size=1000)))
+    assert np.array_equal(streamed, signal)
+    with io.BytesIO() as sink:
+        cpfsk_modulation_to_sink(bits, sink, freq0, freq1, sampling_rate, baud_rate, block_size=777)
+        assert base64.b64encode(sink.getvalue()).decode('ascii') == byte_array_to_cpfsk(data, freq0, freq1, sampling_rate, baud_rate)
+
+    # Streaming, parallel and batch demodulation give the one-shot result.
+    pcm = (signal * 32767).astype(np.int16)
+    demod = StreamingDemodulator(sampling_rate, baud_rate, freq0, freq1)
+    assert b"".join(demod.stream(np.array_split(pcm, 17))) == data
+    assert np.array_equal(fsk_demodulation_parallel(signal, sampling_rate, baud_rate, freq0, freq1, workers=3), bits)
+    payloads = [data, data[:1], data[:333]]
+    audios = byte_arrays_to_cpfsk(payloads, freq0, freq1, sampling_rate, baud_rate)
+    assert audios[2] == byte_array_to_cpfsk(data[:333], freq0, freq1, sampling_rate, baud_rate)
+    assert fsk_to_byte_arrays(audios, freq0, freq1, sampling_rate, baud_rate) == payloads
+
+    # Framed transmissions are located and decoded at the fractional layout too.
+    frames = [base64.b64decode(byte_array_to_cpfsk(p, freq0, freq1, sampling_rate, baud_rate, framed=True)) for p in payloads[1:]]
+    recording = np.concatenate([np.zeros(5000)] + [pcm16_from_wav_bytes(f) / 32767.0 for f in frames] + [np.zeros(100)])
+    assert decode_frames(recording, sampling_rate, baud_rate, freq0, freq1) == payloads[1:]
+
+if __name__ == "__main__":
+    test_symbol_boundaries_do_not_drift()
+    test_fractional_roundtrip()
+    test_fractional_paths_agree()
+    print("Fractional samples-per-bit tests passed!")
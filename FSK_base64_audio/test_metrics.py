@@ -0,0 +1,55 @@
+# test_metrics.py
+import io
+from FSK_v2 import byte_array_to_cpfsk, cpfsk_to_byte_array, byte_array_to_cpfsk_sink, byte_array_to_mfsk, mfsk_to_byte_array
+from FSK_v2 import PipelineMetrics, set_observer, observe
+
+sampling_rate = 44100.0
+baud_rate = 300.0
+freq0 = 1200.0
+freq1 = 2200.0
+
+def test_stage_counters():
+    data = b"instrumented pipeline"
+    n_samples = len(data) * 8 * 147
+    with observe(PipelineMetrics()) as metrics:
+        audio = byte_array_to_cpfsk(data, freq0, freq1, sampling_rate, baud_rate)
+        assert cpfsk_to_byte_array(audio, freq0, freq1, sampling_rate, baud_rate) == data
+    snapshot = metrics.snapshot()
+
+    assert set(snapshot) == {"unpackbits", "synthesize", "write", "b64encode", "b64decode", "wav_parse", "pcm_to_float", "demodulate", "packbits"}
+    assert all(counters["calls"] == 1 and counters["seconds"] >= 0 for counters in snapshot.values())
+    assert snapshot["unpackbits"]["bytes"] == len(data)
+    assert snapshot["synthesize"]["samples"] == n_samples
+    assert snapshot["write"]["bytes"] == 44 + 2 * n_samples
+    assert snapshot["b64encode"]["bytes"] == len(audio)
+    assert snapshot["wav_parse"]["samples"] == snapshot["demodulate"]["samples"] == n_samples
+    assert snapshot["packbits"]["bytes"] == len(data)
+
+    # Counters accumulate across calls until reset.
+    with observe(metrics):
+        mfsk_to_byte_array(byte_array_to_mfsk(data, (1200.0, 1600.0, 2000.0, 2400.0), sampling_rate, baud_rate),
+                           (1200.0, 1600.0, 2000.0, 2400.0), sampling_rate, baud_rate)
+    assert metrics.snapshot()["demodulate"]["calls"] == 2
+    assert 'fsk_stage_calls_total{stage="demodulate"} 2' in metrics.to_prometheus()
+    metrics.reset()
+    assert metrics.snapshot() == {}
+
+def test_callback_observer_and_disabled():
+    records = []
+    previous = set_observer(records.append)
+    try:
+        with io.BytesIO() as sink:
+            byte_array_to_cpfsk_sink(b"hi", sink, freq0, freq1, sampling_rate, baud_rate)
+    finally:
+        set_observer(previous)
+    assert [record.stage for record in records] == ["unpackbits", "synthesize", "write"]
+
+    # Nothing is recorded once the observer is removed.
+    records.clear()
+    byte_array_to_cpfsk(b"hi", freq0, freq1, sampling_rate, baud_rate)
+    assert records == []
+
+if __name__ == "__main__":
+    test_stage_counters()
+    test_callback_observer_and_disabled()
+    print("Metrics tests passed!")
@@ -0,0 +1,98 @@
+# test_mfsk.py
+import base64
+import io
+import numpy as np
+from FSK_v2 import (
+    byte_array_to_fsk,
+    byte_array_to_cpfsk,
+    byte_array_to_mfsk,
+    mfsk_to_byte_array,
+    byte_array_to_cpmfsk,
+    cpmfsk_to_byte_array,
+    mfsk_demodulation_from_base64,
+)
+from FSK_v2.mfsk import (
+    bits_to_tones,
+    tones_to_bits,
+    mfsk_modulation,
+    cpmfsk_modulation,
+    cpmfsk_modulation_to_sink,
+    mfsk_demodulation,
+)
+from FSK_v2.wav_io import pcm16_from_wav_bytes
+
+sampling_rate = 44100.0
+baud_rate = 300.0
+
+def tone_list(m: int) -> list[float]:
+    """M tones spaced by the baud rate, so they are orthogonal over one symbol."""
+    return [1200.0 + baud_rate * i for i in range(m)]
+
+def test_symbol_mapping():
+    rng = np.random.default_rng(20)
+    for k in (1, 2, 3, 4):
+        bits = rng.integers(0, 2, 6 * k).astype(np.uint8)
+        tones = bits_to_tones(bits, k)
+        assert tones.size == 6 and tones.max() < (1 << k)
+        assert np.array_equal(tones_to_bits(tones, k), bits)
+        # Gray coding: neighbouring tones differ in exactly one bit.
+        values = tones_to_bits(np.arange(1 << k), k).reshape(-1, k).astype(int)
+        assert np.all(np.abs(np.diff(values, axis=0)).sum(axis=1) == 1)
+
+    # The last symbol is zero-padded.
+    assert np.array_equal(tones_to_bits(bits_to_tones([1, 1, 1, 1], 3), 3), [1, 1, 1, 1, 0, 0])
+
+def test_two_tones_match_binary_fsk():
+    data = b"M=2 is plain FSK"
+    freqs = [1200.0, 2200.0]
+    assert byte_array_to_mfsk(data, freqs, sampling_rate, baud_rate) == byte_array_to_fsk(data, 1200.0, 2200.0, sampling_rate, baud_rate)
+    assert byte_array_to_cpmfsk(data, freqs, sampling_rate, baud_rate) == byte_array_to_cpfsk(data, 1200.0, 2200.0, sampling_rate, baud_rate)
+
+def test_mfsk_roundtrip():
+    rng = np.random.default_rng(21)
+    data = rng.integers(0, 256, 1001, dtype=np.uint8).tobytes()
+    for m in (2, 4, 8, 16):
+        freqs = tone_list(m)
+        audio = byte_array_to_mfsk(data, freqs, sampling_rate, baud_rate)
+        assert mfsk_to_byte_array(audio, freqs, sampling_rate, baud_rate) == data
+        audio = byte_array_to_cpmfsk(data, freqs, sampling_rate, baud_rate)
+        assert cpmfsk_to_byte_array(audio, freqs, sampling_rate, baud_rate) == data
+        assert mfsk_demodulation_from_base64(audio, sampling_rate, baud_rate, freqs, method="goertzel") == data
+
+        # log2(M) bits per symbol: the audio is that many times shorter than binary FSK.
+        n_symbols = -(-8 * len(data) // (m.bit_length() - 1))
+        assert pcm16_from_wav_bytes(base64.b64decode(audio)).size == n_symbols * 147
+
+def test_mfsk_noise_and_sink():
+    rng = np.random.default_rng(22)
+    freqs = tone_list(8)
+    bits = rng.integers(0, 2, 3000).astype(np.uint8)
+    for modulate in (mfsk_modulation, cpmfsk_modulation):
+        signal, t = modulate(bits, freqs, sampling_rate, baud_rate)
+        assert signal.size == t.size
+        noisy = signal + rng.normal(0, 1.0, signal.size)
+        assert np.array_equal(mfsk_demodulation(noisy, sampling_rate, baud_rate, freqs), bits)
+
+    # The block-wise sink path writes exactly the one-shot signal.
+    signal, _ = cpmfsk_modulation(bits, freqs, sampling_rate, baud_rate)
+    with io.BytesIO() as sink:
+        cpmfsk_modulation_to_sink(bits, sink, freqs, sampling_rate, baud_rate, container="raw", block_size=1000)
+        pcm = np.frombuffer(sink.getvalue(), dtype='<i2')
+    assert np.array_equal(pcm, (signal * 32767).astype(np.int16))
+
+def test_mfsk_rejects_bad_tone_count():
+    for freqs in ([1200.0], [1200.0, 1500.0, 1800.0]):
+        try:
+            byte_array_to_mfsk(b"x", freqs, sampling_rate, baud_rate)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("expected ValueError")
+
+if __name__ == "__main__":
+    test_symbol_mapping()
+    test_two_tones_match_binary_fsk()
+    test_mfsk_roundtrip()
+    test_mfsk_noise_and_sink()
+    test_mfsk_rejects_bad_tone_count()
+    print("M-ary FSK tests passed!")
@@ -0,0 +1,41 @@
+# test_parallel.py
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from FSK_v2 import fsk_demodulation_parallel
+from FSK_v2.cpfsk_mod import cpfsk_modulation
+from FSK_v2.fsk_demod import fsk_demodulation
+
+sampling_rate = 44100.0
+baud_rate = 300.0
+freq0 = 1200.0
+freq1 = 2200.0
+
+def test_parallel_matches_serial():
+    rng = np.random.default_rng(7)
+    bits = rng.integers(0, 2, 2001).astype(np.uint8)
+    signal, _ = cpfsk_modulation(bits, freq0, freq1, sampling_rate, baud_rate)
+    signal = np.concatenate([signal + rng.normal(0, 1.0, signal.size), np.zeros(20)]).astype(np.float32)
+
+    expected = fsk_demodulation(signal, sampling_rate, baud_rate, freq0, freq1)
+    for workers in (1, 3):
+        recovered = fsk_demodulation_parallel(signal, sampling_rate, baud_rate, freq0, freq1, workers=workers)
+        assert np.array_equal(recovered, expected)
+
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        recovered = fsk_demodulation_parallel(signal, sampling_rate, baud_rate, freq0, freq1, workers=5, executor=pool)
+        assert np.array_equal(recovered, expected)
+        # Every backend is available in the parallel path.
+        for method in ("goertzel", "fft"):
+            expected = fsk_demodulation(signal, sampling_rate, baud_rate, freq0, freq1, method)
+            recovered = fsk_demodulation_parallel(signal, sampling_rate, baud_rate, freq0, freq1, workers=3,
+                                                  executor=pool, method=method)
+            assert np.array_equal(recovered, expected), method
+
+def test_parallel_short_signal():
+    bits = fsk_demodulation_parallel(np.zeros(10), sampling_rate, baud_rate, freq0, freq1, workers=4)
+    assert bits.size == 0
+
+if __name__ == "__main__":
+    test_parallel_matches_serial()
+    test_parallel_short_signal()
+    print("Parallel tests passed!")
@@ -0,0 +1,90 @@
+# test_plot.py
+import base64
+import os
+import tempfile
+import tracemalloc
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+from FSK_v2 import byte_array_to_cpfsk
+from FSK_v2.cli import main
+from FSK_v2.cpfsk_mod import cpfsk_modulation
+from FSK_v2.plot_signal import minmax_envelope, plot_modulated_signal, plot_spectrogram, spectrogram
+
+sampling_rate = 44100.0
+baud_rate = 300.0
+freq0 = 1200.0
+freq1 = 2200.0
+
+def test_minmax_envelope():
+    rng = np.random.default_rng(24)
+    samples = rng.integers(-32768, 32768, 10007).astype(np.int16)
+    starts, mins, maxs = minmax_envelope(samples, 100)
+    assert starts.size == 100 and mins.dtype == np.int16
+    edges = np.append(starts, samples.size)
+    for k in range(starts.size):
+        chunk = samples[edges[k] : edges[k + 1]]
+        assert mins[k] == chunk.min() and maxs[k] == chunk.max()
+    # More columns than samples: one sample per column.
+    starts, mins, maxs = minmax_envelope(samples[:10], 100)
+    assert np.array_equal(mins, samples[:10]) and np.array_equal(maxs, samples[:10])
+
+def test_waveform_plot_is_decimated_and_windowed():
+    data = np.random.default_rng(25).integers(0, 256, 2000, dtype=np.uint8).tobytes()
+    audio = byte_array_to_cpfsk(data, freq0, freq1, sampling_rate, baud_rate)
+    n_samples = len(base64.b64decode(audio)) // 2
+
+    waveform, t = plot_modulated_signal(audio, show_plot=False)
+    assert waveform.size == t.size <= 2 * 1000 < n_samples
+    assert waveform.max() > 0.99 and waveform.min() < -0.99
+
+    waveform, t = plot_modulated_signal(audio, show_plot=False, start=1.0, end=1.01)
+    assert waveform.size == 441 and abs(t[0] - 1.0) < 1e-9
+
+    waveform, _ = plot_modulated_signal(audio, show_plot=False, end=1.0, decimate=False)
+    assert waveform.size == 44100
+    plt.close("all")
+
+def test_spectrogram_tracks_tones():
+    bits = np.repeat([0, 1], 60).astype(np.uint8)
+    signal, _ = cpfsk_modulation(bits, freq0, freq1, sampling_rate, baud_rate)
+    pcm = (signal * 32767).astype(np.int16)
+    power_db, t, f = spectrogram(pcm, sampling_rate, n_fft=1024)
+    assert power_db.shape == (t.size, 513) and f[-1] == sampling_rate / 2
+    peaks = f[np.argmax(power_db, axis=1)]
+    half = len(signal) / 2 / sampling_rate
+    assert np.all(np.abs(peaks[t < half - 0.05] - freq0) < 50)
+    assert np.all(np.abs(peaks[t > half + 0.05] - freq1) < 50)
+    assert -3.0 < power_db.max() <= 0.5  # A full-scale tone reads about 0 dBFS.
+
+def test_spectrogram_memory_is_blockwise():
+    pcm = (np.sin(np.arange(2_000_000) * 0.1) * 20000).astype(np.int16)
+    tracemalloc.start()
+    power_db, _, _ = spectrogram(pcm, sampling_rate, n_fft=1024, hop=4096)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    # Well under a float32 copy of the signal (8 MB).
+    assert peak < pcm.size * 4 / 2, peak
+
+def test_plot_command():
+    audio = byte_array_to_cpfsk(b"plot me", freq0, freq1, sampling_rate, baud_rate)
+    with tempfile.TemporaryDirectory() as tmp:
+        source, image = os.path.join(tmp, "in.b64"), os.path.join(tmp, "out.png")
+        with open(source, "w") as f:
+            f.write(audio)
+        for options in ([], ["--spectrogram", "--tones", "1200", "2200", "--start", "0.05"]):
+            assert main(["plot", "-i", source, "--base64", "--image", image, *options]) == 0
+            assert os.path.getsize(image) > 0
+            os.remove(image)
+    power_db, t, _ = plot_spectrogram(audio, show_plot=False, tones=(freq0, freq1))
+    assert power_db.shape[0] == t.size <= 1000
+    plt.close("all")
+
+if __name__ == "__main__":
+    test_minmax_envelope()
+    test_waveform_plot_is_decimated_and_windowed()
+    test_spectrogram_tracks_tones()
+    test_spectrogram_memory_is_blockwise()
+    test_plot_command()
+    print("Plotting tests passed!")
@@ -0,0 +1,121 @@
+# test_server.py
+import asyncio
+import socket
+import struct
+import pytest
+from FSK_v2 import byte_array_to_cpfsk
+from FSK_v2.server import FSKServer, FSKClient, read_frame
+
+sampling_rate = 44100.0
+baud_rate = 300.0
+freq0 = 1200.0
+freq1 = 2200.0
+
+async def _round_trips():
+    server = FSKServer(port=0, batch_window=0.01)
+    await server.start()
+    client = await FSKClient.connect(port=server.port)
+    try:
+        payloads = [bytes([i]) * (i + 1) for i in range(12)]
+        audios = await asyncio.gather(*(
+            client.encode(p, freq0, freq1, sampling_rate, baud_rate, "cpfsk") for p in payloads
+        ))
+        assert audios[3] == byte_array_to_cpfsk(payloads[3], freq0, freq1, sampling_rate, baud_rate)
+
+        # A malformed request in the same micro-batch must fail alone.
+        results = await asyncio.gather(
+            *(client.decode(a, freq0, freq1, sampling_rate, baud_rate, "cpfsk") for a in audios),
+            client.decode("not base64 wav", freq0, freq1, sampling_rate, baud_rate, "cpfsk"),
+            return_exceptions=True,
+        )
+        assert results[:-1] == payloads
+        assert isinstance(results[-1], RuntimeError)
+
+        stats = await client.stats()
+        assert stats["requests"] == 24
+        assert stats["errors"] == 1
+        assert stats["mean_batch_size"] > 1
+    finally:
+        await client.close()
+        await server.close()
+
+def test_server_round_trip_with_coalescing():
+    asyncio.run(_round_trips())
+
+async def _busy():
+    server = FSKServer(port=0, max_pending=0)
+    await server.start()
+    client = await FSKClient.connect(port=server.port)
+    try:
+        with pytest.raises(RuntimeError, match="busy"):
+            await client.encode(b"x", freq0, freq1, sampling_rate, baud_rate)
+        assert (await client.stats())["rejected"] == 1
+    finally:
+        await client.close()
+        await server.close()
+
+def test_server_rejects_when_saturated():
+    asyncio.run(_busy())
+
+async def _bad_headers():
+    server = FSKServer(port=0)
+    await server.start()
+    client = await FSKClient.connect(port=server.port)
+    try:
+        # Valid JSON that is not an object is answered with an error; the connection stays usable.
+        for header in ([1], "op", None):
+            with pytest.raises(RuntimeError, match="JSON object"):
+                await asyncio.wait_for(client._request(header), timeout=3.0)
+        audio = await asyncio.wait_for(client.encode(b"ok", freq0, freq1, sampling_rate, baud_rate), timeout=3.0)
+        assert audio
+        assert (await client.stats())["errors"] == 3
+    finally:
+        await client.close()
+        await server.close()
+
+def test_server_answers_non_object_headers():
+    asyncio.run(_bad_headers())
+
+async def _broken_clients():
+    loop = asyncio.get_running_loop()
+    unhandled = []
+    loop.set_exception_handler(lambda loop, context: unhandled.append(context))
+    server = FSKServer(port=0)
+    await server.start()
+    try:
+        # Headers that are not JSON at all get an error reply, and the connection stays usable.
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        for payload in (b'{"op": \n', b'\xff\xfe\n', b'{"op": "stats"}\n'):
+            writer.write(struct.pack('>I', len(payload)) + payload)
+        await writer.drain()
+        replies = [await asyncio.wait_for(read_frame(reader, 1 << 20), timeout=3.0) for _ in range(3)]
+        assert [header["ok"] for header, _ in replies] == [False, False, True]
+        assert "Invalid frame header" in replies[0][0]["error"]
+        writer.close()
+        await writer.wait_closed()
+
+        # A client that resets the connection mid-frame is dropped quietly.
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        writer.write(struct.pack('>I', 1000) + b'{"op"')
+        await writer.drain()
+        await asyncio.sleep(0.05)
+        writer.get_extra_info('socket').setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack('ii', 1, 0))
+        writer.transport.abort()
+        await asyncio.sleep(0.1)
+
+        client = await FSKClient.connect(port=server.port)
+        assert (await client.stats())["errors"] == 2
+        await client.close()
+    finally:
+        await server.close()
+    assert not unhandled, unhandled
+
+def test_server_survives_malformed_and_vanishing_clients():
+    asyncio.run(_broken_clients())
+
+if __name__ == "__main__":
+    test_server_round_trip_with_coalescing()
+    test_server_rejects_when_saturated()
+    test_server_answers_non_object_headers()
+    test_server_survives_malformed_and_vanishing_clients()
+    print("Server tests passed!")
@@ -0,0 +1,119 @@
+# test_sink.py
+import base64
+import io
+import wave
+import numpy as np
+from FSK_v2 import (
+    byte_array_to_fsk,
+    byte_array_to_cpfsk,
+    byte_array_to_fsk_sink,
+    byte_array_to_cpfsk_sink,
+    cpfsk_to_byte_array,
+    decode_wav_file,
+    fsk_demodulation_from_base64,
+)
+from FSK_v2.fsk_mod import fsk_modulation
+from FSK_v2.wav_io import WAV_HEADER_SIZE
+
+sampling_rate = 44100.0
+baud_rate = 300.0
+freq0 = 1200.0
+freq1 = 2200.0
+
+class WriteOnlySink:
+    """A non-seekable sink, like a socket or pipe."""
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+def test_sink_matches_base64_output():
+    data = b"Hello sink!"
+    for to_sink, to_base64 in ((byte_array_to_fsk_sink, byte_array_to_fsk), (byte_array_to_cpfsk_sink, byte_array_to_cpfsk)):
+        sink = WriteOnlySink()
+        written = to_sink(data, sink, freq0, freq1, sampling_rate, baud_rate)
+        wav_bytes = b"".join(sink.chunks)
+
+        assert written == len(wav_bytes)
+        assert wav_bytes == base64.b64decode(to_base64(data, freq0, freq1, sampling_rate, baud_rate))
+
+def test_sink_wav_is_readable_and_raw_has_no_header(tmp_path):
+    data = b"raw"
+    path = tmp_path / "out.wav"
+    with open(path, "wb") as f:
+        byte_array_to_cpfsk_sink(data, f, freq0, freq1, sampling_rate, baud_rate)
+    with wave.open(str(path), "rb") as wav_file:
+        assert wav_file.getnframes() == len(data) * 8 * 147
+        assert wav_file.getframerate() == 44100
+
+    with io.BytesIO() as raw:
+        byte_array_to_cpfsk_sink(data, raw, freq0, freq1, sampling_rate, baud_rate, container="raw")
+        pcm = raw.getvalue()
+    assert pcm == path.read_bytes()[WAV_HEADER_SIZE:]
+    audio = base64.b64encode(path.read_bytes()).decode("ascii")
+    assert cpfsk_to_byte_array(audio, freq0, freq1, sampling_rate, baud_rate) == data
+    assert np.frombuffer(pcm, dtype="<i2").size == len(data) * 8 * 147
+
+def test_decode_wav_file_matches_base64_decoder(tmp_path):
+    rng = np.random.default_rng(6)
+    data = rng.integers(0, 256, 300, dtype=np.uint8).tobytes()
+    path = tmp_path / "capture.wav"
+    with open(path, "wb") as f:
+        byte_array_to_cpfsk_sink(data, f, freq0, freq1, sampling_rate, baud_rate)
+        # A trailing partial symbol must be ignored exactly like the in-memory path does.
+        f.write(b"\x00\x01" * 50)
+    # Patch the RIFF and data sizes to cover the extra samples.
+    wav_bytes = bytearray(path.read_bytes())
+    data_size = len(wav_bytes) - WAV_HEADER_SIZE
+    wav_bytes[4:8] = (36 + data_size).to_bytes(4, "little")
+    wav_bytes[40:44] = data_size.to_bytes(4, "little")
+    path.write_bytes(wav_bytes)
+
+    audio = base64.b64encode(bytes(wav_bytes)).decode("ascii")
+    expected = fsk_demodulation_from_base64(audio, sampling_rate, baud_rate, freq0, freq1)
+    assert expected == data
+    assert decode_wav_file(path, sampling_rate, baud_rate, freq0, freq1, window_symbols=37) == expected
+
+def test_decode_wav_file_reads_any_layout(tmp_path):
+    data = b"compact and stereo files"
+    # µ-law, as written by the package itself, with every backend.
+    path = tmp_path / "mulaw.wav"
+    with open(path, "wb") as f:
+        byte_array_to_cpfsk_sink(data, f, freq0, freq1, sampling_rate, baud_rate, encoding="mulaw")
+    audio = base64.b64encode(path.read_bytes()).decode("ascii")
+    for method in ("correlate", "goertzel", "fft"):
+        for decimate in (None, True, False):
+            expected = fsk_demodulation_from_base64(audio, sampling_rate, baud_rate, freq0, freq1, method, decimate=decimate)
+            assert expected == data
+            assert decode_wav_file(path, sampling_rate, baud_rate, freq0, freq1, window_symbols=11, method=method,
+                                   decimate=decimate) == expected
+
+    # A 48 kHz stereo capture with the signal on the right channel; the header's rate is used.
+    bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8))
+    signal, _ = fsk_modulation(bits, freq0, freq1, 48000, baud_rate)
+    frames = np.stack([np.zeros_like(signal), signal], axis=1)
+    path = tmp_path / "stereo.wav"
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(2)
+        w.setsampwidth(2)
+        w.setframerate(48000)
+        w.writeframes((frames * 32767).astype("<i2").tobytes())
+    assert decode_wav_file(path, sampling_rate, baud_rate, freq0, freq1, window_symbols=37, channel=1) == data
+    try:
+        decode_wav_file(path, sampling_rate, baud_rate, freq0, freq1, channel=2)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError for a missing channel")
+
+if __name__ == "__main__":
+    import pathlib
+    import tempfile
+    test_sink_matches_base64_output()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_sink_wav_is_readable_and_raw_has_no_header(pathlib.Path(tmp))
+        test_decode_wav_file_matches_base64_decoder(pathlib.Path(tmp))
+        test_decode_wav_file_reads_any_layout(pathlib.Path(tmp))
+    print("Sink tests passed!")
@@ -0,0 +1,88 @@
+# test_streaming.py
+import base64
+import numpy as np
+from FSK_v2 import (
+    StreamingDemodulator,
+    byte_array_to_cpfsk,
+    fsk_to_byte_array,
+    fsk_demodulation_from_base64,
+    fsk_modulation_stream,
+    cpfsk_modulation_stream,
+)
+from FSK_v2.fsk_mod import fsk_modulation
+from FSK_v2.cpfsk_mod import cpfsk_modulation
+from FSK_v2.wav_io import wav_header
+
+sampling_rate = 44100.0
+baud_rate = 300.0
+freq0 = 1200.0
+freq1 = 2200.0
+
+def _pcm(data: bytes) -> np.ndarray:
+    bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8))
+    signal, _ = cpfsk_modulation(bits, freq0, freq1, sampling_rate, baud_rate)
+    return (signal * 32767).astype(np.int16)
+
+def test_streaming_matches_one_shot_for_ragged_chunks():
+    data = b"Streaming FSK over ragged chunks"
+    pcm = _pcm(data)
+    rng = np.random.default_rng(3)
+    cuts = np.sort(rng.integers(0, pcm.size, 40))
+    chunks = np.split(pcm, cuts)
+
+    demod = StreamingDemodulator(sampling_rate, baud_rate, freq0, freq1)
+    recovered = b"".join(demod.stream(chunks))
+
+    audio = byte_array_to_cpfsk(data, freq0, freq1, sampling_rate, baud_rate)
+    assert recovered == fsk_to_byte_array(audio, freq0, freq1, sampling_rate, baud_rate) == data
+
+def test_streaming_emits_each_byte_as_soon_as_it_is_complete():
+    data = b"ab"
+    pcm = _pcm(data)
+    samples_per_byte = 8 * int(sampling_rate / baud_rate)
+    demod = StreamingDemodulator(sampling_rate, baud_rate, freq0, freq1)
+
+    assert demod.feed(pcm[: samples_per_byte - 1]) == b""
+    assert demod.feed(pcm[samples_per_byte - 1 : samples_per_byte]) == b"a"
+    assert demod.feed(pcm[samples_per_byte:].tobytes()) == b"b"
+    assert demod.flush() == b""
+
+def test_streaming_decimation_matches_one_shot():
+    # A noisy 48 kHz capture, so decisions depend on the resampled samples themselves.
+    rng = np.random.default_rng(5)
+    bits = rng.integers(0, 2, 2000)
+    signal, _ = cpfsk_modulation(bits, freq0, freq1, 48000, baud_rate)
+    pcm = (np.clip(0.5 * signal + rng.normal(0, 0.4, signal.size), -1, 1) * 32767).astype(np.int16)
+    audio = base64.b64encode(wav_header(pcm.size, 48000) + pcm.tobytes()).decode('ascii')
+    chunks = np.split(pcm, np.sort(rng.integers(0, pcm.size, 30)))
+
+    for method, decimate in (("goertzel", None), ("correlate", True), ("fft", True)):
+        demod = StreamingDemodulator(48000, baud_rate, freq0, freq1, method, decimate)
+        assert demod.samples_per_bit < 48000 / baud_rate
+        expected = fsk_demodulation_from_base64(audio, 48000, baud_rate, freq0, freq1, method, decimate=decimate)
+        assert b"".join(demod.stream(chunks)) == expected, method
+    assert StreamingDemodulator(48000, baud_rate, freq0, freq1, "goertzel", False).samples_per_bit == 160
+
+def test_modulation_streams_match_one_shot():
+    rng = np.random.default_rng(4)
+    data = rng.integers(0, 256, 1500, dtype=np.uint8).tobytes()
+    bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8))
+    # Feed the payload as an iterator of uneven pieces to exercise the phase carry.
+    pieces = [data[:7], data[7:900], data[900:]]
+
+    for stream, modulate in ((cpfsk_modulation_stream, cpfsk_modulation), (fsk_modulation_stream, fsk_modulation)):
+        blocks = list(stream(iter(pieces), freq0, freq1, sampling_rate, baud_rate, block_size=1000))
+        assert all(block.size == 1000 for block in blocks[:-1])
+
+        expected, _ = modulate(bits, freq0, freq1, sampling_rate, baud_rate)
+        assert np.array_equal(np.concatenate(blocks), expected)
+
+        pcm_blocks = stream(data, freq0, freq1, sampling_rate, baud_rate, pcm16=True)
+        assert np.array_equal(np.concatenate(list(pcm_blocks)), (expected * 32767).astype(np.int16))
+
+if __name__ == "__main__":
+    test_streaming_matches_one_shot_for_ragged_chunks()
+    test_streaming_emits_each_byte_as_soon_as_it_is_complete()
+    test_streaming_decimation_matches_one_shot()
+    test_modulation_streams_match_one_shot()
+    print("Streaming tests passed!")
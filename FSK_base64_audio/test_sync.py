@@ -0,0 +1,67 @@
+# test_sync.py
+import base64
+import numpy as np
+from FSK_v2 import (
+    byte_array_to_fsk,
+    byte_array_to_cpfsk,
+    find_frames,
+    decode_frames,
+    decode_frames_from_base64,
+)
+from FSK_v2.wav_io import pcm16_from_wav_bytes, wav_header
+
+sampling_rate = 44100.0
+baud_rate = 300.0
+freq0 = 1200.0
+freq1 = 2200.0
+
+def _recording(encode, payloads, rng):
+    """Place framed transmissions at arbitrary offsets in a noisy recording."""
+    pieces, offsets, position = [], [], 0
+    for data in payloads:
+        gap = rng.normal(0, 0.05, int(rng.integers(1000, 20000)))
+        audio = encode(data, freq0, freq1, sampling_rate, baud_rate, framed=True)
+        frame = pcm16_from_wav_bytes(base64.b64decode(audio)).astype(np.float64) / 32767.0
+        position += gap.size
+        offsets.append(position)
+        position += frame.size
+        pieces += [gap, -frame if len(offsets) % 2 else frame]  # flip the carrier phase of every other frame
+    pieces.append(rng.normal(0, 0.05, 3000))
+    signal = np.concatenate(pieces)
+    return signal + rng.normal(0, 0.1, signal.size), offsets
+
+def test_frames_found_and_decoded_at_arbitrary_offsets():
+    rng = np.random.default_rng(11)
+    payloads = [b"first frame", b"", b"third one, a little longer", b"\x00\xff" * 20]
+    for encode, modulation in ((byte_array_to_cpfsk, "cpfsk"), (byte_array_to_fsk, "fsk")):
+        signal, offsets = _recording(encode, payloads, rng)
+
+        starts = find_frames(signal, sampling_rate, baud_rate, freq0, freq1, modulation, block_size=1 << 15)
+        assert len(starts) == len(offsets)
+        assert max(abs(s - o) for s, o in zip(starts, offsets)) <= 2
+
+        assert decode_frames(signal, sampling_rate, baud_rate, freq0, freq1, modulation) == payloads
+
+def test_decode_frames_from_base64_skips_truncated_frame():
+    rng = np.random.default_rng(12)
+    signal, offsets = _recording(byte_array_to_cpfsk, [b"complete", b"cut off here"], rng)
+    signal = signal[: offsets[1] + 12000]
+    pcm = (np.clip(signal, -1, 1) * 32767).astype(np.int16)
+    audio = base64.b64encode(wav_header(pcm.size, sampling_rate) + pcm.tobytes()).decode("ascii")
+    assert decode_frames_from_base64(audio, sampling_rate, baud_rate, freq0, freq1) == [b"complete"]
+
+def test_framing_options_are_keyword_only():
+    # A positional "raw" must not bind to framed (a truthy string) and silently frame the output.
+    for encode in (byte_array_to_fsk, byte_array_to_cpfsk):
+        try:
+            encode(b"x", freq0, freq1, sampling_rate, baud_rate, "raw")
+        except TypeError:
+            pass
+        else:
+            raise AssertionError("expected TypeError for a positional option")
+
+if __name__ == "__main__":
+    test_frames_found_and_decoded_at_arbitrary_offsets()
+    test_decode_frames_from_base64_skips_truncated_frame()
+    test_framing_options_are_keyword_only()
+    print("Sync tests passed!")
@@ -0,0 +1,52 @@
+# test_synthesis.py
+import io
+import numpy as np
+from FSK_v2.fsk_mod import fsk_modulation, fsk_modulation_pcm16
+from FSK_v2.cpfsk_mod import cpfsk_modulation, cpfsk_modulation_pcm16, cpfsk_modulation_to_sink
+from FSK_v2.fsk_demod import fsk_demodulation, pcm16_to_float
+
+sampling_rate = 44100.0
+freq0 = 1200.0
+freq1 = 2200.0
+
+def test_lean_pcm16_matches_float_path():
+    rng = np.random.default_rng(30)
+    bits = rng.integers(0, 2, 3000).astype(np.uint8)
+    for baud_rate in (300.0, 1200.0):
+        for modulate, lean in ((fsk_modulation, fsk_modulation_pcm16), (cpfsk_modulation, cpfsk_modulation_pcm16)):
+            signal, _ = modulate(bits, freq0, freq1, sampling_rate, baud_rate)
+            reference = (signal * 32767).astype(np.int16)
+
+            pcm = lean(bits, freq0, freq1, sampling_rate, baud_rate)
+            assert pcm.dtype == np.int16
+            assert np.array_equal(pcm, reference)
+
+            # float32 synthesis stays within one quantization step.
+            out = np.empty_like(reference)
+            pcm = lean(bits, freq0, freq1, sampling_rate, baud_rate, out=out, dtype=np.float32)
+            assert pcm is out
+            assert np.abs(pcm.astype(np.int32) - reference).max() <= 1
+            assert np.array_equal(fsk_demodulation(pcm16_to_float(pcm), sampling_rate, baud_rate, freq0, freq1), bits)
+
+def test_lean_pcm16_rejects_bad_arguments():
+    bits = np.ones(10, dtype=np.uint8)
+    for kwargs in ({"out": np.empty(5, dtype=np.int16)}, {"out": np.empty(1470, dtype=np.float32)}, {"dtype": np.float16}):
+        try:
+            cpfsk_modulation_pcm16(bits, freq0, freq1, sampling_rate, 300.0, **kwargs)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"expected ValueError for {kwargs}")
+
+def test_float32_sink():
+    bits = np.unpackbits(np.frombuffer(b"lean sink", dtype=np.uint8))
+    with io.BytesIO() as sink:
+        cpfsk_modulation_to_sink(bits, sink, freq0, freq1, sampling_rate, 300.0, container="raw", block_size=1000, dtype=np.float32)
+        pcm = np.frombuffer(sink.getvalue(), dtype='<i2')
+    assert np.array_equal(pcm, cpfsk_modulation_pcm16(bits, freq0, freq1, sampling_rate, 300.0, dtype=np.float32))
+
+if __name__ == "__main__":
+    test_lean_pcm16_matches_float_path()
+    test_lean_pcm16_rejects_bad_arguments()
+    test_float32_sink()
+    print("Lean synthesis tests passed!")
@@ -0,0 +1,51 @@
+# test_tables.py
+import numpy as np
+import pytest
+from FSK_v2 import byte_array_to_fsk, fsk_to_byte_array, cache_info, clear_cache, set_cache_size
+from FSK_v2.tables import get_tables
+
+sampling_rate = 44100.0
+baud_rate = 300.0
+freq0 = 1200.0
+freq1 = 2200.0
+
+def test_cache_hits_across_modulator_and_demodulator():
+    clear_cache()
+    audio = byte_array_to_fsk(b"cache", freq0, freq1, sampling_rate, baud_rate)
+    assert fsk_to_byte_array(audio, freq0, freq1, sampling_rate, baud_rate) == b"cache"
+
+    info = cache_info()
+    assert info.misses == 1
+    assert info.hits >= 1
+    assert info.currsize == 1
+
+def test_tables_are_read_only():
+    tables = get_tables((freq0, freq1), sampling_rate, baud_rate)
+    assert tables.samples_per_bit == 147
+    assert tables.bank.shape == (147, 4)
+    with pytest.raises(ValueError):
+        tables.bank[0, 0] = 1.0
+
+def test_resize_evicts_least_recently_used():
+    clear_cache()
+    set_cache_size(2)
+    try:
+        first = get_tables((1000.0, 2000.0), sampling_rate, baud_rate)
+        get_tables((1100.0, 2100.0), sampling_rate, baud_rate)
+        get_tables((1000.0, 2000.0), sampling_rate, baud_rate)   # refresh the first entry
+        get_tables((1200.0, 2200.0), sampling_rate, baud_rate)   # evicts (1100, 2100)
+        assert get_tables((1000.0, 2000.0), sampling_rate, baud_rate) is first
+        assert cache_info().currsize == 2
+
+        set_cache_size(0)
+        assert cache_info().currsize == 0
+        assert np.array_equal(get_tables((1000.0, 2000.0), sampling_rate, baud_rate).bank, first.bank)
+    finally:
+        set_cache_size(32)
+        clear_cache()
+
+if __name__ == "__main__":
+    test_cache_hits_across_modulator_and_demodulator()
+    test_tables_are_read_only()
+    test_resize_evicts_least_recently_used()
+    print("Cache tests passed!")
@@ -0,0 +1,256 @@
+# test_wav_input.py
+import base64
+import io
+import struct
+import numpy as np
+from FSK_v2 import fsk_demodulation_from_base64, packet_from_base64, mfsk_demodulation_from_base64
+from FSK_v2 import fdm_tone_plan, byte_arrays_to_fdm, fdm_to_byte_arrays
+from FSK_v2 import byte_array_to_cpfsk, byte_array_to_fsk, fsk_to_byte_array, fsk_to_byte_arrays, decode_frames_from_base64
+from FSK_v2 import cpfsk_to_byte_array, cpmfsk_to_byte_array
+from FSK_v2.audio_format import (
+    WAVE_FORMAT_PCM, WAVE_FORMAT_IEEE_FLOAT, WAVE_FORMAT_EXTENSIBLE, audio_info, float_samples, read_wav_info,
+    pcm16_from_wav_bytes,
+)
+from FSK_v2.cpfsk_mod import cpfsk_modulation
+from FSK_v2.fsk_mod import fsk_modulation
+from FSK_v2.fsk_demod import pcm16_to_float
+from FSK_v2.mfsk import cpmfsk_modulation
+from FSK_v2.packet import encode_packet
+from FSK_v2.plot_signal import decode_wav_from_base64, spectrogram
+from FSK_v2.resample import StreamingResampler, demodulation_rate, resample, resample_poly
+from FSK_v2.cli import main
+from FSK_v2 import PipelineMetrics, observe
+
+baud_rate = 300.0
+freq0 = 1200.0
+freq1 = 2200.0
+
+def _wav(channels: np.ndarray, sampling_rate: int, format_tag: int, sampwidth: int, extensible: bool = False) -> bytes:
+    """Write float channels of shape (n_frames, n_channels) in any sample layout."""
+    if format_tag == WAVE_FORMAT_IEEE_FLOAT:
+        data = channels.astype('<f4' if sampwidth == 4 else '<f8').tobytes()
+    elif sampwidth == 1:
+        data = (np.round(channels * 127) + 128).astype(np.uint8).tobytes()
+    else:
+        values = np.round(channels * {2: 32767, 3: 8388607, 4: 2147483647}[sampwidth]).astype('<i4')
+        data = values.astype('<i2' if sampwidth == 2 else '<i4').tobytes()
+        if sampwidth == 3:
+            data = np.frombuffer(values.tobytes(), dtype=np.uint8).reshape(-1, 4)[:, :3].tobytes()
+    n_channels = channels.shape[1]
+    block_align = n_channels * sampwidth
+    fmt = struct.pack('<HHIIHH', WAVE_FORMAT_EXTENSIBLE if extensible else format_tag, n_channels,
+                      sampling_rate, sampling_rate * block_align, block_align, 8 * sampwidth)
+    if extensible:
+        guid = struct.pack('<H', format_tag) + b'\x00\x00\x00\x00\x10\x00\x80\x00\x00\xaa\x00\x38\x9b\x71'
+        fmt += struct.pack('<HHI', 22, 8 * sampwidth, 0) + guid
+    chunks = struct.pack('<4sI', b'fmt ', len(fmt)) + fmt + struct.pack('<4sI', b'data', len(data)) + data
+    return struct.pack('<4sI4s', b'RIFF', 4 + len(chunks), b'WAVE') + chunks
+
+def test_every_layout_and_channel():
+    rng = np.random.default_rng(0)
+    channels = rng.uniform(-0.9, 0.9, (1000, 3))
+    layouts = [
+        (WAVE_FORMAT_PCM, 1, 2 / 127), (WAVE_FORMAT_PCM, 2, 1e-4), (WAVE_FORMAT_PCM, 3, 1e-6),
+        (WAVE_FORMAT_PCM, 4, 1e-6), (WAVE_FORMAT_IEEE_FLOAT, 4, 1e-7), (WAVE_FORMAT_IEEE_FLOAT, 8, 1e-7),
+    ]
+    for format_tag, sampwidth, tolerance in layouts:
+        for extensible in (False, True):
+            wav_bytes = _wav(channels, 48000, format_tag, sampwidth, extensible)
+            info = audio_info(wav_bytes)
+            assert (info.format_tag, info.n_channels, info.sampwidth, info.framerate, info.n_frames) == (
+                format_tag, 3, sampwidth, 48000, 1000)
+            for channel in (0, 2, -1):
+                signal = float_samples(wav_bytes, info, channel)
+                assert signal.dtype == np.float32 and signal.size == 1000
+                assert np.abs(signal - channels[:, channel]).max() <= tolerance, (format_tag, sampwidth, channel)
+            assert np.abs(float_samples(wav_bytes, info) - channels.mean(axis=1)).max() <= tolerance
+
+    # 16-bit mono decodes exactly like the previous int16 path.
+    wav_bytes = _wav(channels[:, :1], 44100, WAVE_FORMAT_PCM, 2)
+    assert np.array_equal(float_samples(wav_bytes, audio_info(wav_bytes)), pcm16_to_float(pcm16_from_wav_bytes(wav_bytes)))
+
+    for bad in (lambda: float_samples(wav_bytes, audio_info(wav_bytes), 1),
+                lambda: float_samples(_wav(channels, 8000, 2, 2), audio_info(_wav(channels, 8000, 2, 2)))):
+        try:
+            bad()
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("expected ValueError")
+
+def test_resampler():
+    sr = 44100
+    x = np.sin(2 * np.pi * 1000.0 * np.arange(20000) / sr)
+    for up, down in ((22, 147), (1, 5), (3, 2), (160, 147)):
+        y = resample_poly(x, up, down)
+        assert y.size == -(-x.size * up // down)
+        # Output m is input time m * down / up; the filter edges are excluded.
+        t = np.arange(y.size) * down / (up * sr)
+        inner = slice(y.size // 10, -y.size // 10)
+        assert np.abs(y[inner] - np.sin(2 * np.pi * 1000.0 * t[inner])).max() < 5e-3, (up, down)
+    # A tone above the new Nyquist frequency is removed, not aliased.
+    y = resample_poly(np.sin(2 * np.pi * 6000.0 * np.arange(20000) / sr), 1, 5)
+    assert np.abs(y[400:-400]).max() < 0.01
+    assert np.array_equal(resample(x, sr, sr), x)
+
+    # The decimated rate is a whole number of samples per symbol, well above twice the tones.
+    for sr, baud in ((44100, 300), (48000, 300), (48000, 1200)):
+        up, down = demodulation_rate(sr, baud, (freq0, freq1))
+        rate = sr * up / down
+        assert rate < sr / 1.5 and rate > 2 * freq1 and (rate / baud).is_integer()
+    assert demodulation_rate(8000, 300, (freq0, freq1)) == (1, 1)
+
+    # Fed in chunks of any size, the streaming resampler produces the same samples.
+    x = np.random.default_rng(4).standard_normal(5000).astype(np.float32)
+    for up, down in ((1, 3), (22, 147), (160, 147)):
+        for n_chunks in (1, 7, 500):
+            resampler = StreamingResampler(up, down)
+            y = np.concatenate([resampler.feed(c) for c in np.array_split(x, n_chunks)] + [resampler.flush()])
+            np.testing.assert_allclose(y, resample_poly(x, up, down), atol=1e-6)
+
+def test_demodulate_any_capture():
+    # A 48 kHz stereo 24-bit capture carries the signal on the right channel only.
+    data = b"any wav layout"
+    bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8))
+    rng = np.random.default_rng(1)
+    for modulate in (fsk_modulation, cpfsk_modulation):
+        signal, _ = modulate(bits, freq0, freq1, 48000, baud_rate)
+        signal = 0.5 * signal + 0.05 * rng.standard_normal(signal.size)
+        stereo = np.stack([0.1 * rng.standard_normal(signal.size), signal], axis=1)
+        audio = base64.b64encode(_wav(stereo, 48000, WAVE_FORMAT_PCM, 3)).decode('ascii')
+        for method in ("correlate", "goertzel", "fft"):
+            for decimate in (None, True, False):
+                # The rate in the header wins over the sampling_rate argument.
+                recovered = fsk_demodulation_from_base64(audio, 44100.0, baud_rate, freq0, freq1, method,
+                                                         channel=1, decimate=decimate)
+                assert recovered == data, (modulate.__name__, method, decimate)
+
+    packet = np.unpackbits(np.frombuffer(encode_packet(data, "conv"), dtype=np.uint8))
+    signal, _ = cpfsk_modulation(packet, freq0, freq1, 48000, baud_rate)
+    audio = base64.b64encode(_wav(np.stack([signal, signal], axis=1), 48000, WAVE_FORMAT_IEEE_FLOAT, 4)).decode('ascii')
+    assert packet_from_base64(audio, 48000.0, baud_rate, freq0, freq1, "conv", decimate=True) == data
+
+    freqs = (1200.0, 1600.0, 2000.0, 2400.0)
+    symbols = np.unpackbits(np.frombuffer(data, dtype=np.uint8))
+    signal, _ = cpmfsk_modulation(symbols, freqs, 44100, baud_rate)
+    audio = base64.b64encode(_wav(signal[:, None], 44100, WAVE_FORMAT_PCM, 4, extensible=True)).decode('ascii')
+    assert mfsk_demodulation_from_base64(audio, 44100.0, baud_rate, freqs, "goertzel") == data
+
+def test_wrappers_forward_method_channel_and_decimate():
+    # The payload is only on the right channel; the left carries a louder steady freq0 tone,
+    # so the average of both channels decodes as all zeros and channel=1 is needed.
+    data = b"wrapper options"
+    for modulate, to_byte_array in ((fsk_modulation, fsk_to_byte_array), (cpfsk_modulation, cpfsk_to_byte_array)):
+        signal, _ = modulate(np.unpackbits(np.frombuffer(data, dtype=np.uint8)), freq0, freq1, 48000, baud_rate)
+        interferer = np.sin(2 * np.pi * freq0 * np.arange(signal.size) / 48000)
+        stereo = np.stack([0.9 * interferer, 0.4 * signal], axis=1)
+        audio = base64.b64encode(_wav(stereo, 48000, WAVE_FORMAT_PCM, 3)).decode('ascii')
+        for method in ("correlate", "goertzel", "fft"):
+            for decimate in (None, True, False):
+                assert to_byte_array(audio, freq0, freq1, 44100.0, baud_rate, method=method, channel=1,
+                                     decimate=decimate) == data, (to_byte_array.__name__, method, decimate)
+        assert to_byte_array(audio, freq0, freq1, 44100.0, baud_rate) != data
+
+        packet = np.unpackbits(np.frombuffer(encode_packet(data, "conv"), dtype=np.uint8))
+        signal, _ = modulate(packet, freq0, freq1, 48000, baud_rate)
+        stereo = np.stack([np.zeros_like(signal), signal], axis=1)
+        audio = base64.b64encode(_wav(stereo, 48000, WAVE_FORMAT_IEEE_FLOAT, 4)).decode('ascii')
+        assert to_byte_array(audio, freq0, freq1, 44100.0, baud_rate, fec="conv", method="goertzel", channel=1) == data
+
+    freqs = (1200.0, 1600.0, 2000.0, 2400.0)
+    signal, _ = cpmfsk_modulation(np.unpackbits(np.frombuffer(data, dtype=np.uint8)), freqs, 48000, baud_rate)
+    audio = base64.b64encode(_wav(np.stack([np.zeros_like(signal), signal], axis=1), 48000, WAVE_FORMAT_PCM, 2)).decode('ascii')
+    assert cpmfsk_to_byte_array(audio, freqs, 44100.0, baud_rate, method="fft", channel=1, decimate=True) == data
+
+def test_fdm_recorded_at_another_rate():
+    payloads = [b"first channel", b"second"]
+    tones = fdm_tone_plan(2, 44100.0, baud_rate)
+    audio = byte_arrays_to_fdm(payloads, 44100.0, baud_rate, tones)
+    wav_bytes = base64.b64decode(audio)
+    signal = float_samples(wav_bytes, audio_info(wav_bytes))
+    captured = resample(signal, 44100, 48000)
+    rerecorded = base64.b64encode(_wav(captured[:, None], 48000, WAVE_FORMAT_PCM, 2)).decode('ascii')
+    assert fdm_to_byte_arrays(rerecorded, 44100.0, baud_rate, tones) == payloads
+
+def test_batch_frames_and_plots_read_any_layout():
+    payloads = [b"stereo 48 kHz", b"mono 44.1 kHz", b"float 22.05 kHz"]
+    audios = []
+    for data, (sr, format_tag, sampwidth, n_channels) in zip(payloads, [
+        (48000, WAVE_FORMAT_PCM, 3, 2), (44100, WAVE_FORMAT_PCM, 2, 1), (22050, WAVE_FORMAT_IEEE_FLOAT, 4, 2)
+    ]):
+        signal, _ = fsk_modulation(np.unpackbits(np.frombuffer(data, dtype=np.uint8)), freq0, freq1, sr, baud_rate)
+        audios.append(base64.b64encode(_wav(np.repeat(0.8 * signal[:, None], n_channels, axis=1), sr, format_tag, sampwidth)).decode('ascii'))
+    # Batch output matches the single-message path whatever the layout and header rate.
+    for decimate in (None, True):
+        expected = [fsk_demodulation_from_base64(a, 44100.0, baud_rate, freq0, freq1, decimate=decimate) for a in audios]
+        assert fsk_to_byte_arrays(audios, freq0, freq1, 44100.0, baud_rate, decimate=decimate) == expected == payloads
+    assert fsk_to_byte_arrays(audios, freq0, freq1, 44100.0, baud_rate) == [
+        fsk_to_byte_array(a, freq0, freq1, 44100.0, baud_rate) for a in audios]
+    try:
+        fsk_to_byte_arrays(audios, freq0, freq1, 44100.0, baud_rate, channel=1)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError for a channel the mono message lacks")
+
+    # Framed transmissions recorded at 48 kHz on the right channel of a float capture.
+    rng = np.random.default_rng(2)
+    pieces = [rng.normal(0, 0.05, 5000)]
+    for data in (b"frame one", b"frame two"):
+        frame = pcm16_from_wav_bytes(base64.b64decode(byte_array_to_cpfsk(data, freq0, freq1, 48000, baud_rate, framed=True)))
+        pieces += [0.8 * frame / 32767.0, rng.normal(0, 0.05, 7000)]
+    signal = np.concatenate(pieces)
+    stereo = np.stack([rng.normal(0, 0.3, signal.size), signal], axis=1)
+    audio = base64.b64encode(_wav(stereo, 48000, WAVE_FORMAT_IEEE_FLOAT, 4)).decode('ascii')
+    assert decode_frames_from_base64(audio, 44100.0, baud_rate, freq0, freq1, channel=1) == [b"frame one", b"frame two"]
+
+    # Plots read the header rate and the selected channel of a float capture.
+    waveform, t = decode_wav_from_base64(audio, channel=1)
+    assert np.abs(waveform - signal).max() < 1e-6 and np.isclose(t[1], 1 / 48000)
+    tone = np.sin(2 * np.pi * 1500.0 * np.arange(4096) / 48000).astype(np.float32)
+    power_db, _, f = spectrogram(tone, 48000, 1024)
+    assert abs(power_db[:, np.argmin(np.abs(f - 1500.0))].max()) < 1.5  # A full-scale tone reads about 0 dBFS.
+    mono = base64.b64decode(byte_array_to_fsk(b"mono", freq0, freq1, 44100, baud_rate))
+    assert np.array_equal(decode_wav_from_base64(base64.b64encode(mono).decode('ascii'))[0],
+                          pcm16_from_wav_bytes(mono).astype(np.float32) / 32767.0)
+
+def test_cli_decodes_multichannel_wav():
+    data = b"cli"
+    bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8))
+    signal, _ = fsk_modulation(bits, freq0, freq1, 48000, baud_rate)
+    wav_bytes = _wav(np.stack([np.zeros_like(signal), 0.8 * signal], axis=1), 48000, WAVE_FORMAT_IEEE_FLOAT, 4)
+    with io.BytesIO(wav_bytes) as buffer:
+        assert read_wav_info(buffer).n_channels == 2
+
+    import os
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp:
+        audio, recovered = os.path.join(tmp, "in.wav"), os.path.join(tmp, "out.bin")
+        with open(audio, 'wb') as f:
+            f.write(wav_bytes)
+        assert main(["decode", "-i", audio, "-o", recovered, "--channel", "1", "--method", "goertzel"]) == 0
+        with open(recovered, 'rb') as f:
+            assert f.read() == data
+
+        # --decimate reaches the decoder on the one-shot path (this file) and the streaming path.
+        mono = os.path.join(tmp, "mono.wav")
+        with open(mono, 'wb') as f:
+            f.write(_wav(0.8 * signal[:, None], 48000, WAVE_FORMAT_PCM, 2))
+        for path in (audio, mono):
+            for flag, method, resampled in (("--decimate", "correlate", True), ("--no-decimate", "goertzel", False),
+                                            (None, "goertzel", True), (None, "correlate", False)):
+                with observe(PipelineMetrics()) as recorded:
+                    assert main(["decode", "-i", path, "-o", recovered, "--method", method, *filter(None, [flag])]) == 0
+                assert ("resample" in recorded.snapshot()) == resampled, (path, flag, method)
+                with open(recovered, 'rb') as f:
+                    assert f.read() == data
+
+if __name__ == "__main__":
+    test_every_layout_and_channel()
+    test_resampler()
+    test_demodulate_any_capture()
+    test_wrappers_forward_method_channel_and_decimate()
+    test_fdm_recorded_at_another_rate()
+    test_batch_frames_and_plots_read_any_layout()
+    test_cli_decodes_multichannel_wav()
+    print("WAV input tests passed!")